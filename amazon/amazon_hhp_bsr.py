@@ -26,8 +26,11 @@ import time
 import random
 import re
 import traceback
+import psycopg2
+from collections import namedtuple
+from psycopg2.extras import execute_values
 from datetime import datetime
-from lxml import html
+from functools import lru_cache
 
 # 공통 환경 설정 (작업 디렉토리, 한글 출력, 경로 설정)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -40,6 +43,72 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from common.base_crawler import BaseCrawler
 
+# 페이지 HTML 키워드 검사를 브라우저 안에서 수행 (page_source 전체 전송 없이 결과만 반환)
+# arguments: 키워드 목록(소문자), 검사할 앞부분 길이(0이면 전체), 페이지 제목 포함 여부
+PAGE_CONTAINS_SCRIPT = '''
+const [keywords, limit, includeTitle] = arguments;
+let source = document.documentElement ? document.documentElement.outerHTML : '';
+if (limit > 0) source = source.slice(0, limit);
+if (includeTitle) source = document.title + ' ' + source;
+source = source.toLowerCase();
+return keywords.some(keyword => source.includes(keyword));
+'''
+
+# 상대 경로 제품 URL 앞에 붙일 도메인
+AMAZON_BASE_URL = 'https://www.amazon.com'
+
+# 페이지 로드 후/페이지 간 대기 (초): 차단 감지 시 2배(상한까지), 정상 페이지 수집 시 절반(기본값까지)
+PAGE_DELAY_BASE = 4
+PAGE_DELAY_MAX = 30
+
+# 세션 초기화 시 User-Agent (실행 중인 Chrome 주 버전으로 생성 → 브라우저 클라이언트 힌트와 버전 일치)
+USER_AGENT_TEMPLATE = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{major}.0.0.0 Safari/537.36'
+# 세션 초기화 시 현재 origin의 localStorage/sessionStorage 삭제
+CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+# 페이지 로드 직후 차단 징후 1회 확인 (Sorry: 제목 + HTML 앞 2000자, 쓰로틀링: HTML 전체)
+# arguments: Sorry 키워드 목록, 쓰로틀링 키워드 목록 (소문자)
+PAGE_BLOCKED_SCRIPT = '''
+const [sorryKeywords, throttleKeywords] = arguments;
+const source = (document.documentElement ? document.documentElement.outerHTML : '').toLowerCase();
+const head = (document.title + ' ' + source.slice(0, 2000)).toLowerCase();
+return sorryKeywords.some(keyword => head.includes(keyword)) || throttleKeywords.some(keyword => source.includes(keyword));
+'''
+
+THROTTLE_KEYWORDS = ['request was throttled', 'please wait a moment and refresh']
+SORRY_KEYWORDS = ['sorry', 'robot check']
+CAPTCHA_KEYWORDS = ['captcha', 'robot', 'human verification', 'press & hold', 'press and hold']
+
+# ASIN 추출 (일반 URL의 /dp/ASIN 우선, 없으면 URL 인코딩된 sspa URL의 %2Fdp%2FASIN)
+DP_ASIN_PATTERN = re.compile(r'/dp/([A-Z0-9]{10})', re.IGNORECASE)
+ENCODED_DP_ASIN_PATTERN = re.compile(r'%2Fdp%2F([A-Z0-9]{10})', re.IGNORECASE)
+
+# 제품 카드에서 추출하는 필드
+PRODUCT_EXTRACT_FIELDS = ('product_url', 'bsr_rank', 'retailer_sku_name', 'final_sku_price')
+
+# amazon_hhp_product_list INSERT 1행 (필드 순서 = INSERT 컬럼 순서, page_number → bsr_page_number)
+ProductRow = namedtuple('ProductRow', [
+    'account_name', 'page_type', 'retailer_sku_name',
+    'final_sku_price', 'bsr_rank', 'page_number', 'product_url',
+    'calendar_week', 'crawl_strdatetime', 'batch_id',
+])
+PRODUCT_ROW_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+
+@lru_cache(maxsize=4096)
+def normalize_amazon_url(url):
+    """Amazon URL → 표준 URL (https://www.amazon.com/dp/ASIN), ASIN 추출 실패 시 원본 URL
+
+    페이지 간 중복 확인, 기존 URL 매칭, INSERT 후 캐시 갱신에서 같은 URL을 반복 정규화하므로 결과를 캐시
+    """
+    if not url:
+        return None
+
+    match = DP_ASIN_PATTERN.search(url) or ENCODED_DP_ASIN_PATTERN.search(url)
+    if match:
+        return f"{AMAZON_BASE_URL}/dp/{match.group(1)}"
+    return url
+
 
 class AmazonBSRCrawler(BaseCrawler):
     """
@@ -60,7 +129,12 @@ class AmazonBSRCrawler(BaseCrawler):
         self.test_count = 1  # 테스트 모드
         self.max_products = 100  # 운영 모드
         self.max_pages = 2  # 최대 페이지 수
-        self.crawled_urls = set()  # 페이지 간 중복 방지용 (정규화 URL)
+        self.crawled_urls = set()  # 페이지 간 중복 방지용 (정규화 URL, 저장 커밋 후 추가)
+        self.extractors = {}  # 필드명 → 추출 함수 (initialize에서 생성)
+        self.save_cursor = None  # save_products()에서 재사용하는 커서 (initialize에서 생성)
+        self.page_delay = PAGE_DELAY_BASE  # 적응형 페이지 대기 시간 (초)
+        self.page_blocked = False  # 마지막 crawl_page()에서 차단 징후 감지 여부
+        self.existing_urls = None  # 정규화 URL → DB 원본 URL (첫 저장 시 1회 조회 후 INSERT마다 갱신)
 
         # 통계 변수
         self.stats = {
@@ -76,12 +150,17 @@ class AmazonBSRCrawler(BaseCrawler):
         if not self.connect_db():
             print("[ERROR] Initialize failed: DB connection failed")
             return False
+        self.save_cursor = self.db_conn.cursor()
 
         # 2. XPath 로드
         if not self.load_xpaths(self.account_name, self.page_type):
             print(f"[ERROR] Initialize failed: XPath load failed (account={self.account_name}, page_type={self.page_type})")
             return False
 
+        # XPath 사전 컴파일 (제품/필드마다 XPath 문자열 재파싱 방지)
+        self.compile_xpaths()
+        self.extractors = self.make_extractors(PRODUCT_EXTRACT_FIELDS)
+
         # 3. URL 템플릿 로드
         self.url_template = self.load_page_urls(self.account_name, self.page_type)
         if not self.url_template:
@@ -107,10 +186,65 @@ class AmazonBSRCrawler(BaseCrawler):
         print(f"[INFO] Initialize completed: batch_id={self.batch_id}, calendar_week={self.calendar_week}")
         return True
 
+    def wait_page_delay(self):
+        """적응형 페이지 대기 (현재 대기 시간 ±20% 지터)"""
+        time.sleep(self.page_delay * random.uniform(0.8, 1.2))
+
+    def page_delay_success(self):
+        """정상 페이지 수집 후 대기 시간 절반으로 감소 (기본값 이하로는 줄이지 않음)"""
+        self.page_delay = max(PAGE_DELAY_BASE, self.page_delay / 2)
+
+    def page_delay_failure(self):
+        """차단 징후 감지 시 대기 시간 2배로 증가 (상한 PAGE_DELAY_MAX)"""
+        self.page_delay = min(PAGE_DELAY_MAX, self.page_delay * 2)
+        print(f"[INFO] Page delay increased to {self.page_delay:.0f}s")
+
+    def page_contains(self, keywords, limit=0, include_title=False):
+        """현재 페이지 HTML(limit > 0이면 앞부분만, include_title이면 제목 포함)에 키워드가 하나라도 있는지 브라우저 안에서 확인"""
+        return bool(self.driver.execute_script(PAGE_CONTAINS_SCRIPT, keywords, limit, include_title))
+
+    def is_page_blocked(self):
+        """현재 페이지에 Sorry/쓰로틀링 징후가 있는지 WebDriver 호출 1회로 확인 (정상 페이지는 세부 처리 생략)"""
+        return bool(self.driver.execute_script(PAGE_BLOCKED_SCRIPT, SORRY_KEYWORDS, THROTTLE_KEYWORDS))
+
     def is_throttled(self):
         """현재 페이지가 쓰로틀링 상태인지 확인"""
-        page_source = self.driver.page_source.lower()
-        return "request was throttled" in page_source or "please wait a moment and refresh" in page_source
+        return self.page_contains(THROTTLE_KEYWORDS)
+
+    def browser_user_agent(self):
+        """실행 중인 Chrome 주 버전에 맞춘 User-Agent (다른 버전 UA는 클라이언트 힌트와 불일치하여 봇 감지 위험)"""
+        browser_version = self.driver.capabilities.get('browserVersion') or ''
+        major = browser_version.split('.')[0] or '131'
+        return USER_AGENT_TEMPLATE.format(major=major)
+
+    def reset_browser_session(self, url):
+        """
+        브라우저 재시작 없이 세션 초기화: 쿠키/캐시/스토리지 삭제 → User-Agent 재설정 → ZIP 코드 재설정 → URL 접근
+
+        Returns:
+            bool: 초기화 후 URL 접근 성공 시 True (쓰로틀링 여부는 호출 측에서 확인)
+        """
+        try:
+            print("[INFO] Resetting browser session (cookies/cache/storage/User-Agent)...")
+            self.driver.execute_script(CLEAR_STORAGE_SCRIPT)
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                'userAgent': self.browser_user_agent(),
+                'platform': 'Windows',
+                'acceptLanguage': 'en-US,en;q=0.9'
+            })
+
+            # 쿠키 삭제로 ZIP 코드가 초기화되므로 다시 설정 (가격/배송 정보 일관성)
+            self.set_amazon_zip_code('10001')
+
+            print(f"[INFO] Accessing URL: {url[:80]}...")
+            self.driver.get(url)
+            time.sleep(random.uniform(8, 12))
+            return True
+        except Exception as e:
+            print(f"[ERROR] Browser session reset failed: {e}")
+            return False
 
     def restart_browser(self, url):
         """브라우저 재시작: 드라이버 종료 → 새 드라이버 생성 → URL 접근"""
@@ -175,6 +309,13 @@ class AmazonBSRCrawler(BaseCrawler):
 
             # URL 직접 접근 후에도 쓰로틀링 → 크롬 재시작 (마지막 시도가 아닐 때만)
             if self.is_throttled() and restart_attempt < max_browser_restarts:
+                # 첫 재시작 전에는 프로세스 재시작 없이 세션 초기화 먼저 시도
+                if restart_attempt == 0:
+                    print("[WARNING] Still throttled after URL access. Resetting browser session before restart...")
+                    if self.reset_browser_session(url) and not self.is_throttled():
+                        print("[OK] Browser session reset successful")
+                        return True
+
                 print(f"[WARNING] Still throttled after URL access. Restarting browser (attempt {restart_attempt + 1}/{max_browser_restarts})...")
 
                 if not self.restart_browser(url):
@@ -192,16 +333,8 @@ class AmazonBSRCrawler(BaseCrawler):
     def check_and_handle_sorry_page(self, max_retries=3):
         """Sorry/Robot check 페이지 감지 및 처리"""
         for attempt in range(max_retries):
-            page_source = self.driver.page_source.lower()
-            title = self.driver.title.lower()
-
-            # Sorry/Robot check 페이지 감지 (처음 2000자만 확인)
-            is_sorry_page = (
-                'sorry' in title or
-                'robot check' in title or
-                'sorry' in page_source[:2000] or
-                'robot check' in page_source[:2000]
-            )
+            # Sorry/Robot check 페이지 감지 (제목 + HTML 처음 2000자, WebDriver 호출 1회)
+            is_sorry_page = self.page_contains(SORRY_KEYWORDS, limit=2000, include_title=True)
 
             if is_sorry_page:
                 print(f"[WARNING] Sorry/Robot check page detected (attempt {attempt + 1}/{max_retries})")
@@ -226,10 +359,7 @@ class AmazonBSRCrawler(BaseCrawler):
         """CAPTCHA 자동 해결"""
         try:
             time.sleep(1)
-            page_html = self.driver.page_source.lower()
-
-            captcha_keywords = ['captcha', 'robot', 'human verification', 'press & hold', 'press and hold']
-            if not any(keyword in page_html for keyword in captcha_keywords):
+            if not self.page_contains(CAPTCHA_KEYWORDS):
                 return True
 
             captcha_selectors = [
@@ -271,8 +401,7 @@ class AmazonBSRCrawler(BaseCrawler):
                 actions.perform()
                 time.sleep(random.uniform(3, 5))
 
-                new_page_html = self.driver.page_source.lower()
-                if not any(keyword in new_page_html for keyword in captcha_keywords):
+                if not self.page_contains(CAPTCHA_KEYWORDS):
                     print("[OK] CAPTCHA 자동 해결 성공")
                     return True
                 else:
@@ -292,36 +421,17 @@ class AmazonBSRCrawler(BaseCrawler):
 
     def normalize_amazon_url(self, url):
         """Amazon URL에서 ASIN 추출 후 표준 URL로 정규화 (중복 판별용, DB 저장은 원본 URL 사용)"""
-        if not url:
-            return None
-
-        try:
-            # 1. 일반 URL: /dp/ASIN
-            match = re.search(r'/dp/([A-Z0-9]{10})', url, re.IGNORECASE)
-            if match:
-                return f"https://www.amazon.com/dp/{match.group(1)}"
-
-            # 2. URL 인코딩된 sspa URL: %2Fdp%2FASIN
-            match = re.search(r'%2Fdp%2F([A-Z0-9]{10})', url, re.IGNORECASE)
-            if match:
-                return f"https://www.amazon.com/dp/{match.group(1)}"
-
-            # ASIN 추출 실패 시 원본 URL 반환
-            return url
-        except Exception:
-            return url
+        return normalize_amazon_url(url)
 
     def build_existing_urls_cache(self, account_name, batch_id):
-        """DB에서 기존 URL을 조회하여 정규화 URL → 원본 URL 딕셔너리 생성 (1회 조회)"""
+        """DB에서 기존 URL을 조회하여 정규화 URL → 원본 URL 딕셔너리 생성 (실행당 1회 조회, 실패 시 None)"""
         try:
-            cursor = self.db_conn.cursor()
             query = """
                 SELECT product_url FROM amazon_hhp_product_list
                 WHERE account_name = %s AND batch_id = %s
             """
-            cursor.execute(query, (account_name, batch_id))
-            rows = cursor.fetchall()
-            cursor.close()
+            self.save_cursor.execute(query, (account_name, batch_id))
+            rows = self.save_cursor.fetchall()
 
             existing_urls = {}
             for (db_url,) in rows:
@@ -333,7 +443,16 @@ class AmazonBSRCrawler(BaseCrawler):
 
         except Exception as e:
             print(f"[WARNING] build_existing_urls_cache failed: {e}")
-            return {}
+            self.db_conn.rollback()
+            return None
+
+    def remember_inserted_urls(self, inserted_products):
+        """INSERT 커밋된 제품 URL을 수집 완료 목록 + 기존 URL 캐시에 추가 (다음 페이지 저장 시 DB 재조회 없이 UPDATE 분류)"""
+        for product in inserted_products:
+            normalized = self.normalize_amazon_url(product.product_url)
+            self.crawled_urls.add(normalized)
+            if normalized and self.existing_urls is not None:
+                self.existing_urls[normalized] = product.product_url
 
     def scroll_to_bottom(self, max_iterations=50):
         """페이지 하단까지 스크롤 (전체 콘텐츠 로드용, 최대 반복 횟수 제한)"""
@@ -352,13 +471,21 @@ class AmazonBSRCrawler(BaseCrawler):
             print(f"[WARNING] Scroll failed: {e}")
             traceback.print_exc()
 
-    def wait_for_products(self, base_container_xpath, expected_count=50, max_retries=3):
+    def get_outer_html(self):
+        """현재 페이지 HTML을 CDP DOM.getOuterHTML로 조회 (실패 시 page_source 사용)"""
+        try:
+            root_id = self.driver.execute_cdp_cmd('DOM.getDocument', {'depth': 0})['root']['nodeId']
+            return self.driver.execute_cdp_cmd('DOM.getOuterHTML', {'nodeId': root_id})['outerHTML']
+        except Exception:
+            return self.driver.page_source
+
+    def wait_for_products(self, expected_count=50, max_retries=3):
         """제품이 expected_count개 이상 로드될 때까지 대기 (부족하면 스크롤 후 재시도)"""
         base_containers = []
         for attempt in range(max_retries):
-            page_html = self.driver.page_source
-            tree = html.fromstring(page_html)
-            base_containers = tree.xpath(base_container_xpath)
+            page_html = self.get_outer_html()
+            tree = self.parse_html(page_html)
+            base_containers = self.select_nodes(tree, 'base_container')
 
             if len(base_containers) >= expected_count:
                 print(f"[OK] {len(base_containers)} products found")
@@ -377,57 +504,63 @@ class AmazonBSRCrawler(BaseCrawler):
         try:
             url = self.url_template.replace('{page}', str(page_number))
 
-            base_container_xpath = self.xpaths.get('base_container', {}).get('xpath')
-            if not base_container_xpath:
+            if not self.get_xpath('base_container'):
                 print("[ERROR] base_container XPath not found")
                 return []
 
             self.driver.get(url)
-            time.sleep(random.uniform(8, 12))
+            self.wait_page_delay()
 
-            # Sorry/Robot check 페이지 처리
-            if not self.check_and_handle_sorry_page(max_retries=3):
-                print(f"[SKIP] Skipping page {page_number} due to persistent sorry/robot check page")
-                return []
+            # 정상 페이지는 1회 확인으로 통과, 차단 징후가 있을 때만 Sorry/쓰로틀링 처리
+            self.page_blocked = self.is_page_blocked()
+            if self.page_blocked:
+                self.page_delay_failure()
 
-            # 쓰로틀링 처리
-            if not self.check_and_handle_throttling(page_number, url):
-                print(f"[SKIP] Skipping page {page_number} due to throttling")
-                return []
+                # Sorry/Robot check 페이지 처리
+                if not self.check_and_handle_sorry_page(max_retries=3):
+                    print(f"[SKIP] Skipping page {page_number} due to persistent sorry/robot check page")
+                    return []
 
-            # 추가 대기 (봇 감지 후 안정화)
-            time.sleep(random.uniform(3, 5))
+                # 쓰로틀링 처리
+                if not self.check_and_handle_throttling(page_number, url):
+                    print(f"[SKIP] Skipping page {page_number} due to throttling")
+                    return []
+
+                # 추가 대기 (봇 감지 후 안정화)
+                time.sleep(random.uniform(3, 5))
 
             # 페이지 하단까지 스크롤 (전체 콘텐츠 로드)
             self.scroll_to_bottom()
 
             # 제품 50개 이상 로드될 때까지 대기 (부족하면 스크롤 후 재시도)
-            base_containers = self.wait_for_products(base_container_xpath, expected_count=50, max_retries=3)
+            base_containers = self.wait_for_products(expected_count=50, max_retries=3)
+
+            # 같은 페이지 제품은 같은 수집 시각 사용 (초 단위)
+            crawl_strdatetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
             products = []
+            extract = self.extractors
             for idx, item in enumerate(base_containers, 1):
                 try:
-                    product_url_raw = self.safe_extract(item, 'product_url')
-                    product_url = f"https://www.amazon.com{product_url_raw}" if product_url_raw and product_url_raw.startswith('/') else product_url_raw
+                    product_url_raw = extract['product_url'](item)
+                    product_url = AMAZON_BASE_URL + product_url_raw if product_url_raw and product_url_raw[0] == '/' else product_url_raw
 
                     # bsr_rank 추출 및 후처리 (# 및 쉼표 제거)
-                    bsr_rank_raw = self.safe_extract(item, 'bsr_rank')
+                    bsr_rank_raw = extract['bsr_rank'](item)
                     bsr_rank = bsr_rank_raw.replace('#', '').replace(',', '').strip() if bsr_rank_raw else None
 
-                    product_data = {
-                        'account_name': self.account_name,
-                        'page_type': self.page_type,
-                        'retailer_sku_name': self.safe_extract(item, 'retailer_sku_name'),
-                        'final_sku_price': self.safe_extract(item, 'final_sku_price'),
-                        'bsr_rank': bsr_rank,
-                        'page_number': page_number,
-                        'product_url': product_url,
-                        'calendar_week': self.calendar_week,
-                        'crawl_strdatetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'batch_id': self.batch_id
-                    }
-
-                    products.append(product_data)
+                    products.append(ProductRow(
+                        account_name=self.account_name,
+                        page_type=self.page_type,
+                        retailer_sku_name=extract['retailer_sku_name'](item),
+                        final_sku_price=extract['final_sku_price'](item),
+                        bsr_rank=bsr_rank,
+                        page_number=page_number,
+                        product_url=product_url,
+                        calendar_week=self.calendar_week,
+                        crawl_strdatetime=crawl_strdatetime,
+                        batch_id=self.batch_id
+                    ))
 
                 except Exception as e:
                     print(f"[ERROR] Product {idx} extract failed: {e}")
@@ -443,7 +576,7 @@ class AmazonBSRCrawler(BaseCrawler):
             return []
 
     def save_products(self, products):
-        """DB 저장: 정규화된 URL로 중복 확인 → UPDATE(기존) / INSERT(신규) → 3-tier retry"""
+        """DB 저장: 정규화된 URL로 중복 확인 → UPDATE(기존) / INSERT(신규) 1회 커밋 → 데이터 오류 시 3-tier retry"""
         if not products:
             return {'insert': 0, 'update': 0}
 
@@ -451,31 +584,34 @@ class AmazonBSRCrawler(BaseCrawler):
         self.stats['collected'] += len(products)
 
         try:
-            cursor = self.db_conn.cursor()
-            insert_count = 0
-            update_count = 0
+            cursor = self.save_cursor
 
             products_to_update = []
             products_to_insert = []
 
-            # 1회 DB 조회로 기존 URL 캐시 생성
-            existing_urls = self.build_existing_urls_cache(self.account_name, self.batch_id)
+            # 기존 URL 캐시는 실행 중 1회만 DB 조회 (이후 INSERT 결과로 갱신, 조회 실패 시 다음 저장에서 재시도)
+            if self.existing_urls is None:
+                self.existing_urls = self.build_existing_urls_cache(self.account_name, self.batch_id)
+            existing_urls = self.existing_urls or {}
 
+            batch_urls = set()  # 이번 저장 묶음 안의 중복 확인용 (crawled_urls에는 커밋 후 추가)
             for product in products:
                 # URL 정규화
-                normalized_url = self.normalize_amazon_url(product['product_url'])
+                normalized_url = self.normalize_amazon_url(product.product_url)
 
-                # 1. 페이지 간 중복 체크 (이미 수집한 URL → 스킵)
-                if normalized_url in self.crawled_urls:
+                # 1. 페이지 간 중복 체크 (이미 저장한 URL → 스킵)
+                if normalized_url in self.crawled_urls or normalized_url in batch_urls:
                     self.stats['duplicates'] += 1
                     continue
-                self.crawled_urls.add(normalized_url)
+                batch_urls.add(normalized_url)
 
                 # 2. DB 캐시에서 기존 URL 체크 → UPDATE / INSERT 분류
                 matched_url = existing_urls.get(normalized_url)
                 if matched_url:
-                    product['matched_url'] = matched_url  # DB에서 매칭된 원본 URL 저장
-                    products_to_update.append(product)
+                    # UPDATE 파라미터 tuple (WHERE 조건은 DB에 저장된 원본 URL 사용)
+                    products_to_update.append((
+                        product.bsr_rank, product.page_number, product.account_name, product.batch_id, matched_url
+                    ))
                 else:
                     products_to_insert.append(product)
 
@@ -486,97 +622,101 @@ class AmazonBSRCrawler(BaseCrawler):
                 WHERE account_name = %s AND batch_id = %s AND product_url = %s
             """
 
-            for product in products_to_update:
-                try:
-                    cursor.execute(update_query, (
-                        product['bsr_rank'],
-                        product['page_number'],
-                        self.account_name,
-                        product['batch_id'],
-                        product['matched_url']  # DB에 저장된 원본 URL 사용
-                    ))
-                    self.db_conn.commit()
-                    update_count += 1
-                except Exception as e:
-                    print(f"[WARNING] UPDATE failed: {product.get('matched_url', 'N/A')[:50]}: {e}")
-                    self.db_conn.rollback()
-
-            # INSERT 처리 (3-tier retry)
-            if products_to_insert:
-                insert_query = """
-                    INSERT INTO amazon_hhp_product_list (
-                        account_name, page_type, retailer_sku_name,
-                        final_sku_price, bsr_rank, bsr_page_number, product_url,
-                        calendar_week, crawl_strdatetime, batch_id
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                """
-
-                BATCH_SIZE = 20
-                RETRY_SIZE = 5
-
-                def product_to_tuple(product):
-                    return (
-                        product['account_name'],
-                        product['page_type'],
-                        product['retailer_sku_name'],
-                        product['final_sku_price'],
-                        product['bsr_rank'],
-                        product['page_number'],
-                        product['product_url'],
-                        product['calendar_week'],
-                        product['crawl_strdatetime'],
-                        product['batch_id']
-                    )
+            insert_query = """
+                INSERT INTO amazon_hhp_product_list (
+                    account_name, page_type, retailer_sku_name,
+                    final_sku_price, bsr_rank, bsr_page_number, product_url,
+                    calendar_week, crawl_strdatetime, batch_id
+                ) VALUES %s
+            """
 
-                def save_batch(batch_products):
-                    values_list = [product_to_tuple(p) for p in batch_products]
-                    cursor.executemany(insert_query, values_list)
-                    self.db_conn.commit()
-                    return len(batch_products)
+            # 1. 전체 UPDATE/INSERT를 1개 트랜잭션으로 처리 (커밋 1회)
+            try:
+                if products_to_update:
+                    cursor.executemany(update_query, products_to_update)
+                if products_to_insert:
+                    # INSERT는 multi-row VALUES 1개로 전송 (ProductRow는 tuple이므로 변환 없이 그대로 전달)
+                    execute_values(cursor, insert_query, products_to_insert,
+                                   template=PRODUCT_ROW_TEMPLATE, page_size=len(products_to_insert))
+                self.db_conn.commit()
+                self.remember_inserted_urls(products_to_insert)
+                self.crawled_urls.update(batch_urls)
+                update_count = len(products_to_update)
+                insert_count = len(products_to_insert)
+
+            except (psycopg2.IntegrityError, psycopg2.DataError):
+                # 2. 데이터 오류 행이 있으면 롤백 후 기존 방식(UPDATE 1개씩, INSERT 3-tier)으로 재시도
+                self.db_conn.rollback()
+                update_count = self.save_updates_one_by_one(cursor, update_query, products_to_update)
+                insert_count = self.save_inserts_with_retry(cursor, insert_query, products_to_insert)
 
-                for batch_start in range(0, len(products_to_insert), BATCH_SIZE):
-                    batch_end = min(batch_start + BATCH_SIZE, len(products_to_insert))
-                    batch_products = products_to_insert[batch_start:batch_end]
+            self.stats['updated'] += update_count
+            self.stats['inserted'] += insert_count
+            return {'insert': insert_count, 'update': update_count}
+
+        except Exception as e:
+            print(f"[ERROR] Failed to save products: {e}")
+            traceback.print_exc()
+            self.db_conn.rollback()
+            return {'insert': 0, 'update': 0}
+
+    def save_updates_one_by_one(self, cursor, update_query, products_to_update):
+        """UPDATE 1개씩 커밋 (실패 행만 건너뜀)"""
+        update_count = 0
+        for update_values in products_to_update:
+            try:
+                cursor.execute(update_query, update_values)
+                self.db_conn.commit()
+                self.crawled_urls.add(self.normalize_amazon_url(update_values[-1]))
+                update_count += 1
+            except Exception as e:
+                print(f"[WARNING] UPDATE failed: {update_values[-1][:50]}: {e}")
+                self.db_conn.rollback()
+        return update_count
+
+    def save_inserts_with_retry(self, cursor, insert_query, products_to_insert):
+        """INSERT 3-tier retry: BATCH_SIZE → RETRY_SIZE → 1개씩 (실패 행만 건너뜀)"""
+        BATCH_SIZE = 20
+        RETRY_SIZE = 5
+        insert_count = 0
+
+        def save_batch(batch_products):
+            execute_values(cursor, insert_query, batch_products, template=PRODUCT_ROW_TEMPLATE, page_size=len(batch_products))
+            self.db_conn.commit()
+            self.remember_inserted_urls(batch_products)
+            return len(batch_products)
+
+        for batch_start in range(0, len(products_to_insert), BATCH_SIZE):
+            batch_end = min(batch_start + BATCH_SIZE, len(products_to_insert))
+            batch_products = products_to_insert[batch_start:batch_end]
+
+            try:
+                insert_count += save_batch(batch_products)
+
+            except Exception:
+                self.db_conn.rollback()
+
+                for sub_start in range(0, len(batch_products), RETRY_SIZE):
+                    sub_end = min(sub_start + RETRY_SIZE, len(batch_products))
+                    sub_batch = batch_products[sub_start:sub_end]
 
                     try:
-                        insert_count += save_batch(batch_products)
+                        insert_count += save_batch(sub_batch)
 
                     except Exception:
                         self.db_conn.rollback()
 
-                        for sub_start in range(0, len(batch_products), RETRY_SIZE):
-                            sub_end = min(sub_start + RETRY_SIZE, len(batch_products))
-                            sub_batch = batch_products[sub_start:sub_end]
-
+                        for single_product in sub_batch:
                             try:
-                                insert_count += save_batch(sub_batch)
-
-                            except Exception:
+                                insert_count += save_batch([single_product])
+                            except Exception as single_error:
+                                print(f"[ERROR] DB save failed: {(single_product.retailer_sku_name or 'N/A')[:30]}: {single_error}")
+                                values = cursor.mogrify(PRODUCT_ROW_TEMPLATE, single_product)
+                                print(f"[DEBUG] Values:\n{values.decode('utf-8')}")
+                                traceback.print_exc()
                                 self.db_conn.rollback()
 
-                                for single_product in sub_batch:
-                                    try:
-                                        cursor.execute(insert_query, product_to_tuple(single_product))
-                                        self.db_conn.commit()
-                                        insert_count += 1
-                                    except Exception as single_error:
-                                        print(f"[ERROR] DB save failed: {(single_product.get('retailer_sku_name') or 'N/A')[:30]}: {single_error}")
-                                        query = cursor.mogrify(insert_query, product_to_tuple(single_product))
-                                        print(f"[DEBUG] Query:\n{query.decode('utf-8')}")
-                                        traceback.print_exc()
-                                        self.db_conn.rollback()
-
-            cursor.close()
-            self.stats['updated'] += update_count
-            self.stats['inserted'] += insert_count
-            return {'insert': insert_count, 'update': update_count}
-
-        except Exception as e:
-            print(f"[ERROR] Failed to save products: {e}")
-            traceback.print_exc()
-            return {'insert': 0, 'update': 0}
+        return insert_count
 
     def run(self):
         """실행: initialize() → 페이지별 crawl_page() → save_products() → 리소스 정리"""
@@ -600,6 +740,9 @@ class AmazonBSRCrawler(BaseCrawler):
                 else:
                     remaining = target_products - (total_insert + total_update)
                     products_to_save = products[:remaining]
+                    # 차단 없이 수집된 페이지만 대기 시간 감소
+                    if not self.page_blocked:
+                        self.page_delay_success()
                     result = self.save_products(products_to_save)
                     total_insert += result['insert']
                     total_update += result['update']
@@ -607,7 +750,7 @@ class AmazonBSRCrawler(BaseCrawler):
                     if (total_insert + total_update) >= target_products:
                         break
 
-                time.sleep(random.uniform(10, 15))
+                self.wait_page_delay()
                 page_num += 1
 
             print(f"[DONE] Page: {page_num}, Update: {total_update}, Insert: {total_insert}, batch_id: {self.batch_id}")
@@ -626,6 +769,8 @@ class AmazonBSRCrawler(BaseCrawler):
 
             if self.driver:
                 self.driver.quit()
+            if self.save_cursor:
+                self.save_cursor.close()
             if self.db_conn:
                 self.db_conn.close()
 
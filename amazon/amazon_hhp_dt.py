@@ -23,16 +23,19 @@ Amazon Detail 페이지 크롤러
 import sys
 import os
 import time
-import traceback
 import random
 import re
 import subprocess
+import logging
+import json
+import csv
+import io
 from datetime import datetime
-from lxml import html
+from psycopg2.extras import RealDictCursor
 
 # 공통 환경 설정 (작업 디렉토리, 한글 출력, 경로 설정)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common.setup import setup_environment
+from common.setup import setup_environment, setup_logging, flush_logging
 setup_environment(__file__)
 
 from common.base_crawler import BaseCrawler
@@ -42,22 +45,117 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 
+logger = logging.getLogger(__name__)
+
 # 재시도 설정
 MAX_RETRY = 3
 
+# 제품 단위 로그 버퍼 크기 (print 대신 logger로 모아서 출력)
+LOG_BUFFER_CAPACITY = 1000
+
 # 리뷰 추출 방식 설정
 # 'review_page': 리뷰 상세 페이지에서 추출 (최대 20개, 페이지 이동 필요)
 # 'detail_page': 상품 페이지에서 추출 (최대 10개, 페이지 이동 없음)
 REVIEW_EXTRACT_MODE = 'detail_page'
 
+# URL에서 ASIN 추출 (/dp/ASIN/ 또는 URL 인코딩된 %2Fdp%2FASIN%)
+ASIN_PATTERN = re.compile(r'(?:/dp/([A-Z0-9]{10})/|%2[fF]dp%2[fF]([A-Z0-9]{10})%)')
+
+# 필드별 XPath 우선순위 (앞에서부터 시도하여 첫 번째 추출값 사용)
+FINAL_SKU_PRICE_FIELDS = (
+    'final_sku_price',
+    'final_sku_price_fallback',
+    'final_sku_price_nofeatured',    # No featured offers available
+    'final_sku_price_unavailable',   # Currently unavailable
+    'final_sku_price_see_in_cart',   # See price in cart
+)
+SUMMARIZED_REVIEW_FIELDS = ('summarized_review_content', 'summarized_review_content_fallback')
+
+# BSR 제품에서 상세 페이지 값으로 채우는 필드 (추출값 그대로 저장)
+BSR_DETAIL_FIELDS = ('discount_type', 'original_sku_price')
+
+# CAPTCHA 키워드 (소문자)
+CAPTCHA_KEYWORDS = ('captcha', 'robot', 'human verification', 'press & hold', 'press and hold')
+
+# CAPTCHA 입력 페이지 감지 문구 (단순 'captcha' 키워드는 오탐지 발생)
+CAPTCHA_PHRASES = (
+    'api-services-support@amazon.com',
+    'enter the characters you see below',
+    'type the characters you see in this image',
+    "sorry, we just need to make sure you're not a robot",
+)
+
+# 쓰로틀링/Sorry 페이지 감지 (대소문자 무시 검색 → page_source 전체 소문자 복사본 생성 없음)
+THROTTLE_PATTERN = re.compile(r'request was throttled|please wait a moment and refresh', re.IGNORECASE)
+SORRY_PATTERN = re.compile(r'sorry|robot check', re.IGNORECASE)
+# Sorry 페이지 확인용 제목 + HTML 앞부분 2000자 (page_source/title 2회 호출 대신 1회)
+SORRY_SNIPPET_SCRIPT = "return [document.title, document.documentElement ? document.documentElement.outerHTML.slice(0, 2000) : ''];"
+
+# 리뷰 텍스트 공백 정규화 (연속 공백/줄바꿈 → 공백 1개)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# hhp_retail_com 저장 컬럼 (INSERT 컬럼 순서 = 값 튜플 순서)
+RETAIL_COM_COLUMNS = (
+    'country', 'product', 'item', 'account_name', 'page_type',
+    'retailer_sku_name', 'product_url',
+    'count_of_reviews', 'star_rating', 'count_of_star_ratings',
+    'sku_popularity', 'bundle', 'trade_in',
+    'retailer_membership_discounts',
+    'rank_1', 'rank_2',
+    'hhp_carrier', 'hhp_storage', 'hhp_color',
+    'detailed_review_content', 'summarized_review_content',
+    'final_sku_price', 'original_sku_price',
+    'shipping_info', 'available_quantity_for_purchase',
+    'discount_type', 'main_rank', 'bsr_rank',
+    'number_of_units_purchased_past_month',
+    'calendar_week', 'crawl_strdatetime', 'batch_id',
+)
+
+# 서버 측 PREPARE된 INSERT 문 이름 (DB 세션 단위, COPY 실패 시 1개씩 저장에 사용)
+INSERT_STATEMENT_NAME = 'retail_com_insert'
+
+# COPY CSV의 NULL 표기 (빈 문자열과 NULL 구분)
+COPY_NULL = '\\N'
+
+# 스펙(용량/색상)과 BSR 랭크가 위치한 섹션 (Additional details 펼친 후 이 부분만 재파싱)
+DETAIL_SPEC_SECTIONS = ', '.join([
+    '#productFactsDesktop_feature_div',
+    '#productOverview_feature_div',
+    '#detailBulletsWrapper_feature_div',
+    '#prodDetails',
+])
+
+# 상세 페이지용 Chrome 실행 인자 (프로세스 분리 최소화, 디스크 캐시 확대)
+DETAIL_CHROME_ARGS = [
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disk-cache-size=536870912',
+    '--blink-settings=imagesEnabled=false',
+]
+
+# 상세 페이지용 Chrome 환경설정 (이미지/CSS/미디어 로드 차단, 2 = block)
+DETAIL_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.stylesheets': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+}
+
+# 상세 페이지 로드 시 차단할 리소스 (DOM 텍스트만 사용하므로 불필요)
+DETAIL_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.mp4', '*.webm',
+    '*.woff', '*.woff2', '*.svg', '*.css',
+    '*://*.doubleclick.net/*',
+    '*://*.googletagmanager.com/*',
+    '*://*.amazon-adsystem.com/*',
+]
+
 
 class AmazonDetailCrawler(BaseCrawler):
     """
     Amazon Detail 페이지 크롤러
     """
 
-    def __init__(self, batch_id=None, login_success=None, test_mode=False):
-        """초기화. batch_id: 통합 크롤러에서 전달, login_success: 로그인 성공 여부, test_mode: 테스트 모드 여부"""
+    def __init__(self, batch_id=None, login_success=None, test_mode=False, test_count=None):
+        """초기화. batch_id: 통합 크롤러에서 전달, login_success: 로그인 성공 여부, test_mode: 테스트 모드 여부, test_count: 테스트 모드 제품 수 제한"""
         super().__init__()
         self.batch_id = batch_id
         self.account_name = 'Amazon'
@@ -65,6 +163,10 @@ class AmazonDetailCrawler(BaseCrawler):
         self.cookies_loaded = False
         self.login_success = login_success
         self.test_mode = test_mode
+        self.test_count = test_count  # 테스트 모드 제품 수 제한 (None: batch 전체 처리)
+        self.insert_cursor = None
+        self.copy_query = None
+        self.page_tree = None  # 현재 페이지 파싱 트리 캐시 (페이지 이동/DOM 변경 시 무효화)
         self.standalone = batch_id is None
 
     def extract_review_count(self, text):
@@ -77,6 +179,10 @@ class AmazonDetailCrawler(BaseCrawler):
         match = re.search(r'\d+\.?\d*', text) if text else None
         return match.group(0) if match else None
 
+    def has_zero_ratings(self, count_of_star_ratings):
+        """상세 페이지에서 추출한 별점 수가 0인지 확인 (미추출 None은 False)"""
+        return bool(count_of_star_ratings) and count_of_star_ratings.replace(',', '') == '0'
+
     def convert_units_purchased_past(self, raw_value):
         """구매 수량 변환 (3K+ → 3000, 3M+ → 3000000)"""
         if not raw_value:
@@ -94,27 +200,38 @@ class AmazonDetailCrawler(BaseCrawler):
         return str(num)
 
     def initialize(self):
-        """초기화: batch_id 설정 → DB 연결 → XPath 로드 → WebDriver 설정 → 로그 정리"""
+        """초기화: batch_id 설정 → DB 연결 → XPath 로드 → INSERT PREPARE → WebDriver 설정 → 로그 정리"""
         # 1. batch_id 설정
         if not self.batch_id:
             self.batch_id = 't_a_20251211_141156'
 
+        # 제품 단위 로그 출력 설정 (버퍼링, traceback은 logger가 포맷)
+        # BaseCrawler 메서드는 print로 바로 출력하므로 호출 전 flush_logging(logger)로 버퍼를 비워 순서 유지
+        setup_logging(logger, buffer_capacity=LOG_BUFFER_CAPACITY)
+
         # 2. DB 연결
         if not self.connect_db():
-            print("[ERROR] Initialize failed: DB connection failed")
+            logger.error("Initialize failed: DB connection failed")
             return False
 
         # 3. XPath 로드
         if not self.load_xpaths(self.account_name, self.page_type):
-            print(f"[ERROR] Initialize failed: XPath load failed (account={self.account_name}, page_type={self.page_type})")
+            logger.error("Initialize failed: XPath load failed (account=%s, page_type=%s)", self.account_name, self.page_type)
             return False
 
-        # 4. WebDriver 설정 (강화된 봇 감지 회피)
+        # XPath 사전 컴파일 (제품마다 XPath 문자열 재파싱 방지)
+        self.compile_xpaths()
+
+        # INSERT 문 PREPARE + 저장용 커서 생성 (세션 동안 재사용)
+        if not self.prepare_insert_statement():
+            logger.error("Initialize failed: INSERT statement prepare failed")
+            return False
+
+        # 4. WebDriver 설정 (강화된 봇 감지 회피 + 리소스 차단)
         try:
-            self.setup_driver_stealth(self.account_name)
+            self.setup_detail_driver()
         except Exception as e:
-            print(f"[ERROR] Initialize failed: WebDriver setup failed - {e}")
-            traceback.print_exc()
+            logger.error("Initialize failed: WebDriver setup failed - %s", e, exc_info=True)
             return False
 
         # 5. 쿠키 로드
@@ -124,11 +241,22 @@ class AmazonDetailCrawler(BaseCrawler):
             self.cookies_loaded = self.load_cookies(self.account_name)
 
         # 6. 로그 정리
+        flush_logging(logger)
         self.cleanup_old_logs()
 
-        print(f"[INFO] Initialize completed: batch_id={self.batch_id}, cookies_loaded={self.cookies_loaded}")
+        logger.info("Initialize completed: batch_id=%s, cookies_loaded=%s", self.batch_id, self.cookies_loaded)
+        flush_logging(logger)
         return True
 
+    def setup_detail_driver(self):
+        """상세 페이지용 WebDriver 설정: stealth 모드 + 캐시 확대 + 이미지/CSS/폰트/미디어/광고 차단"""
+        self.setup_driver_stealth(
+            self.account_name,
+            extra_args=DETAIL_CHROME_ARGS,
+            blocked_urls=DETAIL_BLOCKED_URLS,
+            extra_prefs=DETAIL_CHROME_PREFS
+        )
+
     def scroll_to_bottom(self):
         """페이지 하단까지 스크롤 (전체 콘텐츠 로드용) - 70% 스크롤"""
         try:
@@ -147,8 +275,86 @@ class AmazonDetailCrawler(BaseCrawler):
 
             time.sleep(random.uniform(0.5, 1))
         except Exception as e:
-            print(f"[WARNING] Scroll failed: {e}")
-            traceback.print_exc()
+            logger.warning("Scroll failed: %s", e, exc_info=True)
+
+    def evaluate_js(self, expression):
+        """CDP Runtime.evaluate로 JS 표현식 평가 후 값 반환 (WebElement 직렬화 없음)"""
+        response = self.driver.execute_cdp_cmd('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True
+        })
+        return response.get('result', {}).get('value')
+
+    def wait_js(self, expression, timeout=5, poll_interval=0.1):
+        """JS 표현식이 truthy 값을 반환할 때까지 대기 (timeout 초과 시 None)"""
+        end_time = time.time() + timeout
+        while time.time() < end_time:
+            value = self.evaluate_js(expression)
+            if value:
+                return value
+            time.sleep(poll_interval)
+        return None
+
+    def xpath_node_js(self, xpath):
+        """XPath로 첫 번째 요소를 찾는 JS 표현식 생성"""
+        return f"document.evaluate({json.dumps(xpath)}, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue"
+
+    def wait_clickable_js(self, xpath, timeout=3):
+        """XPath 요소가 화면에 표시될 때까지 JS로 대기 (EC.element_to_be_clickable 대체)"""
+        expression = f"(() => {{ const el = {self.xpath_node_js(xpath)}; return !!el && el.offsetParent !== null && !el.disabled; }})()"
+        return bool(self.wait_js(expression, timeout=timeout))
+
+    def wait_xpath_js(self, xpath, timeout=3):
+        """XPath 노드가 DOM에 나타날 때까지 JS로 대기 (펼치기/스크롤 후 지연 로드되는 내용 확인용)"""
+        return bool(self.wait_js(f"!!{self.xpath_node_js(xpath)}", timeout=timeout))
+
+    def click_xpath_js(self, xpath):
+        """XPath 요소를 화면 중앙으로 스크롤 후 JS로 클릭 (요소 없으면 False)"""
+        expression = (
+            f"(() => {{ const el = {self.xpath_node_js(xpath)}; if (!el) return false; "
+            f"el.scrollIntoView({{block: 'center'}}); el.click(); return true; }})()"
+        )
+        return bool(self.evaluate_js(expression))
+
+    def parse_sections_js(self, css_selector):
+        """CSS 셀렉터에 해당하는 섹션들의 outerHTML만 가져와 파싱 (없으면 None)"""
+        fragment_html = self.evaluate_js(
+            f"Array.from(document.querySelectorAll({json.dumps(css_selector)})).map(el => el.outerHTML).join('')"
+        )
+        if not fragment_html:
+            return None
+        return self.parse_html(f"<div>{fragment_html}</div>")
+
+    def load_page_tree(self, page_html=None):
+        """현재 페이지를 파싱하여 트리 캐시 갱신 (페이지 이동/스크롤 등으로 DOM이 바뀐 뒤 호출)"""
+        if page_html is None:
+            page_html = self.driver.page_source
+        self.page_tree = self.parse_html(page_html)
+        return self.page_tree
+
+    def get_page_tree(self):
+        """캐시된 페이지 트리 반환 (무효화된 경우에만 재파싱)"""
+        if self.page_tree is None:
+            return self.load_page_tree()
+        return self.page_tree
+
+    def invalidate_page_tree(self):
+        """페이지 트리 캐시 무효화 (클릭 등 DOM 변경 후 호출)"""
+        self.page_tree = None
+
+    def extract_from_sections(self, section_tree, field_names):
+        """섹션 트리에서 필드 추출 (섹션이 없거나 섹션에서 비어 있는 필드만 전체 페이지를 파싱하여 재추출)"""
+        values = {}
+        if section_tree is not None:
+            values = {field_name: self.safe_extract(section_tree, field_name) for field_name in field_names}
+
+        missing = [field_name for field_name in field_names if not values.get(field_name)]
+        if missing:
+            tree = self.get_page_tree()
+            for field_name in missing:
+                values[field_name] = self.safe_extract(tree, field_name)
+
+        return values
 
     def run_login_and_reload_cookies(self):
         """로그인 스크립트 실행 후 쿠키 갱신"""
@@ -156,7 +362,7 @@ class AmazonDetailCrawler(BaseCrawler):
             login_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'amazon_hhp_login.py')
 
             if not os.path.exists(login_script):
-                print(f"[ERROR] Login script not found: {login_script}")
+                logger.error("Login script not found: %s", login_script)
                 return False
 
             result = subprocess.run(
@@ -167,11 +373,12 @@ class AmazonDetailCrawler(BaseCrawler):
             )
 
             if result.stdout:
-                print(result.stdout)
+                logger.info("Login script output:\n%s", result.stdout)
             if result.stderr:
-                print(result.stderr)
+                logger.warning("Login script stderr:\n%s", result.stderr)
 
             if result.returncode == 0 or 'LOGIN SUCCESSFUL' in result.stdout or 'Successfully logged in' in result.stdout:
+                flush_logging(logger)
                 self.cookies_loaded = self.load_cookies(self.account_name)
                 if self.cookies_loaded:
                     self.login_success = True
@@ -179,21 +386,18 @@ class AmazonDetailCrawler(BaseCrawler):
             return False
 
         except subprocess.TimeoutExpired:
-            print("[ERROR] Login script timed out")
+            logger.error("Login script timed out")
             return False
         except Exception as e:
-            print(f"[ERROR] Login failed: {e}")
-            traceback.print_exc()
+            logger.error("Login failed: %s", e, exc_info=True)
             return False
 
     def load_product_list(self):
         """product_list 조회: batch_id 기준으로 제품 URL 및 기본 정보 조회"""
         try:
-            cursor = self.db_conn.cursor()
-
             query = """
                 SELECT
-                    account_name, page_type, retailer_sku_name,
+                    page_type, retailer_sku_name,
                     number_of_units_purchased_past_month, final_sku_price, original_sku_price,
                     shipping_info, available_quantity_for_purchase, discount_type,
                     main_rank, bsr_rank, product_url, calendar_week, batch_id
@@ -201,37 +405,22 @@ class AmazonDetailCrawler(BaseCrawler):
                 WHERE account_name = %s AND batch_id = %s AND product_url IS NOT NULL
                 ORDER BY id
             """
+            params = [self.account_name, self.batch_id]
 
-            cursor.execute(query, (self.account_name, self.batch_id))
-            rows = cursor.fetchall()
-            cursor.close()
-
-            products = []
-            for row in rows:
-                product = {
-                    'account_name': self.account_name,
-                    'page_type': row[1],
-                    'retailer_sku_name': row[2],
-                    'number_of_units_purchased_past_month': row[3],
-                    'final_sku_price': row[4],
-                    'original_sku_price': row[5],
-                    'shipping_info': row[6],
-                    'available_quantity_for_purchase': row[7],
-                    'discount_type': row[8],
-                    'main_rank': row[9],
-                    'bsr_rank': row[10],
-                    'product_url': row[11],
-                    'calendar_week': row[12],
-                    'batch_id': row[13]
-                }
-                products.append(product)
+            # 테스트 모드 제품 수 제한은 SQL에서 처리 (전체 조회 후 슬라이싱 방지)
+            if self.test_mode and self.test_count:
+                query += " LIMIT %s"
+                params.append(self.test_count)
+
+            # 서버 측 커서로 나눠 받으며 컬럼명 기반 매핑 (fetchall 결과 복사본 없음)
+            rows = self.iter_query(query, params, 'product_list_stream', cursor_factory=RealDictCursor)
+            products = [{'account_name': self.account_name, **row} for row in rows]
 
-            print(f"[INFO] Loaded {len(products)} products")
+            logger.info("Loaded %d products", len(products))
             return products
 
         except Exception as e:
-            print(f"[ERROR] Failed to load product list: {e}")
-            traceback.print_exc()
+            logger.error("Failed to load product list: %s", e, exc_info=True)
             return []
 
     def extract_asin_from_url(self, product_url):
@@ -239,45 +428,41 @@ class AmazonDetailCrawler(BaseCrawler):
         if not product_url:
             return None
 
-        match = re.search(r'/dp/([A-Z0-9]{10})/', product_url)
-        if match:
-            return match.group(1)
-
-        match = re.search(r'%2[fF]dp%2[fF]([A-Z0-9]{10})%', product_url)
+        match = ASIN_PATTERN.search(product_url)
         if match:
-            return match.group(1)
+            return match.group(1) or match.group(2)
 
         return None
 
     def is_throttled(self):
         """현재 페이지가 쓰로틀링 상태인지 확인"""
-        page_source = self.driver.page_source.lower()
-        return "request was throttled" in page_source or "please wait a moment and refresh" in page_source
+        return THROTTLE_PATTERN.search(self.driver.page_source) is not None
 
     def restart_browser(self, url):
         """브라우저 재시작: 드라이버 종료 → 새 드라이버 생성 → URL 접근"""
         try:
-            print("[INFO] Closing browser...")
+            logger.info("Closing browser...")
             if self.driver:
                 self.driver.quit()
 
-            print("[INFO] Waiting before restart...")
+            logger.info("Waiting before restart...")
             time.sleep(random.uniform(10, 15))
 
-            print("[INFO] Starting new browser...")
-            self.setup_driver_stealth(self.account_name)
+            logger.info("Starting new browser...")
+            flush_logging(logger)
+            self.setup_detail_driver()
 
             # 쿠키 재로드
             if self.login_success is not False:
                 self.cookies_loaded = self.load_cookies(self.account_name)
 
-            print(f"[INFO] Accessing URL: {url[:80]}...")
+            logger.info("Accessing URL: %s...", url[:80])
             self.driver.get(url)
             time.sleep(random.uniform(8, 12))
 
             return True
         except Exception as e:
-            print(f"[ERROR] Browser restart failed: {e}")
+            logger.error("Browser restart failed: %s", e)
             return False
 
     def check_and_handle_throttling(self, url, max_retries=2, max_browser_restarts=3):
@@ -285,11 +470,11 @@ class AmazonDetailCrawler(BaseCrawler):
         # 1단계: 새로고침 재시도
         for retry in range(max_retries):
             if self.is_throttled():
-                print(f"[WARNING] Throttling detected (refresh attempt {retry + 1}/{max_retries})")
-                print("[INFO] Waiting before refresh...")
+                logger.warning("Throttling detected (refresh attempt %d/%d)", retry + 1, max_retries)
+                logger.info("Waiting before refresh...")
                 time.sleep(random.uniform(15, 20))
 
-                print("[INFO] Refreshing page...")
+                logger.info("Refreshing page...")
                 self.driver.refresh()
                 time.sleep(random.uniform(8, 12))
             else:
@@ -297,15 +482,15 @@ class AmazonDetailCrawler(BaseCrawler):
 
         # 2단계: URL 직접 접근 시도
         if self.is_throttled():
-            print(f"[WARNING] Still throttled after {max_retries} refreshes. Trying direct URL access...")
+            logger.warning("Still throttled after %d refreshes. Trying direct URL access...", max_retries)
             time.sleep(random.uniform(10, 15))
 
-            print(f"[INFO] Accessing URL directly: {url[:80]}...")
+            logger.info("Accessing URL directly: %s...", url[:80])
             self.driver.get(url)
             time.sleep(random.uniform(5, 8))
 
             if not self.is_throttled():
-                print("[OK] Direct URL access successful")
+                logger.info("Direct URL access successful")
                 return True
 
         # 3단계: 브라우저 재시작 시도
@@ -313,62 +498,61 @@ class AmazonDetailCrawler(BaseCrawler):
             if not self.is_throttled():
                 return True
 
-            print(f"[WARNING] Still throttled. Restarting browser (attempt {restart_attempt + 1}/{max_browser_restarts})...")
+            logger.warning("Still throttled. Restarting browser (attempt %d/%d)...", restart_attempt + 1, max_browser_restarts)
 
             if not self.restart_browser(url):
-                print(f"[ERROR] Browser restart attempt {restart_attempt + 1} failed")
+                logger.error("Browser restart attempt %d failed", restart_attempt + 1)
                 continue
 
             time.sleep(random.uniform(5, 8))
 
             if not self.is_throttled():
-                print(f"[OK] Browser restart successful on attempt {restart_attempt + 1}")
+                logger.info("Browser restart successful on attempt %d", restart_attempt + 1)
                 return True
 
-        print(f"[ERROR] Still throttled after {max_browser_restarts} browser restarts")
+        logger.error("Still throttled after %d browser restarts", max_browser_restarts)
         return False
 
     def check_and_handle_sorry_page(self, max_retries=3):
         """Sorry/Robot check 페이지 감지 및 처리"""
         for attempt in range(max_retries):
-            page_source = self.driver.page_source.lower()
-            title = self.driver.title.lower()
+            title, page_head = self.driver.execute_script(SORRY_SNIPPET_SCRIPT)
 
-            # Sorry/Robot check 페이지 감지 (처음 2000자만 확인)
+            # Sorry/Robot check 페이지 감지 (제목 + 처음 2000자만 확인)
             is_sorry_page = (
-                'sorry' in title or
-                'robot check' in title or
-                'sorry' in page_source[:2000] or
-                'robot check' in page_source[:2000]
+                SORRY_PATTERN.search(title) is not None or
+                SORRY_PATTERN.search(page_head) is not None
             )
 
             if is_sorry_page:
-                print(f"[WARNING] Sorry/Robot check page detected (attempt {attempt + 1}/{max_retries})")
+                logger.warning("Sorry/Robot check page detected (attempt %d/%d)", attempt + 1, max_retries)
                 if attempt < max_retries - 1:
-                    print(f"[INFO] Refreshing page in 2-3 seconds...")
+                    logger.info("Refreshing page in 2-3 seconds...")
                     time.sleep(random.uniform(2, 3))
                     self.driver.refresh()
-                    print(f"[INFO] Page refreshed, waiting for load...")
+                    logger.info("Page refreshed, waiting for load...")
                     time.sleep(random.uniform(3, 5))
                     continue
                 else:
-                    print(f"[ERROR] Still sorry page after {max_retries} retries")
+                    logger.error("Still sorry page after %d retries", max_retries)
                     return False
             else:
                 if attempt > 0:
-                    print(f"[OK] Page loaded successfully after {attempt} refresh(es)")
+                    logger.info("Page loaded successfully after %d refresh(es)", attempt)
                 return True
 
         return False
 
+    def contains_keyword(self, page_html, keywords):
+        """페이지 HTML에 키워드(소문자)가 하나라도 있는지 확인 (소문자 변환 1회 후 검사)"""
+        page_html = page_html.lower()
+        return any(keyword in page_html for keyword in keywords)
+
     def handle_captcha(self):
         """CAPTCHA 자동 해결"""
         try:
             time.sleep(1)
-            page_html = self.driver.page_source.lower()
-
-            captcha_keywords = ['captcha', 'robot', 'human verification', 'press & hold', 'press and hold']
-            if not any(keyword in page_html for keyword in captcha_keywords):
+            if not self.contains_keyword(self.driver.page_source, CAPTCHA_KEYWORDS):
                 return True
 
             captcha_selectors = [
@@ -409,8 +593,7 @@ class AmazonDetailCrawler(BaseCrawler):
                 actions.perform()
                 time.sleep(random.uniform(3, 5))
 
-                new_page_html = self.driver.page_source.lower()
-                if not any(keyword in new_page_html for keyword in captcha_keywords):
+                if not self.contains_keyword(self.driver.page_source, CAPTCHA_KEYWORDS):
                     return True
                 else:
                     time.sleep(60)
@@ -421,34 +604,30 @@ class AmazonDetailCrawler(BaseCrawler):
                 return True
 
         except Exception as e:
-            print(f"[ERROR] CAPTCHA handling failed: {e}")
-            traceback.print_exc()
+            logger.warning("CAPTCHA handling failed: %s", e, exc_info=True)
             return False
 
     def extract_reviews_from_detail_page(self, tree, max_reviews=10):
         """상세 페이지에서 리뷰 추출"""
         try:
             # 리뷰 컨테이너 단위로 추출 (text() 대신 element 단위)
-            review_container_xpath = self.xpaths.get('review_container', {}).get('xpath')
-            if not review_container_xpath:
-                print("[ERROR] review_container XPath not found")
+            if not self.get_xpath('review_container'):
+                logger.warning("review_container XPath not found")
                 return None
-            review_containers = tree.xpath(review_container_xpath)
+            review_containers = self.select_nodes(tree, 'review_container')
 
             if not review_containers:
-                print("[ERROR] review_container not found")
+                logger.warning("review_container not found")
                 return None
 
-            review_containers = review_containers[:max_reviews]
-
-            cleaned_reviews = []
-            for container in review_containers:
-                # 각 컨테이너 내의 모든 텍스트를 합침
-                review_text = container.text_content()
-                if review_text:
-                    cleaned = ' '.join(review_text.split())
-                    if len(cleaned) > 10:
-                        cleaned_reviews.append(cleaned)
+            # 각 컨테이너 내의 모든 텍스트를 합친 뒤 공백 정규화
+            cleaned_reviews = [
+                cleaned for cleaned in (
+                    WHITESPACE_PATTERN.sub(' ', container.text_content()).strip()
+                    for container in review_containers[:max_reviews]
+                )
+                if len(cleaned) > 10
+            ]
 
             if not cleaned_reviews:
                 return None
@@ -458,8 +637,7 @@ class AmazonDetailCrawler(BaseCrawler):
             return result
 
         except Exception as e:
-            print(f"[ERROR] Review extraction failed: {e}")
-            traceback.print_exc()
+            logger.warning("Review extraction failed: %s", e, exc_info=True)
             return None
 
     def extract_reviews_from_review_page(self, item, max_reviews=20):
@@ -471,21 +649,16 @@ class AmazonDetailCrawler(BaseCrawler):
             # 'See more reviews' 버튼 찾기 및 클릭
             clicked = False
             try:
-                button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "//a[@data-hook='see-all-reviews-link-foot']"))
-                )
-                # 스크롤하여 버튼이 보이도록
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                time.sleep(1)
-                button.click()
-                clicked = True
-                print(f"[INFO] Clicked 'See more reviews' button")
+                see_all_xpath = "//a[@data-hook='see-all-reviews-link-foot']"
+                if self.wait_clickable_js(see_all_xpath, timeout=5) and self.click_xpath_js(see_all_xpath):
+                    clicked = True
+                    logger.info("Clicked 'See more reviews' button")
             except Exception:
                 pass
 
             if not clicked:
                 # 버튼을 찾지 못하면 URL로 직접 이동 (폴백)
-                print(f"[WARNING] 'See more reviews' button not found, using direct URL")
+                logger.warning("'See more reviews' button not found, using direct URL")
                 review_url = f"https://www.amazon.com/product-reviews/{item}/ref=cm_cr_dp_d_show_all_btm?ie=UTF8&reviewerType=all_reviews"
                 self.driver.get(review_url)
 
@@ -493,11 +666,11 @@ class AmazonDetailCrawler(BaseCrawler):
 
             # Sorry/Robot check 페이지 감지 및 처리
             if not self.check_and_handle_sorry_page():
-                print(f"[WARNING] Sorry/Robot page could not be resolved")
+                logger.warning("Sorry/Robot page could not be resolved")
                 return {'review_count': None, 'reviews': None, 'star_rating': None, 'star_rating_count': None}
 
             page_html = self.driver.page_source
-            tree = html.fromstring(page_html)
+            tree = self.parse_html(page_html)
 
             page_html_lower = page_html.lower()
             if "couldn't find that page" in page_html_lower or "page not found" in page_html_lower:
@@ -510,7 +683,7 @@ class AmazonDetailCrawler(BaseCrawler):
                     self.driver.get(review_url)
                     time.sleep(10)
                     page_html = self.driver.page_source
-                    tree = html.fromstring(page_html)
+                    tree = self.parse_html(page_html)
                     if 'signin' in self.driver.current_url:
                         return {'review_count': None, 'reviews': None, 'star_rating': None, 'star_rating_count': None}
                 else:
@@ -518,8 +691,7 @@ class AmazonDetailCrawler(BaseCrawler):
 
             review_count = None
             try:
-                review_count_xpath = self.xpaths.get('review_page_count', {}).get('xpath')
-                review_count_texts = tree.xpath(review_count_xpath)
+                review_count_texts = self.select_nodes(tree, 'review_page_count')
                 for text in review_count_texts:
                     text = text.strip()
                     if 'customer review' in text.lower():
@@ -534,15 +706,13 @@ class AmazonDetailCrawler(BaseCrawler):
             review_page_star_rating = self.extract_rating(self.safe_extract(tree, 'review_page_star_rating'))
             review_page_star_rating_count = self.extract_review_count(self.safe_extract(tree, 'review_page_star_rating_count'))
 
-            review_container_xpath = self.xpaths.get('review_page_container', {}).get('xpath')
-            review_content_xpath = self.xpaths.get('review_page_content', {}).get('xpath')
             next_page_xpath = self.xpaths.get('review_page_next_button', {}).get('xpath')
             
             cleaned_reviews = []
             max_pages = 3
 
             for page_num in range(1, max_pages + 1):
-                review_containers = tree.xpath(review_container_xpath)
+                review_containers = self.select_nodes(tree, 'review_page_container')
                 if not review_containers:
                     if page_num == 1:
                         return {
@@ -557,10 +727,9 @@ class AmazonDetailCrawler(BaseCrawler):
                     if len(cleaned_reviews) >= max_reviews:
                         break
                     try:
-                        body_texts = container.xpath(review_content_xpath)
+                        body_texts = self.select_nodes(container, 'review_page_content')
                         if body_texts:
-                            full_text = ' '.join(t.strip() for t in body_texts if t.strip())
-                            cleaned = ' '.join(full_text.split())
+                            cleaned = WHITESPACE_PATTERN.sub(' ', ' '.join(body_texts)).strip()
                             if cleaned:
                                 cleaned_reviews.append(cleaned)
                     except Exception:
@@ -577,7 +746,7 @@ class AmazonDetailCrawler(BaseCrawler):
                         next_button.click()
                         time.sleep(random.uniform(5, 10))
                         page_html = self.driver.page_source
-                        tree = html.fromstring(page_html)
+                        tree = self.parse_html(page_html)
                     else:
                         break
                 except Exception:
@@ -600,8 +769,7 @@ class AmazonDetailCrawler(BaseCrawler):
             }
 
         except Exception as e:
-            print(f"[ERROR] Review page extraction failed: {e}")
-            traceback.print_exc()
+            logger.warning("Review page extraction failed: %s", e, exc_info=True)
             return {'review_count': None, 'reviews': None, 'star_rating': None, 'star_rating_count': None}
 
     def crawl_detail(self, product):
@@ -611,24 +779,25 @@ class AmazonDetailCrawler(BaseCrawler):
             if not product_url:
                 return product
 
+            self.invalidate_page_tree()
             self.driver.get(product_url)
             time.sleep(random.uniform(5, 8))
 
             # Sorry/Robot check 페이지 처리
             if not self.check_and_handle_sorry_page(max_retries=3):
-                print(f"[SKIP] Skipping product due to persistent sorry/robot check page")
+                logger.warning("Skipping product due to persistent sorry/robot check page")
                 return product
 
             # 쓰로틀링 처리
             if not self.check_and_handle_throttling(product_url):
-                print(f"[SKIP] Skipping product due to throttling")
+                logger.warning("Skipping product due to throttling")
                 return product
 
             # 추가 대기 (봇 감지 후 안정화)
             time.sleep(random.uniform(1, 2))
 
             page_html = self.driver.page_source
-            tree = html.fromstring(page_html)
+            tree = self.load_page_tree(page_html)
 
             # 로그인 체크
             current_url = self.driver.current_url
@@ -636,19 +805,12 @@ class AmazonDetailCrawler(BaseCrawler):
                 return product
 
             # CAPTCHA 체크 (봇 감지와 별도로 CAPTCHA 입력 필요한 경우)
-            # 특정 문구로 정확하게 감지 (단순 'captcha' 키워드는 오탐지 발생)
-            captcha_phrases = [
-                'enter the characters you see below',
-                'sorry, we just need to make sure you\'re not a robot',
-                'type the characters you see in this image',
-                'api-services-support@amazon.com',
-            ]
-            if any(phrase in page_html.lower() for phrase in captcha_phrases):
+            if self.contains_keyword(page_html, CAPTCHA_PHRASES):
                 if self.handle_captcha():
                     self.driver.get(product_url)
                     time.sleep(random.uniform(5, 8))  # CAPTCHA 후 재로드
                     page_html = self.driver.page_source
-                    tree = html.fromstring(page_html)
+                    tree = self.load_page_tree(page_html)
                 else:
                     return product
 
@@ -667,21 +829,8 @@ class AmazonDetailCrawler(BaseCrawler):
             # final_sku_price 추출 (기존 값이 빈 경우)
             final_sku_price = product.get('final_sku_price')
             if not final_sku_price:
-                # current_price xpath로 추출 시도
-                final_sku_price = self.safe_extract(tree, 'final_sku_price')
-                if not final_sku_price:
-                    final_sku_price = self.safe_extract(tree, 'final_sku_price_fallback')
-
-                # 가격 추출 실패 시 가격없는 원인 확인
-                if not final_sku_price:
-                    # (No featured offers available)
-                    final_sku_price = self.safe_extract(tree, 'final_sku_price_nofeatured')
-                    if not final_sku_price:
-                        # (Currently unavailable)
-                        final_sku_price = self.safe_extract(tree, 'final_sku_price_unavailable')
-                        if not final_sku_price:
-                            # (See price in cart)
-                            final_sku_price = self.safe_extract(tree, 'final_sku_price_see_in_cart')
+                # 가격 → 가격 없는 원인 문구 순서로 추출
+                final_sku_price = self.select_best_match(tree, FINAL_SKU_PRICE_FIELDS)
 
                 # product에 업데이트
                 if final_sku_price:
@@ -704,15 +853,11 @@ class AmazonDetailCrawler(BaseCrawler):
                 if number_of_units_purchased_past_month:
                     product['number_of_units_purchased_past_month'] = number_of_units_purchased_past_month
 
-                # discount_type
-                discount_type = self.safe_extract(tree, 'discount_type')
-                if discount_type:
-                    product['discount_type'] = discount_type
-                    
-                # original_sku_price
-                original_sku_price = self.safe_extract(tree, 'original_sku_price')
-                if original_sku_price:
-                    product['original_sku_price'] = original_sku_price
+                # discount_type, original_sku_price
+                for field_name in BSR_DETAIL_FIELDS:
+                    value = self.safe_extract(tree, field_name)
+                    if value:
+                        product[field_name] = value
 
                 # available_quantity_for_purchase
                 available_quantity_for_purchase = self.safe_extract(tree, 'available_quantity_for_purchase')
@@ -724,9 +869,8 @@ class AmazonDetailCrawler(BaseCrawler):
                 
 
             # Trade-in 섹션은 JS로 늦게 로드될 수 있으므로 최신 HTML로 재파싱
-            page_html = self.driver.page_source
-            tree = html.fromstring(page_html)
-            
+            tree = self.load_page_tree()
+
             hhp_carrier = self.safe_extract(tree, 'hhp_carrier')
             sku_popularity = self.safe_extract(tree, 'sku_popularity')
             bundle = self.safe_extract_join(tree, 'bundle', ' ||| ')
@@ -735,64 +879,65 @@ class AmazonDetailCrawler(BaseCrawler):
                 retailer_membership_discounts_raw, 'Join Prime', 'before'
             )
            
-            trade_in = self.safe_extract_join(tree, 'trade_in', ' ')
-            if not trade_in:
-                trade_in = self.safe_extract(tree, 'trade_in_fallback')
+            trade_in = self.safe_extract_join(tree, 'trade_in', ' ') or self.safe_extract(tree, 'trade_in_fallback')
 
             # Additional details 버튼 클릭
-            hhp_storage = None
-            hhp_color = None
-            rank_1 = None
-            rank_2 = None
             additional_details_found = False
+            section_tree = None
+
+            review_link_clicked = False
 
             try:
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
                 time.sleep(0.5)
 
                 additional_details_xpath = self.xpaths.get('additional_details_button', {}).get('xpath')
-                if additional_details_xpath:
-                    try:
-                        additional_details_button = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, additional_details_xpath))
-                        )
-                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", additional_details_button)
-                        time.sleep(0.5)
-                        additional_details_button.click()
-                        time.sleep(0.5)
-                        additional_details_found = True
-
-                        item_details_xpath = self.xpaths.get('item_details_button', {}).get('xpath')
-                        if item_details_xpath:
-                            try:
-                                item_details_button = WebDriverWait(self.driver, 3).until(
-                                    EC.element_to_be_clickable((By.XPATH, item_details_xpath))
-                                )
-                                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", item_details_button)
-                                time.sleep(0.5)
-                                item_details_button.click()
-                                time.sleep(0.5)
-                            except Exception:
-                                pass  # Item details 버튼이 없을 수 있음
-                    except Exception:
-                        pass  # Additional details 버튼이 없을 수 있음
+                # 버튼이 없을 수 있음 (JS 폴링으로 대기, WebDriver 요소 조회 없음)
+                if additional_details_xpath and self.wait_clickable_js(additional_details_xpath, timeout=3):
+                    additional_details_found = self.click_xpath_js(additional_details_xpath)
 
-                page_html = self.driver.page_source
-                tree = html.fromstring(page_html)
+                if additional_details_found:
+                    self.invalidate_page_tree()
+
+                    # Item details는 Additional details가 펼쳐진 뒤 표시되므로 표시 대기 후 별도 클릭
+                    item_details_xpath = self.xpaths.get('item_details_button', {}).get('xpath')
+                    if item_details_xpath and self.wait_clickable_js(item_details_xpath, timeout=3):
+                        self.click_xpath_js(item_details_xpath)
+
+                    # 펼친 뒤에만 나타나는 스펙 필드 대기 (스펙이 없는 제품은 timeout 후 진행)
+                    storage_xpath = self.xpaths.get('hhp_storage', {}).get('xpath')
+                    if storage_xpath:
+                        self.wait_xpath_js(storage_xpath, timeout=3)
+
+                # 펼쳐진 스펙/랭크 섹션만 파싱 (전체 page_source 재파싱 대신)
+                section_tree = self.parse_sections_js(DETAIL_SPEC_SECTIONS)
 
             except Exception as e:
-                print(f"[WARNING] Additional details section failed: {e}")
+                self.invalidate_page_tree()
+                logger.warning("Additional details section failed: %s", e)
+
+            # 리뷰 링크 클릭 시도 (스펙 섹션 파싱 후 이동, 실패해도 계속 진행)
+            try:
+                self.driver.execute_script("window.scrollTo(0, 0);")
+                time.sleep(0.5)
+
+                review_link_xpath = self.xpaths.get('review_link', {}).get('xpath')
+                if review_link_xpath and self.wait_clickable_js(review_link_xpath, timeout=3):
+                    review_link_clicked = self.click_xpath_js(review_link_xpath)
+            except Exception:
+                self.invalidate_page_tree()
 
             # HHP 스펙 및 랭크 추출
             if additional_details_found:
-                hhp_storage = self.safe_extract(tree, 'hhp_storage')
-                hhp_color = self.safe_extract(tree, 'hhp_color')
+                storage_field, color_field = 'hhp_storage', 'hhp_color'
             else:
-                hhp_storage = self.safe_extract(tree, 'hhp_storage_fallback')
-                hhp_color = self.safe_extract(tree, 'hhp_color_fallback')
+                storage_field, color_field = 'hhp_storage_fallback', 'hhp_color_fallback'
 
-            rank_1 = self.safe_extract(tree, 'rank_1')
-            rank_2 = self.safe_extract(tree, 'rank_2')
+            spec_values = self.extract_from_sections(section_tree, [storage_field, color_field, 'rank_1', 'rank_2'])
+            hhp_storage = spec_values[storage_field]
+            hhp_color = spec_values[color_field]
+            rank_1 = spec_values['rank_1']
+            rank_2 = spec_values['rank_2']
 
             # 리뷰 섹션으로 이동
             summarized_review_content = None
@@ -801,25 +946,21 @@ class AmazonDetailCrawler(BaseCrawler):
             star_rating = None
             count_of_star_ratings = None
             detailed_review_content = None
-            # 리뷰 링크 클릭 시도 (실패해도 계속 진행)
-            try:
-                self.driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(0.5)
-
-                review_link_xpath = self.xpaths.get('review_link', {}).get('xpath')
-                if review_link_xpath:
-                    review_link = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, review_link_xpath))
-                    )
-                    review_link.click()
-                    time.sleep(1)
-            except Exception:
-                print("[INFO] 리뷰 링크 버튼 없음 - 현재 페이지에서 추출 진행")
+            # 리뷰 링크 클릭 후 리뷰 섹션 로드 대기 (컨테이너는 처음부터 있으므로 지연 로드되는 별점 요소로 확인, 실패해도 계속 진행)
+            if review_link_clicked:
+                star_rating_xpath = self.xpaths.get('star_rating', {}).get('xpath')
+                try:
+                    if star_rating_xpath:
+                        self.wait_xpath_js(star_rating_xpath, timeout=3)
+                except Exception:
+                    pass
+                self.invalidate_page_tree()
+            else:
+                logger.info("리뷰 링크 버튼 없음 - 현재 페이지에서 추출 진행")
 
-            # 리뷰 필드 추출
+            # 리뷰 필드 추출 (클릭이 없었으면 캐시된 트리 재사용)
             try:
-                page_html = self.driver.page_source
-                tree = html.fromstring(page_html)
+                tree = self.get_page_tree()
 
                 # 리뷰 관련 필드 (최대 3회 재시도)
                 count_of_reviews = None
@@ -839,8 +980,7 @@ class AmazonDetailCrawler(BaseCrawler):
                     for attempt in range(1, MAX_RETRY + 1):
                         # 첫 시도는 기존 tree 사용, 재시도 시에만 재파싱
                         if attempt > 1:
-                            page_html = self.driver.page_source
-                            tree = html.fromstring(page_html)
+                            tree = self.load_page_tree()
 
                         if count_of_star_ratings is None:
                             count_of_star_ratings_raw = self.safe_extract(tree, 'count_of_star_ratings')
@@ -862,22 +1002,23 @@ class AmazonDetailCrawler(BaseCrawler):
                             if not star_rating: missing.append('star_rating')
                             if not count_of_star_ratings: missing.append('count_of_star_ratings')
                             if missing:
-                                print(f"[WARNING] 리뷰 데이터 추출 실패 (시도 {attempt}/{MAX_RETRY}) - 미추출: {', '.join(missing)}")
+                                logger.warning("리뷰 데이터 추출 실패 (시도 %d/%d) - 미추출: %s", attempt, MAX_RETRY, ', '.join(missing))
+
+                summarized_review_content = self.select_best_match(tree, SUMMARIZED_REVIEW_FIELDS)
 
-                summarized_review_content = self.safe_extract(tree, 'summarized_review_content')
-                if not summarized_review_content:
-                    summarized_review_content = self.safe_extract(tree, 'summarized_review_content_fallback')
-                    
             except Exception as e:
-                print(f"[DEBUG] 리뷰 추출 예외: {e}")
-                pass
+                logger.debug("리뷰 추출 예외: %s", e)
 
             # 상세 리뷰 추출 (리뷰 없으면 건너뜀)
             if is_no_reviews:
                 detailed_review_content = 'No customer reviews'
             else:
                 # 리뷰 추출 (REVIEW_EXTRACT_MODE에 따라 방식 결정)
-                if REVIEW_EXTRACT_MODE == 'review_page':
+                if REVIEW_EXTRACT_MODE == 'review_page' and self.has_zero_ratings(count_of_star_ratings):
+                    # 별점 수 0: 리뷰 페이지 이동 생략 (페이지 로드 + 10초 대기 절약)
+                    count_of_reviews = '0'
+                    detailed_review_content = data_extractor.get_no_reviews_text(self.account_name)
+                elif REVIEW_EXTRACT_MODE == 'review_page':
                     # 리뷰 상세 페이지에서 추출
                     review_result = self.extract_reviews_from_review_page(item, max_reviews=20)
                     count_of_reviews = review_result.get('review_count') if review_result else None
@@ -919,90 +1060,68 @@ class AmazonDetailCrawler(BaseCrawler):
             return combined_data
 
         except Exception as e:
-            print(f"[ERROR] Detail crawl failed: {e}")
-            traceback.print_exc()
+            logger.warning("Detail crawl failed: %s", e, exc_info=True)
             return product
 
+    def prepare_insert_statement(self):
+        """INSERT 문을 서버 측에 1회 PREPARE (저장 시 플래너 비용 절감) + 저장용 커서 생성"""
+        # 테스트 모드면 test_hhp_retail_com, 통합 크롤러면 hhp_retail_com
+        table_name = 'test_hhp_retail_com' if self.test_mode else 'hhp_retail_com'
+        placeholders = ', '.join(f'${i}' for i in range(1, len(RETAIL_COM_COLUMNS) + 1))
+
+        try:
+            self.insert_cursor = self.db_conn.cursor()
+            self.insert_cursor.execute(f"""
+                PREPARE {INSERT_STATEMENT_NAME} AS
+                INSERT INTO {table_name} ({', '.join(RETAIL_COM_COLUMNS)})
+                VALUES ({placeholders})
+            """)
+            self.db_conn.commit()
+
+            # 배치 저장용 COPY 문 (SQL 파싱/파라미터 바인딩 없이 CSV 스트림으로 적재)
+            self.copy_query = (
+                f"COPY {table_name} ({', '.join(RETAIL_COM_COLUMNS)}) "
+                f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+            )
+            return True
+        except Exception as e:
+            logger.error("Failed to prepare insert statement: %s", e)
+            self.db_conn.rollback()
+            return False
+
+    def copy_products(self, cursor, products):
+        """제품 목록을 CSV로 변환하여 COPY FROM STDIN으로 적재 (None → COPY_NULL)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        for product in products:
+            writer.writerow([
+                COPY_NULL if product.get(column) is None else product.get(column)
+                for column in RETAIL_COM_COLUMNS
+            ])
+        buffer.seek(0)
+        cursor.copy_expert(self.copy_query, buffer)
+
     def save_to_retail_com(self, products):
-        """DB 저장: 2-tier retry (BATCH_SIZE=5 → 1개씩)"""
+        """DB 저장: 2-tier retry (BATCH_SIZE=5 COPY → 1개씩 PREPARE된 INSERT), 재사용 커서"""
         if not products:
             return 0
 
         try:
-            cursor = self.db_conn.cursor()
-
-            # 테스트 모드면 test_hhp_retail_com, 통합 크롤러면 hhp_retail_com
-            table_name = 'test_hhp_retail_com' if self.test_mode else 'hhp_retail_com'
-
-            insert_query = f"""
-                INSERT INTO {table_name} (
-                    country, product, item, account_name, page_type,
-                    retailer_sku_name, product_url,
-                    count_of_reviews, star_rating, count_of_star_ratings,
-                    sku_popularity, bundle, trade_in,
-                    retailer_membership_discounts,
-                    rank_1, rank_2,
-                    hhp_carrier, hhp_storage, hhp_color,
-                    detailed_review_content, summarized_review_content,
-                    final_sku_price, original_sku_price,
-                    shipping_info, available_quantity_for_purchase,
-                    discount_type, main_rank, bsr_rank,
-                    number_of_units_purchased_past_month,
-                    calendar_week, crawl_strdatetime, batch_id
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s
-                )
-            """
+            cursor = self.insert_cursor
+            execute_query = f"EXECUTE {INSERT_STATEMENT_NAME} ({', '.join(['%s'] * len(RETAIL_COM_COLUMNS))})"
 
             BATCH_SIZE = 5
             saved_count = 0
 
             def product_to_tuple(product):
-                return (
-                    product.get('country'),
-                    product.get('product'),
-                    product.get('item'),
-                    product.get('account_name'),
-                    product.get('page_type'),
-                    product.get('retailer_sku_name'),
-                    product.get('product_url'),
-                    product.get('count_of_reviews'),
-                    product.get('star_rating'),
-                    product.get('count_of_star_ratings'),
-                    product.get('sku_popularity'),
-                    product.get('bundle'),
-                    product.get('trade_in'),
-                    product.get('retailer_membership_discounts'),
-                    product.get('rank_1'),
-                    product.get('rank_2'),
-                    product.get('hhp_carrier'),
-                    product.get('hhp_storage'),
-                    product.get('hhp_color'),
-                    product.get('detailed_review_content'),
-                    product.get('summarized_review_content'),
-                    product.get('final_sku_price'),
-                    product.get('original_sku_price'),
-                    product.get('shipping_info'),
-                    product.get('available_quantity_for_purchase'),
-                    product.get('discount_type'),
-                    product.get('main_rank'),
-                    product.get('bsr_rank'),
-                    product.get('number_of_units_purchased_past_month'),
-                    product.get('calendar_week'),
-                    product.get('crawl_strdatetime'),
-                    product.get('batch_id')
-                )
+                return tuple(product.get(column) for column in RETAIL_COM_COLUMNS)
 
             for batch_start in range(0, len(products), BATCH_SIZE):
                 batch_end = min(batch_start + BATCH_SIZE, len(products))
                 batch_products = products[batch_start:batch_end]
 
                 try:
-                    values_list = [product_to_tuple(p) for p in batch_products]
-                    cursor.executemany(insert_query, values_list)
+                    self.copy_products(cursor, batch_products)
                     self.db_conn.commit()
                     saved_count += len(batch_products)
 
@@ -1011,34 +1130,32 @@ class AmazonDetailCrawler(BaseCrawler):
 
                     for single_product in batch_products:
                         try:
-                            cursor.execute(insert_query, product_to_tuple(single_product))
+                            cursor.execute(execute_query, product_to_tuple(single_product))
                             self.db_conn.commit()
                             saved_count += 1
                         except Exception as single_error:
-                            print(f"[ERROR] DB save failed: {single_product.get('item')}: {single_error}")
-                            query = cursor.mogrify(insert_query, product_to_tuple(single_product))
-                            print(f"[DEBUG] Query:\n{query.decode('utf-8')}")
-                            traceback.print_exc()
+                            logger.warning("DB save failed: %s: %s", single_product.get('item'), single_error)
+                            if logger.isEnabledFor(logging.DEBUG):
+                                query = cursor.mogrify(execute_query, product_to_tuple(single_product))
+                                logger.debug("Query:\n%s", query.decode('utf-8'))
                             self.db_conn.rollback()
 
-            cursor.close()
             return saved_count
 
         except Exception as e:
-            print(f"[ERROR] Failed to save products: {e}")
-            traceback.print_exc()
+            logger.error("Failed to save products: %s", e, exc_info=True)
             return 0
 
     def run(self):
         """실행: initialize() → load_product_list() → 제품별 crawl_detail() → save_to_retail_com() → 리소스 정리"""
         try:
             if not self.initialize():
-                print("[ERROR] Initialization failed")
+                logger.error("Initialization failed")
                 return False
 
             product_list = self.load_product_list()
             if not product_list:
-                print("[ERROR] No products found")
+                logger.error("No products found")
                 return False
 
             total_saved = 0
@@ -1048,13 +1165,14 @@ class AmazonDetailCrawler(BaseCrawler):
             for i, product in enumerate(product_list, 1):
                 try:
                     sku_name = product.get('retailer_sku_name') or 'N/A'
-                    print(f"[{i}/{len(product_list)}] {sku_name[:50]}...")
+                    logger.info("[%d/%d] %s...", i, len(product_list), sku_name[:50])
 
                     combined_data = self.crawl_detail(product)
                     if combined_data:
                         crawled_products.append(combined_data)
 
                     if not self.cookies_loaded and i == 1:
+                        flush_logging(logger)
                         self.save_cookies(self.account_name)
                         self.cookies_loaded = True
 
@@ -1062,29 +1180,33 @@ class AmazonDetailCrawler(BaseCrawler):
                         saved_count = self.save_to_retail_com(crawled_products)
                         total_saved += saved_count
                         crawled_products = []
+                        flush_logging(logger)
 
                     time.sleep(random.uniform(3, 5))
 
                 except Exception as e:
-                    print(f"[ERROR] Product {i} failed: {e}")
+                    logger.error("Product %d failed: %s", i, e)
                     continue
 
             if crawled_products:
                 saved_count = self.save_to_retail_com(crawled_products)
                 total_saved += saved_count
 
+            flush_logging(logger)
             table_name = 'test_hhp_retail_com' if self.test_mode else 'hhp_retail_com'
-            print(f"[DONE] Processed: {len(product_list)}, Saved: {total_saved}, Table: {table_name}, batch_id: {self.batch_id}")
+            logger.info("Processed: %d, Saved: %d, Table: %s, batch_id: %s", len(product_list), total_saved, table_name, self.batch_id)
             return True
 
         except Exception as e:
-            print(f"[ERROR] Crawler failed: {e}")
-            traceback.print_exc()
+            logger.error("Crawler failed: %s", e, exc_info=True)
             return False
 
         finally:
+            flush_logging(logger)
             if self.driver:
                 self.driver.quit()
+            if self.insert_cursor:
+                self.insert_cursor.close()
             if self.db_conn:
                 self.db_conn.close()
             if self.standalone:
@@ -1093,7 +1215,9 @@ class AmazonDetailCrawler(BaseCrawler):
 
 def main():
     """개별 실행 진입점 (테스트 모드, 기본 배치 ID 사용)"""
-    crawler = AmazonDetailCrawler(batch_id=None, login_success=None, test_mode=True)
+    test_count_input = input("  test_count (엔터: 전체): ").strip()
+    test_count = int(test_count_input) if test_count_input else None
+    crawler = AmazonDetailCrawler(batch_id=None, login_success=None, test_mode=True, test_count=test_count)
     crawler.run()
 
 
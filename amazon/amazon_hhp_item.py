@@ -10,10 +10,28 @@ Amazon Item MST 크롤러
 ================================================================================
 주요 기능
 ================================================================================
-- hhp_retail_com에서 해당 batch_id의 item 조회
+- hhp_retail_com에서 해당 batch_id의 item 조회 (hhp_item_mst에 sku가 이미 있는 item은 SQL JOIN으로 제외)
 - hhp_item_mst에 없으면 INSERT (sku 없어도 빈값으로)
 - hhp_item_mst에 있는데 sku가 null/빈값이고 추출된 sku가 있으면 UPDATE
 - 추출된 sku 없으면 SKIP
+- INSERT/UPDATE/SKIP 판정은 INSERT ... ON CONFLICT 1문장으로 처리 ((item, account_name) 유니크 인덱스 필요)
+
+================================================================================
+DB 마이그레이션 (운영 작업, 크롤러 실행 전 1회)
+================================================================================
+- 크롤러는 인덱스 존재만 확인하고, 없으면 저장하지 않고 실패(False) 반환
+- 기존 (item, account_name) 중복 행을 먼저 정리한 뒤 생성 (운영 중 테이블 잠금 방지를 위해 CONCURRENTLY)
+
+    CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS hhp_item_mst_item_account_name_uidx
+    ON hhp_item_mst (item, account_name);
+
+================================================================================
+병렬 처리
+================================================================================
+- sku가 필요한 item을 MAX_WORKERS개 묶음으로 나눠 처리 (첫 묶음은 현재 프로세스, 나머지는 워커 프로세스)
+- Zipcode는 현재 프로세스에서 1회만 설정하고, 그 세션 쿠키를 워커에 전달하여 적용 (워커별 Zipcode 설정 생략)
+- 워커 출력은 모아서 결과와 함께 반환 → 현재 프로세스가 출력 (Windows spawn 워커는 TeeLogger를 거치지 않으므로 배치 로그 누락 방지)
+- Selenium은 스레드 간 공유가 불안정하므로 프로세스 단위로 분리
 
 ================================================================================
 저장 테이블
@@ -23,14 +41,18 @@ Amazon Item MST 크롤러
 
 import sys
 import os
+import io
 import time
 import traceback
 import random
-from lxml import html
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout, redirect_stderr
+from psycopg2.extras import execute_values
 
 # 공통 환경 설정 (작업 디렉토리, 한글 출력, 경로 설정)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common.setup import setup_environment
+from common.setup import setup_environment, setup_logging, flush_logging
 setup_environment(__file__)
 
 from common.base_crawler import BaseCrawler
@@ -39,6 +61,62 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 
+logger = logging.getLogger(__name__)
+
+# SKU 추출 워커 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+MAX_WORKERS = 3
+
+# 브라우저에서 XPath를 직접 평가하여 첫 번째 노드의 텍스트만 반환 (page_source 전체 전송/재파싱 방지)
+XPATH_STRING_SCRIPT = (
+    "return document.evaluate(arguments[0], document, null, XPathResult.STRING_TYPE, null).stringValue;"
+)
+
+# CAPTCHA/Continue shopping 페이지 여부를 브라우저에서 직접 확인 (page_source 전체 전송/소문자 변환 방지)
+CAPTCHA_CHECK_SCRIPT = (
+    "return !!document.querySelector('form[action*=\"validateCaptcha\"], #captchacharacters')"
+    " || Array.from(document.querySelectorAll('button'))"
+    ".some(button => button.textContent.includes('Continue shopping'));"
+)
+
+# SKU 추출용 Chrome 환경설정 (이미지 로드/알림 차단, 2 = block)
+ITEM_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+}
+
+# SKU 추출 시 차단할 리소스 (텍스트만 사용하므로 이미지/폰트/영상/광고 불필요)
+ITEM_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.mp4',
+    '*.woff', '*.woff2',
+    '*doubleclick*', '*google-analytics*',
+    '*://*.amazon-adsystem.com/*',
+]
+
+# 페이지 준비 확인: 대상 요소가 나타나거나 문서 로드가 끝나면 True (고정 sleep 대신 WebDriverWait 조건으로 사용)
+# page_load_strategy='none'이라 get() 직후에는 이전 문서일 수 있으므로, 이전 문서에 남긴 표시가 없어야 준비로 판단
+PAGE_MARK_SCRIPT = "window.itemCrawlerPrevPage = true;"
+PAGE_READY_SCRIPT = (
+    "return !window.itemCrawlerPrevPage && (document.readyState === 'complete'"
+    " || !!document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue);"
+)
+PAGE_READY_TIMEOUT = 10
+PAGE_LOAD_ATTEMPTS = 2  # 준비 확인 실패 시 재로드 횟수 포함 (모두 실패하면 이전 문서일 수 있으므로 SKU 추출 생략)
+
+# Amazon 메인 페이지 배송지 링크 (Zipcode 설정 시 페이지 준비 확인용)
+DELIVERY_LINK_XPATH = "//*[@id='nav-global-location-popover-link']"
+
+# item 단위 로그 버퍼 크기 (print 대신 logger로 모아서 item마다 출력 → 워커 간 출력 섞임 방지)
+LOG_BUFFER_CAPACITY = 1000
+
+# hhp_item_mst 일괄 저장 단위 (건수)
+ITEM_MST_FLUSH_SIZE = 100
+
+# hhp_item_mst ON CONFLICT 대상 유니크 인덱스 컬럼 (인덱스는 모듈 설명의 DB 마이그레이션으로 생성)
+ITEM_MST_UNIQUE_COLUMNS = ('item', 'account_name')
+
+# 개별 실행시 기본 batch_id
+DEFAULT_BATCH_ID = 'a_20251209_224208'
+
 
 class AmazonItemCrawler(BaseCrawler):
     """
@@ -55,15 +133,20 @@ class AmazonItemCrawler(BaseCrawler):
         self.page_type = 'detail'
         self.test_mode = test_mode
         self.xpaths = {}
+        self.pending_rows = {}  # flush_item_mst()에서 일괄 저장할 행 (item → 행)
+        self.pending_count = 0  # 대기열에 추가된 item 수 (중복 URL 포함, skip 집계용)
+
+    def initialize(self, session_cookies=None):
+        """초기화: batch_id 설정 → DB 연결 → XPath 로드 → WebDriver 설정 → Zipcode 설정
 
-    def initialize(self):
-        """초기화: batch_id 설정 → DB 연결 → XPath 로드 → WebDriver 설정"""
+        session_cookies: 다른 프로세스에서 Zipcode 설정을 마친 세션 쿠키 (있으면 적용하고 Zipcode 설정 생략)
+        """
         # 1. batch_id 설정
         if not self.batch_id:
-            self.batch_id = 'a_20251209_224208'  # 개별 실행시 기본값
+            self.batch_id = DEFAULT_BATCH_ID  # 개별 실행시 기본값
 
-        # 2. DB 연결
-        if not self.connect_db():
+        # 2. DB 연결 (run()에서 이미 연결한 경우 재사용)
+        if not self.db_conn and not self.connect_db():
             print("[ERROR] Initialize failed: DB connection failed")
             return False
 
@@ -72,33 +155,60 @@ class AmazonItemCrawler(BaseCrawler):
             print(f"[ERROR] Initialize failed: XPath load failed (account={self.account_name}, page_type={self.page_type})")
             return False
 
+        # XPath 사전 컴파일 (fallback 파싱 시 제품마다 XPath 문자열 재파싱 방지)
+        self.compile_xpaths()
+
         # 4. WebDriver 설정
         try:
-            self.setup_driver()
+            self.setup_driver(blocked_urls=ITEM_BLOCKED_URLS, extra_prefs=ITEM_CHROME_PREFS)
         except Exception as e:
             print(f"[ERROR] Initialize failed: WebDriver setup failed - {e}")
             traceback.print_exc()
             return False
 
-        # 5. Zipcode 설정
-        if not self.set_zipcode():
+        # 5. Zipcode 설정 (전달받은 세션 쿠키 적용 실패 시에만 직접 설정)
+        if session_cookies and self.apply_session_cookies(session_cookies):
+            pass
+        elif not self.set_zipcode():
             print("[WARNING] Zipcode 설정 실패, 계속 진행...")
 
         print(f"[INFO] Initialize completed: batch_id={self.batch_id}")
         return True
 
+    def apply_session_cookies(self, cookies):
+        """Zipcode 설정을 마친 세션 쿠키를 현재 드라이버에 적용 (워커 프로세스용, 실패 시 False)"""
+        try:
+            # 쿠키 추가 전 도메인 접속 필요
+            self.load_page("https://www.amazon.com", DELIVERY_LINK_XPATH)
+            for cookie in cookies:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception:
+                    pass  # 일부 쿠키는 추가 실패할 수 있음
+
+            # 쿠키 적용된 상태로 다시 로드
+            self.load_page("https://www.amazon.com", DELIVERY_LINK_XPATH)
+            print("[INFO] Session cookies applied (zipcode shared)")
+            return True
+
+        except Exception as e:
+            print(f"[WARNING] Session cookie apply failed: {e}")
+            return False
+
     def set_zipcode(self, zipcode="10001", max_retries=3):
         """Amazon 배송지 Zipcode 설정 (New York)"""
         for attempt in range(max_retries):
             try:
                 print(f"[INFO] Zipcode 설정 중: {zipcode} (시도 {attempt + 1}/{max_retries})")
 
-                # Amazon 메인 페이지로 이동
-                self.driver.get("https://www.amazon.com")
-                time.sleep(random.uniform(3, 5))
+                # Amazon 메인 페이지로 이동 (배송지 링크 표시 또는 로드 완료까지 대기)
+                self.load_page("https://www.amazon.com", DELIVERY_LINK_XPATH)
 
                 # Continue shopping 버튼 처리
-                self.handle_continue_shopping()
+                if self.handle_continue_shopping():
+                    self.wait_page_ready(DELIVERY_LINK_XPATH)
+                # handle_continue_shopping은 logger 출력 → 이후 print 출력보다 먼저 나오도록 비움
+                flush_logging(logger)
 
                 # 배송지 변경 링크 클릭
                 try:
@@ -106,7 +216,6 @@ class AmazonItemCrawler(BaseCrawler):
                         EC.element_to_be_clickable((By.ID, "nav-global-location-popover-link"))
                     )
                     delivery_link.click()
-                    time.sleep(random.uniform(2, 3))
                 except Exception as e:
                     print(f"[WARNING] 배송지 링크 클릭 실패: {e} - 페이지 새로고침 후 재시도...")
                     self.driver.refresh()
@@ -131,7 +240,6 @@ class AmazonItemCrawler(BaseCrawler):
                         EC.element_to_be_clickable((By.CSS_SELECTOR, "#GLUXZipUpdate input[type='submit'], #GLUXZipUpdate-announce"))
                     )
                     apply_button.click()
-                    time.sleep(random.uniform(2, 3))
                 except Exception as e:
                     print(f"[WARNING] Apply 버튼 클릭 실패: {e}")
                     continue
@@ -143,6 +251,13 @@ class AmazonItemCrawler(BaseCrawler):
                         "//button[contains(@class, 'a-popover-close')]",
                         "//input[@data-action='GLUXConfirmAction']"
                     ]
+                    # Apply 후 닫기 버튼 표시 대기 (없으면 그대로 진행)
+                    try:
+                        WebDriverWait(self.driver, 5).until(
+                            EC.visibility_of_element_located((By.XPATH, ' | '.join(close_buttons)))
+                        )
+                    except Exception:
+                        pass
                     for xpath in close_buttons:
                         try:
                             close_btn = self.driver.find_element(By.XPATH, xpath)
@@ -166,33 +281,29 @@ class AmazonItemCrawler(BaseCrawler):
         return False
 
     def load_items_from_retail_com(self):
-        """hhp_retail_com에서 해당 batch_id의 item 목록 조회"""
+        """hhp_retail_com에서 해당 batch_id의 item 중 크롤링이 필요한 목록 조회 (hhp_item_mst에 sku가 있는 item 제외)"""
         try:
-            cursor = self.db_conn.cursor()
-
             # 테스트 모드면 test_hhp_retail_com, 아니면 hhp_retail_com
             table_name = 'test_hhp_retail_com' if self.test_mode else 'hhp_retail_com'
 
             query = f"""
-                SELECT DISTINCT item, product_url
-                FROM {table_name}
-                WHERE batch_id = %s
-                  AND account_name = %s
-                  AND item IS NOT NULL
-                  AND item != ''
-                ORDER BY item
+                SELECT DISTINCT r.item, r.product_url
+                FROM {table_name} r
+                LEFT JOIN hhp_item_mst m
+                  ON m.item = r.item AND m.account_name = r.account_name
+                WHERE r.batch_id = %s
+                  AND r.account_name = %s
+                  AND r.item IS NOT NULL
+                  AND r.item != ''
+                  AND (m.item IS NULL OR m.sku IS NULL OR m.sku = '')
+                ORDER BY r.item
             """
 
-            cursor.execute(query, (self.batch_id, self.account_name))
-            rows = cursor.fetchall()
-            cursor.close()
-
-            items = []
-            for row in rows:
-                items.append({
-                    'item': row[0],
-                    'product_url': row[1]
-                })
+            # 서버 측 커서로 나눠 받으며 바로 변환 (fetchall 결과 복사본 없음)
+            items = [
+                {'item': item, 'product_url': product_url}
+                for item, product_url in self.iter_query(query, (self.batch_id, self.account_name), 'item_stream')
+            ]
 
             print(f"[INFO] Loaded {len(items)} items from {table_name}")
             return items
@@ -202,35 +313,30 @@ class AmazonItemCrawler(BaseCrawler):
             traceback.print_exc()
             return []
 
-    def check_item_exists(self, item):
-        """hhp_item_mst에서 item 존재 여부 및 기존 sku 조회"""
+    def load_page(self, url, ready_xpath):
+        """URL 이동 후 ready_xpath 요소 표시 또는 로드 완료까지 대기 (고정 sleep 대체)"""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute("""
-                SELECT sku FROM hhp_item_mst
-                WHERE item = %s AND account_name = %s
-            """, (item, self.account_name))
-
-            row = cursor.fetchone()
-            cursor.close()
-
-            if row is None:
-                return None, None  # 존재하지 않음
-            else:
-                return True, row[0]  # 존재함, 기존 sku 값
-
-        except Exception as e:
-            print(f"[ERROR] check_item_exists failed: {e}")
-            return None, None
+            self.driver.execute_script(PAGE_MARK_SCRIPT)
+        except Exception:
+            pass
+        self.driver.get(url)
+        return self.wait_page_ready(ready_xpath)
+
+    def wait_page_ready(self, xpath, timeout=PAGE_READY_TIMEOUT):
+        """xpath 요소가 나타나거나 문서 로드가 끝날 때까지 대기 (시간 초과 시에도 진행, True: 조건 충족)"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                lambda driver: driver.execute_script(PAGE_READY_SCRIPT, xpath)
+            )
+            return True
+        except Exception:
+            return False
 
     def handle_continue_shopping(self):
-        """Continue shopping 버튼 처리"""
+        """Continue shopping 버튼 처리. Returns: 버튼 클릭 여부 (True면 새 페이지 로드 중)"""
         try:
-            page_html = self.driver.page_source.lower()
-            captcha_keywords = ['captcha', 'robot', 'human verification', 'press & hold', 'press and hold']
-
-            if not any(keyword in page_html for keyword in captcha_keywords):
-                return True
+            if not self.driver.execute_script(CAPTCHA_CHECK_SCRIPT):
+                return False
 
             # Continue shopping 버튼 찾기
             try:
@@ -243,17 +349,18 @@ class AmazonItemCrawler(BaseCrawler):
                     actions.pause(random.uniform(0.5, 1.0))
                     actions.click()
                     actions.perform()
-                    time.sleep(random.uniform(3, 5))
-                    print("[INFO] Continue shopping 버튼 클릭 완료")
+                    # 클릭 후 기존 페이지가 사라질 때까지 대기
+                    WebDriverWait(self.driver, PAGE_READY_TIMEOUT).until(EC.staleness_of(continue_btn))
+                    logger.info("Continue shopping 버튼 클릭 완료")
                     return True
             except:
                 pass
 
-            return True
+            return False
 
         except Exception as e:
-            print(f"[WARNING] handle_continue_shopping failed: {e}")
-            return True
+            logger.warning("handle_continue_shopping failed: %s", e)
+            return False
 
     def extract_sku_from_page(self, product_url):
         """상세 페이지에서 SKU(Item model number) 추출"""
@@ -261,89 +368,135 @@ class AmazonItemCrawler(BaseCrawler):
             return None
 
         try:
-            print(f"[INFO] Accessing: {product_url[:80]}...")
-            self.driver.get(product_url)
-            time.sleep(random.uniform(3, 5))
+            # DB에서 로드한 XPath 사용 (sku 필드)
+            sku_xpath = self.xpaths['sku']['xpath']
 
-            # Continue shopping 버튼 처리
-            self.handle_continue_shopping()
+            # SKU 요소 표시 또는 로드 완료까지 대기 (준비 안 되면 이전 제품 문서가 남아 있을 수 있으므로 재로드)
+            logger.info("Accessing: %s...", product_url[:80])
+            page_ready = False
+            for attempt in range(1, PAGE_LOAD_ATTEMPTS + 1):
+                if self.load_page(product_url, sku_xpath):
+                    page_ready = True
+                    break
+                logger.warning("Page not ready (attempt %d/%d)", attempt, PAGE_LOAD_ATTEMPTS)
+
+            if not page_ready:
+                logger.warning("[--] Page not ready, skipping SKU extraction")
+                return None
+
+            # Continue shopping 버튼 처리 (클릭 시 새 페이지 준비 대기)
+            if self.handle_continue_shopping() and not self.wait_page_ready(sku_xpath):
+                logger.warning("[--] Page not ready after Continue shopping, skipping SKU extraction")
+                return None
+
+            # 브라우저에서 XPath 평가 (텍스트만 전송)
+            sku = (self.driver.execute_script(XPATH_STRING_SCRIPT, sku_xpath) or '').strip()
+            if sku:
+                logger.info("[OK] SKU found: %s", sku)
+                return sku
 
-            # 페이지 소스 파싱
+            # 결과 없으면 페이지 소스 파싱으로 재확인
             page_html = self.driver.page_source
-            tree = html.fromstring(page_html)
-
-            # DB에서 로드한 XPath 사용 (sku 필드)
-            sku_xpath = self.xpaths['sku']['xpath']
-            results = tree.xpath(sku_xpath)
+            tree = self.parse_html(page_html)
+            results = self.select_nodes(tree, 'sku')
 
             if results:
                 sku = results[0].text_content().strip()
-                print(f"  [OK] SKU found: {sku}")
+                logger.info("[OK] SKU found: %s", sku)
                 return sku
 
-            print(f"  [--] SKU not found")
+            logger.info("[--] SKU not found")
             return None
 
         except Exception as e:
-            print(f"[ERROR] extract_sku_from_page failed: {e}")
+            logger.error("extract_sku_from_page failed: %s", e)
             return None
 
     def upsert_item_mst(self, item_data, extracted_sku):
-        """hhp_item_mst 테이블에 INSERT 또는 UPDATE
-        - 조회 결과 없음 → INSERT (sku 없어도 빈값으로)
-        - 조회 결과 있음 + 기존 sku null/빈값 + 새 sku 있음 → UPDATE
-        - 조회 결과 있음 + 기존 sku null/빈값 + 새 sku도 없음 → SKIP
+        """hhp_item_mst 저장 대기열에 추가 (INSERT/UPDATE/SKIP 판정은 flush_item_mst()의 ON CONFLICT에서 처리)
+        - 같은 item이 여러 URL로 들어오면 sku가 있는 행을 우선 사용 (한 문장에서 같은 키는 1번만 처리 가능)
+        Returns: 대기열 추가 여부 (item 없으면 False)
         """
         item = item_data.get('item')
-        product_url = item_data.get('product_url')
-
         if not item:
-            return 'skip'
+            return False
+
+        new_sku = extracted_sku or ''
+        queued = self.pending_rows.get(item)
+        if queued is None or (not queued[2] and new_sku):
+            self.pending_rows[item] = (item, self.account_name, new_sku, item_data.get('product_url'))
+        self.pending_count += 1
+        return True
+
+    def flush_item_mst(self, results):
+        """대기열을 INSERT ... ON CONFLICT DO UPDATE 1회로 저장 (RETURNING으로 insert/update/skip 집계)
+        - 기존 행 없음 → INSERT (sku 없어도 빈값으로)
+        - 기존 sku null/빈값 + 새 sku 있음 → UPDATE
+        - 그 외 → SKIP (RETURNING에 포함되지 않음)
+        """
+        if not self.pending_rows:
+            return True
 
         try:
             cursor = self.db_conn.cursor()
-            new_sku = extracted_sku or ''
-
-            # 기존 데이터 조회
-            exists, existing_sku = self.check_item_exists(item)
-
-            if exists is None:
-                # 조회 결과 없음 → INSERT (sku 없어도 빈값으로)
-                cursor.execute("""
-                    INSERT INTO hhp_item_mst (item, account_name, sku, product_url)
-                    VALUES (%s, %s, %s, %s)
-                """, (item, self.account_name, new_sku, product_url))
-                self.db_conn.commit()
-                print(f"  [ITEM_MST] INSERT: {item}, sku: {new_sku or '(empty)'}")
-                cursor.close()
-                return 'insert'
-            else:
-                existing_sku = existing_sku or ''
-                if not existing_sku and new_sku:
-                    # 기존 sku 없고 새 sku 있음 → UPDATE
-                    cursor.execute("""
-                        UPDATE hhp_item_mst SET sku = %s, product_url = %s, updated_at = CURRENT_TIMESTAMP
-                        WHERE item = %s AND account_name = %s
-                    """, (new_sku, product_url, item, self.account_name))
-                    self.db_conn.commit()
-                    print(f"  [ITEM_MST] UPDATE: {item}, sku: {new_sku}")
-                    cursor.close()
-                    return 'update'
-                elif not existing_sku and not new_sku:
-                    # 둘 다 없음 → SKIP
-                    print(f"  [ITEM_MST] SKIP: {item} (no sku)")
-                    cursor.close()
-                    return 'skip'
-                else:
-                    # 기존 sku 있음 → SKIP
-                    print(f"  [ITEM_MST] SKIP: {item} (already has sku: {existing_sku})")
-                    cursor.close()
-                    return 'skip'
+            saved = execute_values(cursor, """
+                INSERT INTO hhp_item_mst AS m (item, account_name, sku, product_url)
+                VALUES %s
+                ON CONFLICT (item, account_name) DO UPDATE
+                SET sku = EXCLUDED.sku, product_url = EXCLUDED.product_url, updated_at = CURRENT_TIMESTAMP
+                WHERE (m.sku IS NULL OR m.sku = '') AND EXCLUDED.sku <> ''
+                RETURNING (xmax = 0) AS inserted
+            """, list(self.pending_rows.values()), fetch=True)
+            self.db_conn.commit()
+            cursor.close()
+
+            inserted = sum(1 for (is_insert,) in saved if is_insert)
+            updated = len(saved) - inserted
+            skipped = self.pending_count - len(saved)
+            results['insert'] += inserted
+            results['update'] += updated
+            results['skip'] += skipped
+            logger.info("[ITEM_MST] Saved: %d insert, %d update, %d skip", inserted, updated, skipped)
+            return True
 
         except Exception as e:
-            print(f"[ERROR] upsert_item_mst failed: {item}: {e}")
+            logger.error("flush_item_mst failed: %s", e)
             self.db_conn.rollback()
-            return 'error'
+            results['error'] += self.pending_count
+            return False
+
+        finally:
+            self.pending_rows = {}
+            self.pending_count = 0
+
+    def process_items(self, items):
+        """item 목록의 SKU 추출 + hhp_item_mst 저장 (initialize() 이후 호출). Returns: 결과 집계 dict"""
+        results = {'insert': 0, 'update': 0, 'skip': 0, 'error': 0}
+
+        for idx, item_data in enumerate(items, 1):
+            item = item_data['item']
+            product_url = item_data['product_url']
+
+            logger.info("[%d/%d] Processing item: %s", idx, len(items), item)
+
+            # SKU 추출 (페이지 접근 필요)
+            extracted_sku = self.extract_sku_from_page(product_url)
+
+            # 저장 대기열에 추가 (ITEM_MST_FLUSH_SIZE건마다 일괄 저장)
+            if not self.upsert_item_mst(item_data, extracted_sku):
+                results['skip'] += 1
+            if self.pending_count >= ITEM_MST_FLUSH_SIZE:
+                self.flush_item_mst(results)
+
+            # item 단위로 로그 출력
+            flush_logging(logger)
+
+            # 요청 간격
+            time.sleep(random.uniform(2, 4))
+
+        self.flush_item_mst(results)
+        flush_logging(logger)
+        return results
 
     def run(self):
         """메인 실행"""
@@ -351,43 +504,68 @@ class AmazonItemCrawler(BaseCrawler):
         print("Amazon Item MST Crawler")
         print("=" * 60)
 
+        # item 단위 로그 출력 설정 (버퍼링)
+        setup_logging(logger, buffer_capacity=LOG_BUFFER_CAPACITY)
+
         try:
-            if not self.initialize():
+            if not self.batch_id:
+                self.batch_id = DEFAULT_BATCH_ID  # 개별 실행시 기본값
+
+            if not self.connect_db():
                 return {'insert': 0, 'update': 0, 'skip': 0, 'error': 0}
 
-            # hhp_retail_com에서 item 목록 조회
-            items = self.load_items_from_retail_com()
+            # hhp_retail_com에서 크롤링 대상 item 목록 조회 (sku가 이미 있는 item은 SQL에서 제외)
+            pending_items = self.load_items_from_retail_com()
 
-            if not items:
+            if not pending_items:
                 print("[INFO] No items to process")
                 return {'insert': 0, 'update': 0, 'skip': 0, 'error': 0}
 
             results = {'insert': 0, 'update': 0, 'skip': 0, 'error': 0}
 
-            for idx, item_data in enumerate(items, 1):
-                item = item_data['item']
-                product_url = item_data['product_url']
+            # ON CONFLICT 저장용 유니크 인덱스 확인 (생성은 운영 마이그레이션, 없으면 저장 불가 → 실패 처리)
+            if not self.has_unique_index('hhp_item_mst', ITEM_MST_UNIQUE_COLUMNS):
+                print("[ERROR] hhp_item_mst (item, account_name) unique index not found - run the DB migration in the module docstring")
+                return False
 
-                print(f"\n[{idx}/{len(items)}] Processing item: {item}")
+            print(f"[INFO] Items to crawl: {len(pending_items)}")
 
-                # 이미 sku가 있는지 먼저 확인
-                exists, existing_sku = self.check_item_exists(item)
-
-                if exists is True and existing_sku:
-                    # 이미 sku가 있으면 크롤링 스킵
-                    print(f"  [SKIP] Already has sku: {existing_sku}")
-                    results['skip'] += 1
-                    continue
+            # 현재 프로세스 WebDriver 설정 + Zipcode 1회 설정 (병렬 처리 시 이 세션 쿠키를 워커에 전달)
+            if not self.initialize():
+                return {'insert': 0, 'update': 0, 'skip': 0, 'error': 0}
 
-                # SKU 추출 (페이지 접근 필요)
-                extracted_sku = self.extract_sku_from_page(product_url)
+            worker_count = min(MAX_WORKERS, len(pending_items))
+            shard_results = []
 
-                # INSERT 또는 UPDATE
-                result = self.upsert_item_mst(item_data, extracted_sku)
-                results[result] += 1
+            if worker_count == 1:
+                # 순차 처리 (현재 프로세스의 WebDriver 사용)
+                shard_results.append(self.process_items(pending_items))
+            else:
+                # 병렬 처리: 첫 묶음은 현재 프로세스, 나머지는 워커 프로세스 (워커별 WebDriver + DB 연결)
+                shards = [pending_items[i::worker_count] for i in range(worker_count)]
+                session_cookies = self.driver.get_cookies()
+                print(f"[INFO] Starting {worker_count - 1} worker processes...")
+                with ProcessPoolExecutor(max_workers=worker_count - 1) as executor:
+                    futures = [
+                        executor.submit(crawl_item_shard, self.batch_id, self.test_mode, shard, session_cookies)
+                        for shard in shards[1:]
+                    ]
+                    shard_results.append(self.process_items(shards[0]))
 
-                # 요청 간격
-                time.sleep(random.uniform(2, 4))
+                    # 워커 출력은 현재 프로세스에서 출력 (TeeLogger → 배치 로그 파일 기록)
+                    for worker_num, (shard, future) in enumerate(zip(shards[1:], futures), 1):
+                        try:
+                            shard_result, worker_output = future.result()
+                        except Exception as e:
+                            print(f"[ERROR] Worker {worker_num} failed: {e}")
+                            shard_result, worker_output = {'insert': 0, 'update': 0, 'skip': 0, 'error': len(shard)}, ''
+                        print(f"\n[INFO] ===== Worker {worker_num} output =====")
+                        print(worker_output, end='')
+                        shard_results.append(shard_result)
+
+            for shard_result in shard_results:
+                for key, count in shard_result.items():
+                    results[key] += count
 
             # 결과 출력
             print("\n" + "=" * 60)
@@ -414,6 +592,7 @@ class AmazonItemCrawler(BaseCrawler):
     def cleanup(self):
         """리소스 정리"""
         try:
+            flush_logging(logger)
             if self.driver:
                 self.driver.quit()
             if self.db_conn:
@@ -423,6 +602,34 @@ class AmazonItemCrawler(BaseCrawler):
             print(f"[WARNING] Cleanup failed: {e}")
 
 
+def crawl_item_shard(batch_id, test_mode, items, session_cookies):
+    """
+    워커 프로세스 진입점: 자체 WebDriver + DB 연결로 item 묶음 처리
+
+    - 전달받은 세션 쿠키로 Zipcode 상태 공유 (워커별 Zipcode 설정 생략)
+    - print/로그 출력을 모아서 반환 (spawn 워커의 stdout은 부모의 TeeLogger를 거치지 않음)
+
+    Returns:
+        tuple: (결과 집계 dict, 출력 문자열)
+    """
+    output = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(output):
+        setup_logging(logger, buffer_capacity=LOG_BUFFER_CAPACITY)
+        crawler = AmazonItemCrawler(batch_id=batch_id, test_mode=test_mode)
+        try:
+            if crawler.initialize(session_cookies=session_cookies):
+                result = crawler.process_items(items)
+            else:
+                result = {'insert': 0, 'update': 0, 'skip': 0, 'error': len(items)}
+        except Exception as e:
+            print(f"[ERROR] Worker failed: {e}")
+            traceback.print_exc()
+            result = {'insert': 0, 'update': 0, 'skip': 0, 'error': len(items)}
+        finally:
+            crawler.cleanup()
+    return result, output.getvalue()
+
+
 # ============================================================================
 # 메인
 # ============================================================================
@@ -11,23 +11,31 @@ Amazon 로그인 스크립트
 사용법
 ================================================================================
 python amazon/amazon_hhp_login.py
+python amazon/amazon_hhp_login.py --refresh-interval 60   # Chrome 유지하며 60분마다 쿠키 갱신
+python amazon/amazon_hhp_login.py --workers 4             # 계정 여러 개일 때 동시 로그인 수
 
 ================================================================================
 주의사항
 ================================================================================
-- config.py에 Amazon 계정 정보 설정 필요
+- config.py에 Amazon 계정 정보 설정 필요 (AMAZON_LOGIN: dict 1개 또는 dict 목록)
+- 계정이 여러 개면 첫 계정은 amazon_cookies.json, 나머지는 amazon_{이름}_cookies.json에 저장
 - 최초 1회 실행하여 쿠키 저장
 - 쿠키 만료 시 재실행 필요
 - CAPTCHA/OTP 발생 시 수동으로 60초 내 입력
+- AMAZON_LOGIN_HEADLESS=1 설정 시 헤드리스 실행 (CAPTCHA/OTP 발생 시 수동 입력 불가)
 """
 
 import sys
 import os
 import time
-import pickle
-import traceback
+import logging
+import re
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import requests
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -35,36 +43,211 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import (
+    WebDriverException, TimeoutException, NoSuchElementException,
+    ElementNotInteractableException, ElementClickInterceptedException, StaleElementReferenceException,
+)
 
 # Amazon 계정 정보 로드
 try:
     from config import AMAZON_LOGIN
-    AMAZON_EMAIL = AMAZON_LOGIN['email']
-    AMAZON_PASSWORD = AMAZON_LOGIN['password']
+    AMAZON_ACCOUNTS = AMAZON_LOGIN if isinstance(AMAZON_LOGIN, (list, tuple)) else [AMAZON_LOGIN]
+    AMAZON_EMAIL = AMAZON_ACCOUNTS[0]['email']
+    AMAZON_PASSWORD = AMAZON_ACCOUNTS[0]['password']
 except ImportError:
     print("[ERROR] config.py not found - Please create from config.example.py")
     sys.exit(1)
-except KeyError:
+except (KeyError, IndexError):
     print("[ERROR] AMAZON_LOGIN not found in config.py")
     sys.exit(1)
 
-COOKIE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cookies', 'amazon_cookies.pkl')
+from common.base_crawler import chromedriver_path, read_cookie_file, write_cookie_file
+from common.setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# 로그인 페이지에서 차단할 리소스 (쿠키 저장에 불필요한 이미지/폰트/CSS/영상/광고)
+# Chrome prefs의 이미지 차단은 실행 중 해제할 수 없으므로 CDP 차단 사용 (CAPTCHA 시 해제)
+LOGIN_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.woff', '*.woff2', '*.css', '*.mp4',
+    '*fls-na.amazon.com/*', '*doubleclick*', '*googletagmanager*',
+]
+
+# 로그인용 Chrome 환경설정 (알림 팝업 차단, 2 = block)
+LOGIN_CHROME_PREFS = {
+    'profile.default_content_setting_values.notifications': 2,
+}
+
+# 후보 요소 중 먼저 찾은 요소를 브라우저 안에서 폴링하여 반환 (WebDriver 왕복은 호출당 1회)
+FIND_FIRST_SCRIPT = '''
+const [locators, clickable, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const start = Date.now();
+const find = ([type, selector]) => type === 'xpath'
+    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(selector);
+const usable = el => el && (!clickable || (el.getClientRects().length > 0 && !el.disabled));
+(function poll() {
+    for (const locator of locators) {
+        const el = find(locator);
+        if (usable(el)) { done(el); return; }
+    }
+    if (Date.now() - start > timeoutMs) { done(null); return; }
+    setTimeout(poll, 200);
+})();
+'''
+
+# 헤드리스 실행 (서버/배치용, AMAZON_LOGIN_HEADLESS=1). CAPTCHA/OTP 수동 입력이 불가능하므로 기본은 화면 표시
+LOGIN_HEADLESS = os.environ.get('AMAZON_LOGIN_HEADLESS', '0') == '1'
+
+# 로그인에 불필요한 Chrome 백그라운드 작업 비활성화 (시작 시간/CPU 절감)
+LOGIN_CHROME_ARGS = [
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--disable-features=Translate',
+    '--disable-background-timer-throttling',
+    '--mute-audio',
+]
+
+# 로그인 재시도 (Amazon 일시 차단/렌더러 멈춤 대응, 같은 드라이버 재사용 + 지수 백오프 1s, 2s, ...)
+# TimeoutException/WebDriverException만 재시도 (로그인 실패 응답은 계정 잠금 위험이 있으므로 재시도하지 않음)
+LOGIN_MAX_RETRIES = 3
+# 재시도 시작 가능 시간 (초, 첫 시도 시작 기준). 이 스크립트를 subprocess로 실행하는 쪽의 timeout(120초, 180초)보다 짧게 유지
+LOGIN_RETRY_BUDGET = 60
+PAGE_LOAD_TIMEOUT = 30   # 멈춘 페이지 이동은 TimeoutException으로 종료
+SCRIPT_TIMEOUT = 10      # find_first 비동기 스크립트 최대 대기(5초)보다 길게
+
+# 쿠키 사전 검증 (Chrome 실행 전 HTTP 요청 1회로 로그인 상태 확인)
+COOKIE_CHECK_URL = 'https://www.amazon.com/gp/css/homepage.html'
+COOKIE_CHECK_TIMEOUT = 10
+LOGIN_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+
+# CAPTCHA 폼 존재 여부를 브라우저 안에서 확인 (page_source 전체 전송 대신 boolean 1개 반환)
+CAPTCHA_CHECK_SCRIPT = "return document.querySelector('form[action*=\"captcha\"], input[name=\"captchacharacters\"], img[src*=\"captcha\"]') !== null;"
+
+# 입력 필드 값을 한 번에 설정하고 input/change 이벤트 발생 (send_keys의 키 입력별 이벤트 전송 대체)
+JS_FILL_SCRIPT = '''
+arguments[0].value = arguments[1];
+arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
+arguments[0].dispatchEvent(new Event('change', {bubbles: true}));
+'''
+
+# 로그인 단계별 요소 후보 (앞쪽 locator 우선, find_first로 함께 확인)
+SIGN_IN_SELECTORS = (
+    (By.ID, "nav-link-accountList"),
+    (By.CSS_SELECTOR, "a[data-nav-role='signin']"),
+    (By.XPATH, "//a[contains(@href, 'ap/signin')]"),
+)
+# 계정 선택 화면: 이메일 포함 XPath는 ACCOUNT_EMAIL_XPATH로 호출 시 3번째 후보에 삽입
+ACCOUNT_BUTTON_SELECTORS = (
+    (By.CSS_SELECTOR, "div[data-a-input-name='accountSelectionSelect'] span.a-button-text"),
+    # (By.XPATH, "//div[@data-a-input-name='accountSelectionSelect']//span[contains(@class, 'a-button-text')]"),
+    (By.XPATH, "//div[contains(@class, 'cvf-account-switcher-account')]"),
+    # (By.XPATH, "//div[contains(@data-testid, 'account-list-item')]"),
+    # (By.CSS_SELECTOR, "div[data-testid*='account-list-item']"),
+    (By.XPATH, "//span[contains(text(), '@')]"),
+    # (By.XPATH, "//div[contains(text(), '@')]"),
+    (By.CSS_SELECTOR, "div.cvf-account-switcher-account"),
+    # (By.CSS_SELECTOR, "div[class*='account']"),
+)
+ACCOUNT_EMAIL_XPATH = "//span[contains(text(), '{email}')]"
+EMAIL_SELECTORS = (
+    (By.ID, "ap_email"),
+    (By.NAME, "email"),
+    (By.CSS_SELECTOR, "input[type='email']"),
+    # (By.XPATH, "//input[@id='ap_email']"),
+    # (By.XPATH, "//input[@name='email']"),
+)
+CONTINUE_SELECTORS = (
+    (By.ID, "continue"),
+    (By.CSS_SELECTOR, "input[type='submit']"),
+    # (By.XPATH, "//input[@id='continue']"),
+    # (By.CSS_SELECTOR, "input#continue"),
+)
+PASSWORD_SELECTORS = (
+    (By.ID, "ap_password"),
+    (By.NAME, "password"),
+    (By.CSS_SELECTOR, "input[type='password']"),
+    # (By.XPATH, "//input[@id='ap_password']"),
+    # (By.XPATH, "//input[@name='password']"),
+)
+SIGNIN_SUBMIT_SELECTORS = (
+    (By.ID, "signInSubmit"),
+    (By.CSS_SELECTOR, "input[type='submit']"),
+    # (By.XPATH, "//input[@id='signInSubmit']"),
+    # (By.CSS_SELECTOR, "input#signInSubmit"),
+)
+
+COOKIE_FILE = os.path.join(PROJECT_ROOT, 'cookies', 'amazon_cookies.json')
+LEGACY_COOKIE_FILE = os.path.splitext(COOKIE_FILE)[0] + '.pkl'  # 이전 pickle 형식 (첫 로드 시 JSON으로 변환)
+# 로그인 전용 Chrome 프로필 (쿠키/localStorage/기기 정보 유지 → 재실행 시 로그인 및 CAPTCHA/OTP 생략)
+CHROME_PROFILE_DIR = os.path.join(os.path.dirname(COOKIE_FILE), 'chrome-profile')
+
+# 여러 계정 동시 로그인 시 최대 Chrome 수 (로그인은 네트워크 대기 위주)
+LOGIN_MAX_WORKERS = 4
+
+
+def get_profile_dir(profile_dir=CHROME_PROFILE_DIR):
+    """로그인 프로필 디렉토리 반환 (생성/쓰기 불가 환경이면 None → 쿠키 파일 방식만 사용)"""
+    try:
+        os.makedirs(profile_dir, exist_ok=True)
+    except OSError as e:
+        print(f"[WARNING] Chrome profile dir unavailable: {e}")
+        return None
+    return profile_dir if os.access(profile_dir, os.W_OK) else None
+
+
+def get_account_paths(account, index):
+    """
+    계정별 쿠키 파일/Chrome 프로필 경로 (첫 계정은 크롤러가 읽는 기본 경로 사용)
+
+    Args:
+        account (dict): {'email', 'password', 'name'(선택)}
+        index (int): AMAZON_ACCOUNTS 내 순서
+
+    Returns:
+        tuple: (cookie_file, profile_dir)
+    """
+    if index == 0:
+        return COOKIE_FILE, CHROME_PROFILE_DIR
+    name = re.sub(r'[^a-z0-9_-]+', '_', account.get('name') or account['email'].split('@')[0].lower())
+    cookie_dir = os.path.dirname(COOKIE_FILE)
+    return (os.path.join(cookie_dir, f'amazon_{name}_cookies.json'),
+            os.path.join(cookie_dir, f'chrome-profile-{name}'))
+
 
+def setup_driver(profile_dir=None):
+    """
+    Chrome WebDriver 설정
 
-def setup_driver():
-    """Chrome WebDriver 설정"""
+    Args:
+        profile_dir (str): Chrome user-data-dir 경로 (None이면 임시 프로필)
+    """
     chrome_options = Options()
+    # DOMContentLoaded 시점에 get() 반환 (이후 요소는 명시적 대기로 확인)
+    chrome_options.page_load_strategy = 'eager'
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36')
+    chrome_options.add_argument(f'--user-agent={LOGIN_USER_AGENT}')
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--window-size=1920,1080')
+    for arg in LOGIN_CHROME_ARGS:
+        chrome_options.add_argument(arg)
+    if LOGIN_HEADLESS:
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--disable-gpu')
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option('prefs', LOGIN_CHROME_PREFS)
+    if profile_dir:
+        chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+        chrome_options.add_argument('--profile-directory=Default')
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(SCRIPT_TIMEOUT)
 
     driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
         'source': '''
@@ -74,9 +257,64 @@ def setup_driver():
         '''
     })
 
+    # 불필요한 리소스 차단
+    block_resources(driver, LOGIN_BLOCKED_URLS)
+
     return driver
 
 
+def block_resources(driver, url_patterns):
+    """CDP로 리소스 요청 차단 (빈 목록이면 차단 해제)"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(url_patterns)})
+    except WebDriverException as e:
+        print(f"[WARNING] Failed to set blocked URLs: {e}")
+
+
+def wait_until(driver, condition, timeout=10):
+    """조건 충족까지 대기 (고정 sleep 대체). 시간 초과 시 None 반환하고 다음 단계 진행"""
+    try:
+        return WebDriverWait(driver, timeout).until(condition)
+    except TimeoutException:
+        return None
+
+
+def to_js_locator(locator):
+    """Selenium locator → FIND_FIRST_SCRIPT용 (xpath/css, selector) 변환"""
+    by, selector = locator
+    if by == By.XPATH:
+        return ['xpath', selector]
+    if by == By.ID:
+        return ['css', f'[id="{selector}"]']
+    if by == By.NAME:
+        return ['css', f'[name="{selector}"]']
+    return ['css', selector]
+
+
+def find_first(driver, locators, clickable=True, timeout=5):
+    """후보 locator들을 브라우저 안에서 함께 폴링하여 먼저 찾은 요소 반환 (없으면 None)
+    - locator마다 WebDriver 왕복/timeout을 쓰지 않고 JS 1회 호출로 확인 (앞쪽 locator 우선)
+    - clickable=True면 화면에 표시되고 비활성화되지 않은 요소만 반환
+    - 페이지 이동 중 스크립트가 중단되면 남은 시간 동안 재시도
+    """
+    js_locators = [to_js_locator(locator) for locator in locators]
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        try:
+            return driver.execute_async_script(FIND_FIRST_SCRIPT, js_locators, clickable, max(remaining, 0) * 1000)
+        except WebDriverException:
+            if remaining <= 0:
+                return None
+            time.sleep(0.2)
+
+
+def js_fill(driver, element, value):
+    """입력 필드 값 설정 (JS 1회 호출, 반환 시점에 값과 이벤트 반영 완료)"""
+    driver.execute_script(JS_FILL_SCRIPT, element, value)
+
+
 def set_amazon_zip_code(driver, zip_code='10001'):
     """
     Amazon 배송 지역 ZIP 코드 설정 (뉴욕: 10001)
@@ -118,7 +356,7 @@ def set_amazon_zip_code(driver, zip_code='10001'):
             )
             close_btn.click()
             time.sleep(1)
-        except:
+        except (TimeoutException, ElementNotInteractableException, StaleElementReferenceException):
             pass  # 팝업이 없을 수 있음
 
         print(f"[OK] Amazon ZIP code set to {zip_code} (New York)")
@@ -130,25 +368,76 @@ def set_amazon_zip_code(driver, zip_code='10001'):
 
 
 def save_cookies(driver, filepath):
-    """쿠키 저장"""
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'wb') as f:
-        pickle.dump(driver.get_cookies(), f)
+    """쿠키 저장 (JSON)"""
+    write_cookie_file(filepath, driver.get_cookies())
     print(f"[OK] Cookies saved: {filepath}")
 
 
+def to_cdp_cookie(cookie):
+    """Selenium get_cookies() 형식 → CDP Network.setCookies 형식 변환 (expiry → expires)"""
+    cdp_cookie = {
+        'name': cookie['name'],
+        'value': cookie['value'],
+        'domain': cookie.get('domain', '.amazon.com'),
+        'path': cookie.get('path', '/'),
+        'secure': cookie.get('secure', False),
+        'httpOnly': cookie.get('httpOnly', False),
+    }
+    if 'expiry' in cookie:
+        cdp_cookie['expires'] = cookie['expiry']
+    if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+        cdp_cookie['sameSite'] = cookie['sameSite']
+    return cdp_cookie
+
+
 def load_cookies(driver, filepath):
-    """쿠키 로드"""
-    if not os.path.exists(filepath):
+    """
+    쿠키 로드 (JSON, 기존 .pkl 파일은 자동 변환)
+    - CDP Network.setCookies로 전체 쿠키를 1회 호출로 주입 (add_cookie 쿠키별 왕복 제거)
+    - add_cookie와 달리 도메인 접속 전에도 주입 가능
+    """
+    cookies = read_cookie_file(filepath)
+    if cookies is None:
         return False
-    with open(filepath, 'rb') as f:
-        cookies = pickle.load(f)
-        for cookie in cookies:
-            driver.add_cookie(cookie)
+    driver.execute_cdp_cmd('Network.setCookies', {'cookies': [to_cdp_cookie(c) for c in cookies]})
     print(f"[OK] Cookies loaded: {filepath}")
     return True
 
 
+def validate_cookies(cookies):
+    """
+    Chrome 실행 전 requests로 쿠키 유효성 사전 확인
+
+    Args:
+        cookies (list): 저장된 쿠키 목록
+
+    Returns:
+        bool or None: 유효 True, 만료 False (로그인 리다이렉트/'Hello, sign in'), 확인 불가(네트워크 오류, 200 외 응답 등) None
+    """
+    try:
+        response = requests.get(
+            COOKIE_CHECK_URL,
+            cookies={c['name']: c['value'] for c in cookies},
+            headers={'User-Agent': LOGIN_USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'},
+            timeout=COOKIE_CHECK_TIMEOUT
+        )
+    except requests.RequestException as e:
+        print(f"[WARNING] Cookie pre-check failed: {e}")
+        return None
+
+    # 로그인 페이지로 리다이렉트되면 만료
+    if 'ap/signin' in response.url:
+        return False
+    # 200이 아니면 (503 오류 페이지, 봇 차단 등) 판단 불가 → 브라우저에서 확인
+    if response.status_code != 200:
+        return None
+    if 'Hello, sign in' in response.text:
+        return False
+    if 'Hello,' in response.text:
+        return True
+    return None  # 봇 확인 페이지 등 로그인 여부 표시 없음 → 브라우저에서 확인
+
+
 def login_to_amazon(driver, email, password):
     """Amazon 로그인 수행"""
     try:
@@ -156,153 +445,93 @@ def login_to_amazon(driver, email, password):
         print("Amazon Login")
         print("="*60)
 
-        # [1] Amazon 접속
+        # [1] Amazon 접속 (계정 메뉴 클릭 가능할 때까지 대기)
         print("\n[1] Accessing Amazon.com...")
         driver.get("https://www.amazon.com")
-        time.sleep(3)
+        wait_until(driver, EC.element_to_be_clickable((By.ID, "nav-link-accountList")))
 
         # [2] Sign in 버튼 클릭
         print("[2] Clicking Sign in...")
-        sign_in_selectors = [
-            (By.ID, "nav-link-accountList"),
-            (By.CSS_SELECTOR, "a[data-nav-role='signin']"),
-            (By.XPATH, "//a[contains(@href, 'ap/signin')]")
-        ]
-
-        signed_in = False
-        for by, selector in sign_in_selectors:
-            try:
-                sign_in = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((by, selector)))
-                sign_in.click()
-                signed_in = True
-                print("    [OK] Sign in button clicked")
-                break
-            except:
-                continue
-
-        if not signed_in:
+        sign_in = find_first(driver, SIGN_IN_SELECTORS)
+        if sign_in:
+            sign_in.click()
+            print("    [OK] Sign in button clicked")
+        else:
             print("    [WARNING] Sign-in button not found")
 
-        time.sleep(2)
+        # 로그인 페이지 대기 (이메일 입력 또는 계정 선택 화면)
+        wait_until(driver, EC.any_of(
+            EC.presence_of_element_located((By.ID, "ap_email")),
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.cvf-account-switcher-account")),
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-a-input-name='accountSelectionSelect']")),
+        ))
 
         # [3] 계정 선택 화면 확인
         print("[3] Checking account selection...")
-        account_button_selectors = [
-            (By.CSS_SELECTOR, "div[data-a-input-name='accountSelectionSelect'] span.a-button-text"),
-            # (By.XPATH, "//div[@data-a-input-name='accountSelectionSelect']//span[contains(@class, 'a-button-text')]"),
-            (By.XPATH, "//div[contains(@class, 'cvf-account-switcher-account')]"),
-            # (By.XPATH, "//div[contains(@data-testid, 'account-list-item')]"),
-            # (By.CSS_SELECTOR, "div[data-testid*='account-list-item']"),
-            (By.XPATH, f"//span[contains(text(), '{email}')]"),
-            # (By.XPATH, f"//div[contains(text(), '{email}')]"),
-            (By.XPATH, "//span[contains(text(), '@')]"),
-            # (By.XPATH, "//div[contains(text(), '@')]"),
-            (By.CSS_SELECTOR, "div.cvf-account-switcher-account"),
-            # (By.CSS_SELECTOR, "div[class*='account']"),
-        ]
+        account_button_selectors = (
+            ACCOUNT_BUTTON_SELECTORS[:2]
+            + ((By.XPATH, ACCOUNT_EMAIL_XPATH.format(email=email)),)
+            + ACCOUNT_BUTTON_SELECTORS[2:]
+        )
 
         account_found = False
-        for by, selector in account_button_selectors:
+        account_button = find_first(driver, account_button_selectors, timeout=3)
+        for _ in range(2):  # 클릭 직전 요소가 교체되면 다시 찾아서 1회 재시도
+            if not account_button:
+                break
             try:
-                account_button = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((by, selector)))
                 account_button.click()
                 account_found = True
                 print("    [OK] Existing account selected")
-                time.sleep(2)
+                wait_until(driver, EC.presence_of_element_located((By.ID, "ap_password")), timeout=5)
+                break
+            except StaleElementReferenceException:
+                account_button = find_first(driver, account_button_selectors, timeout=3)
+            except (ElementNotInteractableException, ElementClickInterceptedException) as e:
+                print(f"    [WARNING] Account selection click failed: {e}")
                 break
-            except:
-                continue
 
         if not account_found:
             # 이메일 입력
             print("    [INFO] Entering email...")
-            email_selectors = [
-                (By.ID, "ap_email"),
-                (By.NAME, "email"),
-                (By.CSS_SELECTOR, "input[type='email']"),
-                # (By.XPATH, "//input[@id='ap_email']"),
-                # (By.XPATH, "//input[@name='email']"),
-            ]
-
-            email_input = None
-            for by, selector in email_selectors:
-                try:
-                    email_input = WebDriverWait(driver, 5).until(EC.presence_of_element_located((by, selector)))
-                    break
-                except:
-                    continue
+            email_input = find_first(driver, EMAIL_SELECTORS, clickable=False)
 
             if not email_input:
                 print("    [ERROR] Email input not found")
                 return False
 
-            email_input.clear()
-            email_input.send_keys(email)
-            time.sleep(1)
+            js_fill(driver, email_input, email)
 
             # Continue 버튼 클릭
             print("[4] Clicking Continue...")
-            continue_selectors = [
-                (By.ID, "continue"),
-                (By.CSS_SELECTOR, "input[type='submit']"),
-                # (By.XPATH, "//input[@id='continue']"),
-                # (By.CSS_SELECTOR, "input#continue"),
-            ]
-
-            for by, selector in continue_selectors:
-                try:
-                    driver.find_element(by, selector).click()
-                    print("    [OK] Continue clicked")
-                    break
-                except:
-                    continue
-
-            time.sleep(3)
+            continue_button = find_first(driver, CONTINUE_SELECTORS, clickable=False, timeout=3)
+            if continue_button:
+                continue_button.click()
+                print("    [OK] Continue clicked")
+
+            # 비밀번호 입력 화면 대기
+            wait_until(driver, EC.presence_of_element_located((By.ID, "ap_password")))
 
         # [5] 비밀번호 입력
         print("[5] Entering password...")
-        password_selectors = [
-            (By.ID, "ap_password"),
-            (By.NAME, "password"),
-            (By.CSS_SELECTOR, "input[type='password']"),
-            # (By.XPATH, "//input[@id='ap_password']"),
-            # (By.XPATH, "//input[@name='password']"),
-        ]
-
-        password_input = None
-        for by, selector in password_selectors:
-            try:
-                password_input = WebDriverWait(driver, 5).until(EC.presence_of_element_located((by, selector)))
-                break
-            except:
-                continue
+        password_input = find_first(driver, PASSWORD_SELECTORS, clickable=False)
 
         if not password_input:
             print("    [ERROR] Password input not found")
             return False
 
-        password_input.clear()
-        password_input.send_keys(password)
-        time.sleep(1)
+        js_fill(driver, password_input, password)
 
         # [6] Sign-In 버튼 클릭
         print("[6] Clicking Sign-In...")
-        signin_selectors = [
-            (By.ID, "signInSubmit"),
-            (By.CSS_SELECTOR, "input[type='submit']"),
-            # (By.XPATH, "//input[@id='signInSubmit']"),
-            # (By.CSS_SELECTOR, "input#signInSubmit"),
-        ]
-
-        for by, selector in signin_selectors:
-            try:
-                driver.find_element(by, selector).click()
-                print("    [OK] Sign-In clicked")
-                break
-            except:
-                continue
+        signin_url = driver.current_url
+        signin_button = find_first(driver, SIGNIN_SUBMIT_SELECTORS, clickable=False, timeout=3)
+        if signin_button:
+            signin_button.click()
+            print("    [OK] Sign-In clicked")
 
-        time.sleep(5)
+        # 로그인 제출 후 페이지 이동 대기 (홈/OTP/CAPTCHA 등)
+        wait_until(driver, EC.url_changes(signin_url))
 
         # [7] CAPTCHA/OTP 확인
         print("[7] Checking CAPTCHA/OTP...")
@@ -311,99 +540,287 @@ def login_to_amazon(driver, email, password):
         if "ap/cvf" in current_url or "ap/mfa" in current_url:
             print("    [WARNING] OTP required - waiting 60s for manual input...")
             time.sleep(60)
-        elif "captcha" in current_url or "captcha" in driver.page_source.lower():
+        elif "captcha" in current_url or driver.execute_script(CAPTCHA_CHECK_SCRIPT):
+            # CAPTCHA 이미지 표시를 위해 리소스 차단 해제 후 새로고침
+            block_resources(driver, [])
+            driver.refresh()
             print("    [WARNING] CAPTCHA detected - waiting 60s for manual input...")
             time.sleep(60)
 
         # [8] 로그인 확인
         print("[8] Verifying login...")
-        driver.get("https://www.amazon.com")
-        time.sleep(3)
+        # 로그인 후 이동한 페이지에서 바로 확인 (/ap/ 중간 페이지에 머문 경우에만 홈으로 이동)
+        if "/ap/" in driver.current_url:
+            driver.get("https://www.amazon.com")
+        account_element = wait_until(driver, EC.presence_of_element_located((By.ID, "nav-link-accountList")), timeout=15)
 
-        try:
-            account_element = driver.find_element(By.ID, "nav-link-accountList")
-            account_text = account_element.text.lower()
+        if account_element is None:
+            print("    [WARNING] Could not verify: account menu not found")
+            return True
 
-            if "hello" in account_text and "sign in" not in account_text:
-                print("\n[OK] LOGIN SUCCESSFUL!")
+        account_text = account_element.text.lower()
+        if "hello" in account_text and "sign in" not in account_text:
+            print("\n[OK] LOGIN SUCCESSFUL!")
 
-                # [9] 뉴욕 ZIP 코드 설정
-                print("[9] Setting ZIP code to New York...")
-                set_amazon_zip_code(driver, '10001')
+            # [9] 뉴욕 ZIP 코드 설정
+            print("[9] Setting ZIP code to New York...")
+            set_amazon_zip_code(driver, '10001')
 
-                return True
-            else:
-                print("\n[FAIL] LOGIN FAILED")
-                return False
-        except Exception as e:
-            print(f"    [WARNING] Could not verify: {e}")
             return True
+        else:
+            print("\n[FAIL] LOGIN FAILED")
+            return False
 
+    except WebDriverException:
+        # 페이지 로드 시간 초과/렌더러 멈춤은 login_with_retry에서 재시도 여부 판단
+        raise
     except Exception as e:
-        print(f"[ERROR] Login failed: {e}")
-        traceback.print_exc()
+        logger.exception("Login failed: %s", e)
         return False
 
 
-def test_login_with_cookies():
-    """쿠키 로그인 테스트 또는 새 로그인"""
-    driver = setup_driver()
+def login_with_retry(driver, email, password):
+    """
+    login_to_amazon을 최대 LOGIN_MAX_RETRIES회 시도 (Chrome 재실행 없이 같은 드라이버 사용)
+    TimeoutException/WebDriverException일 때만 쿠키를 비우고 지수 백오프 후 처음부터 다시 로그인
+    (로그인 실패 응답, OTP/CAPTCHA 대기 후 실패는 재시도하지 않음)
+    재시도는 첫 시도 후 LOGIN_RETRY_BUDGET초 안에서만 시작 (호출 측 subprocess timeout 전에 종료)
+    """
+    deadline = time.time() + LOGIN_RETRY_BUDGET
+    for attempt in range(LOGIN_MAX_RETRIES):
+        try:
+            return login_to_amazon(driver, email, password)
+        except WebDriverException as e:
+            logger.warning("Login attempt %d/%d failed: %s", attempt + 1, LOGIN_MAX_RETRIES, e)
+
+        backoff = 2 ** attempt
+        if attempt + 1 >= LOGIN_MAX_RETRIES or time.time() + backoff >= deadline:
+            break
+
+        logger.warning("Retrying login in %ds", backoff)
+        try:
+            driver.delete_all_cookies()
+        except WebDriverException:
+            pass
+        time.sleep(backoff)
+    return False
+
 
+def is_logged_in(driver):
+    """현재 페이지 계정 메뉴의 'Hello, 이름' 표시로 로그인 상태 확인"""
+    wait_until(driver, EC.presence_of_element_located((By.ID, "nav-link-accountList")))
     try:
-        # 저장된 쿠키로 시도
-        if os.path.exists(COOKIE_FILE):
-            print(f"[INFO] Found cookies: {COOKIE_FILE}")
+        account_text = driver.find_element(By.ID, "nav-link-accountList").text.lower()
+    except (NoSuchElementException, StaleElementReferenceException):
+        print("[WARNING] Login verification failed")
+        return False
+    return "hello" in account_text and "sign in" not in account_text
 
-            driver.get("https://www.amazon.com")
-            time.sleep(2)
-            load_cookies(driver, COOKIE_FILE)
-            driver.refresh()
-            time.sleep(3)
 
-            try:
-                account_element = driver.find_element(By.ID, "nav-link-accountList")
-                account_text = account_element.text.lower()
+def test_login_with_cookies(email=None, password=None, cookie_file=COOKIE_FILE, profile_dir=CHROME_PROFILE_DIR):
+    """
+    저장된 세션으로 로그인 확인 또는 새 로그인
+    1. Chrome 프로필 (이전 실행의 세션이 남아 있으면 로그인 생략)
+    2. 쿠키 파일 (프로필을 쓸 수 없거나 프로필 세션이 만료된 경우)
+    3. 새 로그인
 
-                if "hello" in account_text and "sign in" not in account_text:
-                    print("[OK] Cookie login successful!")
-                    return driver
-                else:
-                    print("[WARNING] Cookies expired, need fresh login")
-            except:
-                print("[WARNING] Cookie verification failed")
+    Args:
+        email, password (str): 계정 정보 (기본: 첫 번째 계정)
+        cookie_file (str): 쿠키 저장 경로
+        profile_dir (str): Chrome 프로필 경로
+    """
+    email = email or AMAZON_EMAIL
+    password = password or AMAZON_PASSWORD
+
+    # 저장된 쿠키를 Chrome 실행 전 사전 검증 (만료 시 쿠키 테스트 페이지 로드 생략)
+    cookies_valid = False
+    legacy_cookie_file = os.path.splitext(cookie_file)[0] + '.pkl'
+    if os.path.exists(cookie_file) or os.path.exists(legacy_cookie_file):
+        print(f"[INFO] Found cookies: {cookie_file}")
+        cookies = read_cookie_file(cookie_file)
+        cookies_valid = validate_cookies(cookies) if cookies else False
+        if cookies_valid is False:
+            print("[WARNING] Cookies expired, need fresh login")
+
+    profile_dir = get_profile_dir(profile_dir)
+    warm_profile = bool(profile_dir) and os.path.isdir(os.path.join(profile_dir, 'Default'))
+    driver = setup_driver(profile_dir)
+    logged_in = False
+
+    try:
+        # 이전 실행의 Chrome 프로필 세션으로 시도 (크롤러용 쿠키 파일은 갱신)
+        if warm_profile:
+            driver.get("https://www.amazon.com")
+            if is_logged_in(driver):
+                print("[OK] Profile session login successful!")
+                save_cookies(driver, cookie_file)
+                logged_in = True
+                return driver
+            print("[WARNING] Profile session expired")
+
+        # 저장된 쿠키로 시도 (사전 검증 통과 또는 확인 불가 시)
+        if cookies_valid is not False:
+            # 접속 전에 쿠키 주입 (쿠키 주입용 첫 페이지 로드 + refresh 생략)
+            load_cookies(driver, cookie_file)
+            driver.get("https://www.amazon.com")
+
+            if is_logged_in(driver):
+                print("[OK] Cookie login successful!")
+                logged_in = True
+                return driver
+            print("[WARNING] Cookies expired, need fresh login")
 
         # 새 로그인
         print("[INFO] Starting fresh login...")
 
-        if AMAZON_EMAIL == 'your-email@example.com':
+        if email == 'your-email@example.com':
             print("[ERROR] Please set Amazon credentials in config.py")
             return None
 
-        if login_to_amazon(driver, AMAZON_EMAIL, AMAZON_PASSWORD):
-            save_cookies(driver, COOKIE_FILE)
+        if login_with_retry(driver, email, password):
+            save_cookies(driver, cookie_file)
+            logged_in = True
             return driver
         else:
             print("[ERROR] Login failed!")
             return None
 
     except Exception as e:
-        print(f"[ERROR] Test failed: {e}")
-        traceback.print_exc()
+        logger.exception("Test failed: %s", e)
         return None
 
+    finally:
+        # 실패 시 드라이버 종료 (프로필 잠금이 남으면 다음 실행의 setup_driver가 실패)
+        if not logged_in:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def login_one(account, index):
+    """계정 1개 로그인 후 쿠키 저장, 드라이버 종료 (login_many 작업 단위)"""
+    cookie_file, profile_dir = get_account_paths(account, index)
+    driver = test_login_with_cookies(account['email'], account['password'], cookie_file, profile_dir)
+    if driver is None:
+        print(f"[FAILED] Login failed: {account['email']}")
+        return False
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    print(f"[DONE] Login completed: {account['email']} -> {cookie_file}")
+    return True
+
+
+def login_many(accounts, max_workers=LOGIN_MAX_WORKERS):
+    """
+    여러 계정 동시 로그인 (계정별 Chrome 프로필/쿠키 파일 사용으로 충돌 없음)
+
+    Returns:
+        list: 계정 순서대로 로그인 성공 여부
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(accounts)))) as executor:
+        return list(executor.map(login_one, accounts, range(len(accounts))))
+
+
+class AmazonSession:
+    """
+    로그인 드라이버를 유지하는 세션 (주기적 쿠키 갱신 시 매번 Chrome을 새로 실행하지 않음)
+
+    사용 예시:
+        session = AmazonSession()
+        session.ensure_logged_in()   # 첫 호출: test_login_with_cookies()
+        session.ensure_logged_in()   # 이후: 기존 드라이버로 로그인 상태만 확인 후 쿠키 저장
+        session.close()
+    """
+
+    def __init__(self):
+        self.driver = None
+
+    def is_alive(self):
+        """드라이버 응답 여부 확인"""
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:  # 드라이버 프로세스 종료 시 urllib3 연결 오류 발생
+            return False
+
+    def ensure_logged_in(self):
+        """
+        로그인 상태 확인 후 쿠키 파일 갱신 (만료 시 기존 드라이버로 재로그인)
+
+        Returns:
+            bool: 로그인 상태면 True
+        """
+        if not self.is_alive():
+            self.close()
+            try:
+                self.driver = test_login_with_cookies()
+            except Exception as e:  # setup_driver 실패 (SessionNotCreated 등) 시 다음 주기에 재시도
+                logger.exception("Login session setup failed: %s", e)
+                self.driver = None
+            return self.driver is not None
+
+        try:
+            self.driver.get("https://www.amazon.com")
+            if not is_logged_in(self.driver):
+                print("[WARNING] Session expired, logging in again...")
+                if not login_with_retry(self.driver, AMAZON_EMAIL, AMAZON_PASSWORD):
+                    return False
+            save_cookies(self.driver, COOKIE_FILE)
+            return True
+        except Exception as e:
+            logger.exception("Session refresh failed: %s", e)
+            self.close()
+            return False
+
+    def close(self):
+        """드라이버 종료"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
 
 if __name__ == "__main__":
+    setup_logging(logger)
+
+    parser = argparse.ArgumentParser(description='Amazon Login Script')
+    parser.add_argument('--refresh-interval', type=int, default=0,
+                        help='Chrome을 유지하며 N분마다 쿠키 갱신 (기본: 0 = 1회 실행 후 종료)')
+    parser.add_argument('--workers', type=int, default=LOGIN_MAX_WORKERS,
+                        help=f'계정이 여러 개일 때 동시 로그인 수 (기본: {LOGIN_MAX_WORKERS})')
+    args = parser.parse_args()
+
     print("="*60)
     print("Amazon Login Script")
     print("="*60)
 
-    driver = test_login_with_cookies()
+    session = AmazonSession()
+    try:
+        while True:
+            if len(AMAZON_ACCOUNTS) > 1:
+                # 계정별 Chrome을 동시에 실행 (매 주기 새로 실행 후 종료)
+                results = login_many(AMAZON_ACCOUNTS, args.workers)
+                print(f"\n[DONE] Login completed: {sum(results)}/{len(results)} accounts")
+            elif session.ensure_logged_in():
+                print("\n" + "="*60)
+                print("[DONE] Login completed")
+                print(f"Cookie: {COOKIE_FILE}")
+                print("="*60)
+            else:
+                print("\n[FAILED] Login failed")
 
-    if driver:
-        print("\n" + "="*60)
-        print("[DONE] Login completed")
-        print(f"Cookie: {COOKIE_FILE}")
-        print("="*60)
-        driver.quit()
-    else:
-        print("\n[FAILED] Login failed")
+            if args.refresh_interval <= 0:
+                break
+            print(f"[INFO] Next refresh in {args.refresh_interval} min")
+            time.sleep(args.refresh_interval * 60)
+    except KeyboardInterrupt:
+        print("\n[INFO] Stopped by user")
+    finally:
+        session.close()
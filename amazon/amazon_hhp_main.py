@@ -15,11 +15,22 @@ Amazon Main 페이지 크롤러
 - 테스트 모드: test_count 설정값만큼 수집
 - 운영 모드: max_products 설정값만큼 수집
 - 쿠키로드 안함
+- 페이지 HTML은 HTTP 세션(requests)으로 먼저 요청하고, 차단/쓰로틀링 시에만 브라우저로 로드
 
 ================================================================================
 저장 테이블
 ================================================================================
 - amazon_hhp_product_list (제품 목록)
+
+================================================================================
+DB 마이그레이션 (운영 작업, 크롤러 실행 전 1회)
+================================================================================
+- 같은 batch_id 재실행 시 중복 INSERT 방지용 유니크 인덱스 (없으면 ON CONFLICT 없이 INSERT)
+- sspa URL은 길어서 btree 행 크기 제한을 넘을 수 있으므로 product_url 대신 md5(product_url) 사용
+- 크롤러는 인덱스 존재만 확인 (실행 중 DDL 없음)
+
+    CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS amazon_hhp_product_list_batch_id_product_url_uidx
+    ON amazon_hhp_product_list (batch_id, md5(product_url));
 """
 
 import sys
@@ -28,8 +39,12 @@ import time
 import random
 import re
 import traceback
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from lxml import html
+import requests
+from psycopg2.extras import execute_values
 
 # 공통 환경 설정 (작업 디렉토리, 한글 출력, 경로 설정)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -42,6 +57,105 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from common.base_crawler import BaseCrawler
 
+# 상대 경로 제품 URL 앞에 붙일 도메인
+AMAZON_BASE_URL = 'https://www.amazon.com'
+
+# 페이지 HTML을 브라우저 대신 HTTP로 요청 (브라우저 쿠키/User-Agent 공유, 차단 시 브라우저로 전환)
+HTTP_FETCH_ENABLED = True
+HTTP_FETCH_TIMEOUT = 20
+HTTP_FETCH_MAX_FAILURES = 3  # 연속 차단 횟수 초과 시 이후 페이지는 브라우저로만 로드
+HTTP_BLOCKED_MARKERS = ('request was throttled', 'please wait a moment and refresh', '/errors/validatecaptcha')
+HTTP_SORRY_MARKERS = ('sorry', 'robot check')  # 페이지 앞부분(2000자)만 확인
+# amazon_hhp_product_list ON CONFLICT 대상 유니크 인덱스 (모듈 설명의 DB 마이그레이션으로 생성)
+PRODUCT_LIST_UNIQUE_INDEX = 'amazon_hhp_product_list_batch_id_product_url_uidx'
+PRODUCT_LIST_ON_CONFLICT = 'ON CONFLICT (batch_id, md5(product_url)) DO NOTHING'
+PRODUCT_INSERT_BATCH_SIZE = 100
+
+# 목록 페이지 로드 시 차단할 리소스 (썸네일/폰트/미디어/광고는 XPath 추출에 불필요)
+MAIN_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.mp4', '*.webm',
+    '*.woff', '*.woff2',
+    '*://*.doubleclick.net/*',
+    '*://*.amazon-adsystem.com/*',
+]
+
+# 페이지 하단까지 브라우저 안에서 스크롤 (단계별 왕복 없이 execute_async_script 1회)
+# arguments: 최소/최대 스크롤 간격(px), 최소/최대 대기(ms), 최대 실행 시간(ms, 스크립트 타임아웃 30초 이내)
+SCROLL_TO_BOTTOM_SCRIPT = '''
+const [minStep, maxStep, minWait, maxWait, maxMs] = arguments;
+const done = arguments[arguments.length - 1];
+const rand = (min, max) => min + Math.random() * (max - min);
+const start = Date.now();
+let position = 0;
+(function step() {
+    position += Math.round(rand(minStep, maxStep));
+    window.scrollTo(0, position);
+    if (position >= document.body.scrollHeight || Date.now() - start > maxMs) { done(position); return; }
+    setTimeout(step, rand(minWait, maxWait));
+})();
+'''
+SCROLL_MAX_MS = 25000
+
+# 페이지 HTML에 키워드가 있는지 브라우저 안에서 확인 (page_source 전체 전송 대신 boolean 1개 반환)
+# arguments: 소문자 키워드 목록, 확인할 앞부분 길이 (0 = 전체), 페이지 제목 포함 여부
+PAGE_CONTAINS_SCRIPT = '''
+const [keywords, limit, includeTitle] = arguments;
+let source = document.documentElement ? document.documentElement.outerHTML : '';
+if (limit > 0) source = source.slice(0, limit);
+if (includeTitle) source = document.title + ' ' + source;
+source = source.toLowerCase();
+return keywords.some(keyword => source.includes(keyword));
+'''
+# XPath에 해당하는 요소 수를 브라우저 안에서 계산 (컨테이너 로드 대기용)
+XPATH_COUNT_SCRIPT = "return document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;"
+CONTAINER_WAIT_TIMEOUT = 10
+
+# 페이지 로드 직후 차단 징후 1회 확인 (Sorry: 제목 + HTML 앞 2000자, 쓰로틀링: HTML 전체)
+# arguments: Sorry 키워드 목록, 쓰로틀링 키워드 목록 (소문자)
+PAGE_BLOCKED_SCRIPT = '''
+const [sorryKeywords, throttleKeywords] = arguments;
+const source = (document.documentElement ? document.documentElement.outerHTML : '').toLowerCase();
+const head = (document.title + ' ' + source.slice(0, 2000)).toLowerCase();
+return sorryKeywords.some(keyword => head.includes(keyword)) || throttleKeywords.some(keyword => source.includes(keyword));
+'''
+
+THROTTLE_KEYWORDS = ['request was throttled', 'please wait a moment and refresh']
+SORRY_KEYWORDS = ['sorry', 'robot check']
+CAPTCHA_KEYWORDS = ['captcha', 'robot', 'human verification', 'press & hold', 'press and hold']
+
+# 제품 카드에서 첫 번째 값만 추출하는 필드 (shipping_info는 safe_extract_join으로 결합)
+PRODUCT_EXTRACT_FIELDS = (
+    'product_url', 'retailer_sku_name', 'number_of_units_purchased_past_month',
+    'final_sku_price', 'original_sku_price', 'available_quantity_for_purchase', 'discount_type',
+)
+
+# amazon_hhp_product_list INSERT 1행 (필드 순서 = INSERT 컬럼 순서, page_number → main_page_number)
+ProductRow = namedtuple('ProductRow', [
+    'account_name', 'page_type', 'retailer_sku_name',
+    'number_of_units_purchased_past_month', 'final_sku_price', 'original_sku_price',
+    'shipping_info', 'available_quantity_for_purchase', 'discount_type',
+    'main_rank', 'page_number', 'product_url',
+    'calendar_week', 'crawl_strdatetime', 'batch_id',
+])
+
+# 제품 행 파싱용 정규식 (모듈 로드 시 1회 컴파일)
+UNITS_PATTERN = re.compile(r'(\d+)\s*([KM])?', re.IGNORECASE)  # 3K+ → (3, K)
+DIGITS_PATTERN = re.compile(r'(\d+)')
+ASIN_PATTERN = re.compile(r'(?:/|%2F)dp(?:/|%2F)([A-Z0-9]{10})', re.IGNORECASE)  # /dp/ASIN, sspa URL의 %2Fdp%2FASIN
+
+# HTTP 페이지 병렬 요청 (현재 페이지 포함 최대 3페이지 미리 요청, 요청 시작 간격 최소 10초 = 분당 6회)
+PAGE_FETCH_WORKERS = 3
+HTTP_MIN_REQUEST_INTERVAL = 10
+# 쓰로틀링/Sorry 페이지 재시도 대기: base * 2^retry (최대 300초) + 0~base초 지터
+THROTTLE_BACKOFF_BASE = 15
+SORRY_BACKOFF_BASE = 3
+BACKOFF_MAX_DELAY = 300
+# 세션 초기화 시 User-Agent (실행 중인 Chrome 주 버전으로 생성 → 브라우저 클라이언트 힌트와 버전 일치)
+USER_AGENT_TEMPLATE = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{major}.0.0.0 Safari/537.36'
+# 세션 초기화 시 현재 origin의 localStorage/sessionStorage 삭제
+CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+HTTP_ACCEPT = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8'
+
 
 class AmazonMainCrawler(BaseCrawler):
     """
@@ -57,16 +171,27 @@ class AmazonMainCrawler(BaseCrawler):
         self.batch_id = batch_id
         self.calendar_week = None
         self.url_template = None
+        self.http_session = None
+        self.http_failures = 0
+        self.http_rate_lock = threading.Lock()
+        self.http_next_request_at = 0.0
+        self.loaded_with_browser = False  # 마지막 crawl_page가 브라우저로 로드했는지 (페이지 간 대기 여부)
+        self.on_conflict_clause = ''  # 유니크 인덱스 확인 후 설정
         self.cookies_loaded = False
         self.current_rank = 0
         self.standalone = batch_id is None
         self.test_count = 1  # 테스트 모드
         self.max_products = 300  # 운영 모드
         self.max_pages = 20  # 최대 페이지 수
-        self.saved_urls = set()  # 중복 URL 추적용
+        self.saved_asins = set()  # 중복 제품 추적용 (ASIN, 추출 실패 시 원본 URL)
+        self.extractors = {}  # 필드명 → 추출 함수 (initialize에서 생성)
         self.excluded_keywords = [
             'Screen Magnifier', 'mount', 'holder', 'cable', 'adapter', 'stand', 'wallet'
         ]  # 제외할 키워드 리스트 (retailer_sku_name에 포함 시 수집 제외)
+        # 제외 키워드를 하나의 정규식으로 컴파일 (대소문자 무시, 제품명 1회 스캔)
+        self.excluded_pattern = re.compile(
+            '|'.join(re.escape(keyword) for keyword in self.excluded_keywords), re.IGNORECASE
+        ) if self.excluded_keywords else None
 
         # 통계 변수
         self.stats = {
@@ -77,46 +202,193 @@ class AmazonMainCrawler(BaseCrawler):
         }
 
     def initialize(self):
-        """초기화: DB 연결 → XPath 로드 → URL 템플릿 로드 → WebDriver 설정 → batch_id 생성 → 1개월 전 로그 정리"""
+        """초기화: DB 연결 → (WebDriver 설정 ∥ XPath/URL 템플릿 로드, batch_id 생성, 로그 정리) → HTTP 세션 생성"""
         # 1. DB 연결
         if not self.connect_db():
             print("[ERROR] Initialize failed: DB connection failed")
             return False
 
-        # 2. XPath 로드
+        # 2. WebDriver 설정은 별도 스레드에서 진행 (Chrome 실행/ZIP 코드 설정이 초기화 시간 대부분 차지)
+        #    join 전까지 메인 스레드는 self.driver에 접근하지 않음
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            driver_future = executor.submit(
+                self.setup_driver_stealth, self.account_name, blocked_urls=MAIN_BLOCKED_URLS
+            )  # Amazon만 강화된 봇 감지 회피 적용 + 이미지/폰트/미디어/광고 차단
+
+            # 3. 드라이버 설정 대기 중 DB/파일 초기화 진행
+            settings_loaded = self.load_crawler_settings()
+            if settings_loaded:
+                # batch_id 생성 (개별 실행 시 test_mode=True)
+                if not self.batch_id:
+                    self.batch_id = self.generate_batch_id(self.account_name, test_mode=True)
+
+                # calendar_week 생성 및 로그 정리
+                self.calendar_week = self.generate_calendar_week()
+                self.cleanup_old_logs()
+
+        # 4. WebDriver 설정 결과 확인 (with 블록 종료 시 스레드 join 완료)
+        try:
+            driver_future.result()
+        except Exception as e:
+            print(f"[ERROR] Initialize failed: WebDriver setup failed - {e}")
+            traceback.print_exc()
+            return False
+
+        if not settings_loaded:
+            return False
+
+        # 5. HTTP 세션 생성 (브라우저 쿠키/User-Agent 복사 → 드라이버 준비 후 실행)
+        if HTTP_FETCH_ENABLED:
+            self.setup_http_session()
+
+        print(f"[INFO] Initialize completed: batch_id={self.batch_id}, calendar_week={self.calendar_week}")
+        return True
+
+    def load_crawler_settings(self):
+        """DB 설정 로드: XPath 로드/컴파일 → 유니크 인덱스 확인 → URL 템플릿 로드"""
         if not self.load_xpaths(self.account_name, self.page_type):
             print(f"[ERROR] Initialize failed: XPath load failed (account={self.account_name}, page_type={self.page_type})")
             return False
 
-        # 3. URL 템플릿 로드
+        # XPath 사전 컴파일 (제품/필드마다 XPath 문자열 재파싱 방지)
+        self.compile_xpaths()
+        self.extractors = self.make_extractors(PRODUCT_EXTRACT_FIELDS)
+
+        # ON CONFLICT 저장용 유니크 인덱스 확인 (없으면 기존 INSERT로 저장)
+        if self.has_product_list_unique_index():
+            self.on_conflict_clause = PRODUCT_LIST_ON_CONFLICT
+        else:
+            print(f"[WARNING] {PRODUCT_LIST_UNIQUE_INDEX} not found, saving without ON CONFLICT")
+
         self.url_template = self.load_page_urls(self.account_name, self.page_type)
         if not self.url_template:
             print(f"[ERROR] Initialize failed: URL template load failed (account={self.account_name}, page_type={self.page_type})")
             return False
 
-        # 4. WebDriver 설정
+        return True
+
+    def setup_http_session(self):
+        """브라우저의 쿠키(ZIP 코드 포함)와 User-Agent를 복사한 requests 세션 생성 (연결 재사용)"""
         try:
-            self.setup_driver_stealth(self.account_name)  # Amazon만 강화된 봇 감지 회피 적용
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': self.driver.execute_script('return navigator.userAgent'),
+                'Accept': HTTP_ACCEPT,
+                'Accept-Language': 'en-US,en;q=0.9',
+            })
+            for cookie in self.driver.get_cookies():
+                session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+            self.http_session = session
+            self.http_failures = 0
+            return True
         except Exception as e:
-            print(f"[ERROR] Initialize failed: WebDriver setup failed - {e}")
-            traceback.print_exc()
+            print(f"[WARNING] HTTP session setup failed, using browser only: {e}")
+            self.http_session = None
             return False
 
-        # 5. batch_id 생성 (개별 실행 시 test_mode=True)
-        if not self.batch_id:
-            self.batch_id = self.generate_batch_id(self.account_name, test_mode=True)
+    def http_fetch_enabled(self):
+        """HTTP 요청 사용 가능 여부 (세션 없음 또는 연속 차단 시 브라우저만 사용)"""
+        return self.http_session is not None and self.http_failures < HTTP_FETCH_MAX_FAILURES
+
+    def wait_for_request_slot(self):
+        """HTTP 요청 시작 간격을 HTTP_MIN_REQUEST_INTERVAL 이상으로 유지 (스레드 간 공유)"""
+        with self.http_rate_lock:
+            now = time.time()
+            start_at = max(now, self.http_next_request_at)
+            self.http_next_request_at = start_at + HTTP_MIN_REQUEST_INTERVAL
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def build_page_url(self, page_number):
+        """URL 템플릿의 {page}를 페이지 번호로 치환"""
+        return self.url_template.replace('{page}', str(page_number))
+
+    def fetch_page_html(self, url):
+        """
+        HTTP 세션으로 페이지 HTML 요청 (페이지 미리 요청 스레드에서도 호출)
+
+        Returns:
+            str or None: 정상 페이지 HTML, 차단/쓰로틀링/오류 시 None (브라우저로 재시도)
+        """
+        self.wait_for_request_slot()
+        try:
+            response = self.http_session.get(url, timeout=HTTP_FETCH_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"[WARNING] HTTP fetch failed: {e}")
+            return None
 
-        # 6. calendar_week 생성 및 로그 정리
-        self.calendar_week = self.generate_calendar_week()
-        self.cleanup_old_logs()
+        if response.status_code != 200:  # 429/503: 쓰로틀링
+            print(f"[WARNING] HTTP fetch blocked (status {response.status_code})")
+            # 서버가 Retry-After(초)를 주면 다음 HTTP 요청을 그 이후로 미룸
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                with self.http_rate_lock:
+                    self.http_next_request_at = max(self.http_next_request_at, time.time() + min(int(retry_after), BACKOFF_MAX_DELAY))
+            return None
 
-        print(f"[INFO] Initialize completed: batch_id={self.batch_id}, calendar_week={self.calendar_week}")
-        return True
+        page_html = response.text
+        head = page_html[:2000].lower()
+        if any(marker in head for marker in HTTP_SORRY_MARKERS):
+            print("[WARNING] HTTP fetch returned sorry/robot check page")
+            return None
+        lowered = page_html.lower()
+        if any(marker in lowered for marker in HTTP_BLOCKED_MARKERS):
+            print("[WARNING] HTTP fetch returned throttled/CAPTCHA page")
+            return None
+        return page_html
+
+    def backoff_delay(self, retry, base):
+        """지수 백오프 + 지터 대기 시간(초) 계산 (retry: 0부터)"""
+        return min(BACKOFF_MAX_DELAY, base * (2 ** retry)) + random.uniform(0, base)
+
+    def page_contains(self, keywords, limit=0, include_title=False):
+        """현재 페이지 HTML(limit > 0이면 앞부분만, include_title이면 제목 포함)에 키워드가 하나라도 있는지 브라우저 안에서 확인"""
+        return bool(self.driver.execute_script(PAGE_CONTAINS_SCRIPT, keywords, limit, include_title))
+
+    def is_page_blocked(self):
+        """현재 페이지에 Sorry/쓰로틀링 징후가 있는지 WebDriver 호출 1회로 확인 (정상 페이지는 세부 처리 생략)"""
+        return bool(self.driver.execute_script(PAGE_BLOCKED_SCRIPT, SORRY_KEYWORDS, THROTTLE_KEYWORDS))
 
     def is_throttled(self):
         """현재 페이지가 쓰로틀링 상태인지 확인"""
-        page_source = self.driver.page_source.lower()
-        return "request was throttled" in page_source or "please wait a moment and refresh" in page_source
+        return self.page_contains(THROTTLE_KEYWORDS)
+
+    def browser_user_agent(self):
+        """실행 중인 Chrome 주 버전에 맞춘 User-Agent (다른 버전 UA는 클라이언트 힌트와 불일치하여 봇 감지 위험)"""
+        browser_version = self.driver.capabilities.get('browserVersion') or ''
+        major = browser_version.split('.')[0] or '131'
+        return USER_AGENT_TEMPLATE.format(major=major)
+
+    def reset_browser_session(self, url):
+        """
+        브라우저 재시작 없이 세션 초기화: 쿠키/캐시/스토리지 삭제 → User-Agent 재설정 → ZIP 코드 재설정 → URL 접근
+
+        Returns:
+            bool: 초기화 후 URL 접근 성공 시 True (쓰로틀링 여부는 호출 측에서 확인)
+        """
+        try:
+            print("[INFO] Resetting browser session (cookies/cache/storage/User-Agent)...")
+            self.driver.execute_script(CLEAR_STORAGE_SCRIPT)
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                'userAgent': self.browser_user_agent(),
+                'platform': 'Windows',
+                'acceptLanguage': 'en-US,en;q=0.9'
+            })
+
+            # 쿠키 삭제로 ZIP 코드가 초기화되므로 다시 설정 (가격/배송 정보 일관성)
+            self.set_amazon_zip_code('10001')
+            if HTTP_FETCH_ENABLED:
+                self.setup_http_session()
+
+            print(f"[INFO] Accessing URL: {url[:80]}...")
+            self.driver.get(url)
+            time.sleep(random.uniform(8, 12))
+            return True
+        except Exception as e:
+            print(f"[ERROR] Browser session reset failed: {e}")
+            return False
 
     def restart_browser(self, url):
         """브라우저 재시작: 드라이버 종료 → 새 드라이버 생성 → URL 접근"""
@@ -129,7 +401,9 @@ class AmazonMainCrawler(BaseCrawler):
             time.sleep(random.uniform(10, 15))
 
             print("[INFO] Starting new browser...")
-            self.setup_driver_stealth(self.account_name)
+            self.setup_driver_stealth(self.account_name, blocked_urls=MAIN_BLOCKED_URLS)
+            if HTTP_FETCH_ENABLED:
+                self.setup_http_session()
 
             print(f"[INFO] Accessing URL: {url[:80]}...")
             self.driver.get(url)
@@ -146,8 +420,9 @@ class AmazonMainCrawler(BaseCrawler):
         for retry in range(max_retries):
             if self.is_throttled():
                 print(f"[WARNING] Throttling detected on page {page_number} (refresh attempt {retry + 1}/{max_retries})")
-                print("[INFO] Waiting before refresh...")
-                time.sleep(random.uniform(15, 20))
+                delay = self.backoff_delay(retry, THROTTLE_BACKOFF_BASE)
+                print(f"[INFO] Waiting {delay:.0f}s before refresh...")
+                time.sleep(delay)
 
                 print("[INFO] Refreshing page...")
                 self.driver.refresh()
@@ -159,7 +434,7 @@ class AmazonMainCrawler(BaseCrawler):
         # 2단계: URL 직접 접근 시도
         if self.is_throttled():
             print(f"[WARNING] Still throttled after {max_retries} refreshes. Trying direct URL access...")
-            time.sleep(random.uniform(20, 25))
+            time.sleep(self.backoff_delay(max_retries, THROTTLE_BACKOFF_BASE))
 
             print(f"[INFO] Accessing URL directly: {url[:80]}...")
             self.driver.get(url)
@@ -169,7 +444,14 @@ class AmazonMainCrawler(BaseCrawler):
                 print("[OK] Direct URL access successful")
                 return True
 
-        # 3단계: 브라우저 재시작 시도
+        # 3단계: 브라우저 재시작 전 세션 초기화 시도 (프로세스 재시작 없이 쿠키/User-Agent 교체)
+        if self.is_throttled():
+            print("[WARNING] Still throttled. Resetting browser session before restart...")
+            if self.reset_browser_session(url) and not self.is_throttled():
+                print("[OK] Browser session reset successful")
+                return True
+
+        # 4단계: 브라우저 재시작 시도
         for restart_attempt in range(max_browser_restarts):
             if not self.is_throttled():
                 return True
@@ -192,22 +474,15 @@ class AmazonMainCrawler(BaseCrawler):
     def check_and_handle_sorry_page(self, max_retries=3):
         """Sorry/Robot check 페이지 감지 및 처리"""
         for attempt in range(max_retries):
-            page_source = self.driver.page_source.lower()
-            title = self.driver.title.lower()
-
-            # Sorry/Robot check 페이지 감지 (처음 2000자만 확인)
-            is_sorry_page = (
-                'sorry' in title or
-                'robot check' in title or
-                'sorry' in page_source[:2000] or
-                'robot check' in page_source[:2000]
-            )
+            # Sorry/Robot check 페이지 감지 (제목 + HTML 처음 2000자, WebDriver 호출 1회)
+            is_sorry_page = self.page_contains(SORRY_KEYWORDS, limit=2000, include_title=True)
 
             if is_sorry_page:
                 print(f"[WARNING] Sorry/Robot check page detected (attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries - 1:
-                    print(f"[INFO] Refreshing page in 3-5 seconds...")
-                    time.sleep(random.uniform(3, 5))
+                    delay = self.backoff_delay(attempt, SORRY_BACKOFF_BASE)
+                    print(f"[INFO] Refreshing page in {delay:.0f} seconds...")
+                    time.sleep(delay)
                     self.driver.refresh()
                     print(f"[INFO] Page refreshed, waiting for load...")
                     time.sleep(random.uniform(4, 6))
@@ -226,10 +501,7 @@ class AmazonMainCrawler(BaseCrawler):
         """CAPTCHA 자동 해결"""
         try:
             time.sleep(1)
-            page_html = self.driver.page_source.lower()
-
-            captcha_keywords = ['captcha', 'robot', 'human verification', 'press & hold', 'press and hold']
-            if not any(keyword in page_html for keyword in captcha_keywords):
+            if not self.page_contains(CAPTCHA_KEYWORDS):
                 return True
 
             captcha_selectors = [
@@ -271,8 +543,7 @@ class AmazonMainCrawler(BaseCrawler):
                 actions.perform()
                 time.sleep(random.uniform(3, 5))
 
-                new_page_html = self.driver.page_source.lower()
-                if not any(keyword in new_page_html for keyword in captcha_keywords):
+                if not self.page_contains(CAPTCHA_KEYWORDS):
                     print("[OK] CAPTCHA 자동 해결 성공")
                     return True
                 else:
@@ -290,106 +561,155 @@ class AmazonMainCrawler(BaseCrawler):
             traceback.print_exc()
             return False
 
-    def normalize_amazon_url(self, url):
-        """Amazon URL에서 ASIN 추출 후 표준 URL로 정규화 (중복 판별용, DB 저장은 원본 URL 사용)"""
+    def extract_asin(self, url):
+        """Amazon URL에서 ASIN(10자리) 추출 (중복 판별용, DB 저장은 원본 URL 사용)"""
         if not url:
             return None
 
-        try:
-            # 1. 일반 URL: /dp/ASIN
-            match = re.search(r'/dp/([A-Z0-9]{10})', url, re.IGNORECASE)
-            if match:
-                return f"https://www.amazon.com/dp/{match.group(1)}"
-
-            # 2. URL 인코딩된 sspa URL: %2Fdp%2FASIN
-            match = re.search(r'%2Fdp%2F([A-Z0-9]{10})', url, re.IGNORECASE)
-            if match:
-                return f"https://www.amazon.com/dp/{match.group(1)}"
-
-            # ASIN 추출 실패 시 원본 URL 반환
-            return url
-        except Exception:
-            return url
+        # 일반 URL(/dp/ASIN)과 URL 인코딩된 sspa URL(%2Fdp%2FASIN)을 한 번에 검색
+        match = ASIN_PATTERN.search(url)
+        if match:
+            return match.group(1).upper()
+
+        # ASIN 추출 실패 시 원본 URL 반환
+        return url
 
     def scroll_to_bottom(self):
         """페이지 하단까지 스크롤 (전체 콘텐츠 로드용)"""
         try:
-            current_position = 0
-            while True:
-                scroll_step = random.randint(250, 350)
-                current_position += scroll_step
-                self.driver.execute_script(f"window.scrollTo(0, {current_position});")
-                time.sleep(random.uniform(0.5, 0.7))
-                total_height = self.driver.execute_script("return document.body.scrollHeight")
-                if current_position >= total_height:
-                    break
+            # 250~350px씩 0.5~0.7초 간격 스크롤 (스크롤/높이 확인을 브라우저 안에서 반복)
+            self.driver.execute_async_script(SCROLL_TO_BOTTOM_SCRIPT, 250, 350, 500, 700, SCROLL_MAX_MS)
             time.sleep(random.uniform(1, 2))
         except Exception as e:
             print(f"[WARNING] Scroll failed: {e}")
             traceback.print_exc()
 
-    def crawl_page(self, page_number):
-        """페이지 크롤링: 페이지 로드 → 파싱 → 16개 미만시 스크롤/대기 후 재시도 → 제품 데이터 추출"""
+    def get_outer_html(self):
+        """현재 페이지 HTML을 CDP DOM.getOuterHTML로 조회 (실패 시 page_source 사용)"""
         try:
-            url = self.url_template.replace('{page}', str(page_number))
+            root_id = self.driver.execute_cdp_cmd('DOM.getDocument', {'depth': 0})['root']['nodeId']
+            return self.driver.execute_cdp_cmd('DOM.getOuterHTML', {'nodeId': root_id})['outerHTML']
+        except Exception:
+            return self.driver.page_source
 
-            base_container_xpath = self.xpaths.get('base_container', {}).get('xpath')
-            if not base_container_xpath:
-                print("[ERROR] base_container XPath not found")
-                return []
+    def wait_for_containers(self, expected_products, timeout=CONTAINER_WAIT_TIMEOUT):
+        """base_container 요소가 expected_products개 이상 될 때까지 대기 (True: 충족, False: 시간 초과/확인 불가)"""
+        base_container_xpath = self.xpaths.get('base_container', {}).get('xpath')
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.5).until(
+                lambda driver: driver.execute_script(XPATH_COUNT_SCRIPT, base_container_xpath) >= expected_products
+            )
+            return True
+        except Exception:
+            return False
 
-            self.driver.get(url)
-            time.sleep(random.uniform(8, 12))
+    def load_page_with_browser(self, url, page_number, expected_products=16):
+        """
+        브라우저로 페이지 로드 → Sorry/쓰로틀링 처리 → 16개 미만시 스크롤/대기 후 재파싱
 
+        Returns:
+            list or None: base_container 요소 목록, 페이지를 건너뛰어야 하면 None
+        """
+        self.driver.get(url)
+        time.sleep(random.uniform(8, 12))
+
+        # 정상 페이지는 1회 확인으로 통과, 차단 징후가 있을 때만 Sorry/쓰로틀링 처리
+        if self.is_page_blocked():
             # Sorry/Robot check 페이지 처리
             if not self.check_and_handle_sorry_page(max_retries=3):
                 print(f"[SKIP] Skipping page {page_number} due to persistent sorry/robot check page")
-                return []
+                return None
 
             # 쓰로틀링 처리
             if not self.check_and_handle_throttling(page_number, url):
                 print(f"[SKIP] Skipping page {page_number} due to throttling")
-                return []
+                return None
 
             # 추가 대기 (봇 감지 후 안정화)
             time.sleep(random.uniform(3, 5))
 
-            # 16개 검증 (최대 3회 재시도: 파싱 → 스크롤 → 대기 후 재파싱)
-            base_containers = []
-            expected_products = 16
+        # 제품 카드는 초기 HTML에 포함되므로 스크롤 전에 16개가 DOM에 있는지 먼저 대기
+        self.wait_for_containers(expected_products)
 
-            for attempt in range(1, 4):
-                page_html = self.driver.page_source
-                tree = html.fromstring(page_html)
-                base_containers = tree.xpath(base_container_xpath)
+        # 16개 검증 (최대 3회 재시도: 파싱 → 스크롤 → 대기 후 재파싱, 대기 후에도 부족할 때만 스크롤)
+        base_containers = []
+        for attempt in range(1, 4):
+            page_html = self.get_outer_html()
+            tree = self.parse_html(page_html)
+            base_containers = self.select_nodes(tree, 'base_container')
 
-                if len(base_containers) >= expected_products:
-                    break
+            if len(base_containers) >= expected_products:
+                break
 
-                if attempt == 1:
-                    # 1차 실패: 스크롤 후 재시도
-                    print(f"[WARNING] Page {page_number}: {len(base_containers)}/{expected_products} products, scrolling...")
-                    self.scroll_to_bottom()
-                    time.sleep(random.uniform(3, 5))
-                elif attempt == 2:
-                    # 2차 실패: 대기 후 재시도
-                    print(f"[WARNING] Page {page_number}: {len(base_containers)}/{expected_products} products, waiting...")
-                    time.sleep(random.uniform(5, 8))
+            if attempt == 1:
+                # 1차 실패: 스크롤 후 재시도
+                print(f"[WARNING] Page {page_number}: {len(base_containers)}/{expected_products} products, scrolling...")
+                self.scroll_to_bottom()
+                time.sleep(random.uniform(3, 5))
+            elif attempt == 2:
+                # 2차 실패: 대기 후 재시도
+                print(f"[WARNING] Page {page_number}: {len(base_containers)}/{expected_products} products, waiting...")
+                time.sleep(random.uniform(5, 8))
+
+        return base_containers
+
+    def crawl_page(self, page_number, page_html=None):
+        """
+        페이지 크롤링: HTTP 응답 파싱 (실패 시 브라우저 로드) → 제품 데이터 추출
+
+        Args:
+            page_number (int): 페이지 번호
+            page_html (str): run()에서 미리 요청한 HTTP 응답 HTML (None이면 차단/미사용 → 브라우저 로드)
+        """
+        self.loaded_with_browser = False
+        try:
+            url = self.build_page_url(page_number)
+
+            if not self.get_xpath('base_container'):
+                print("[ERROR] base_container XPath not found")
+                return []
+
+            base_containers = None
+            expected_products = 16
+
+            # 1. 미리 요청한 HTTP 응답 파싱 (16개 미만이거나 차단되었으면 브라우저로 재시도)
+            if self.http_fetch_enabled():
+                if page_html:
+                    tree = self.parse_html(page_html)
+                    base_containers = self.select_nodes(tree, 'base_container')
+                    if len(base_containers) < expected_products:
+                        print(f"[WARNING] Page {page_number}: HTTP returned {len(base_containers)}/{expected_products} products, using browser...")
+                        base_containers = None
+                self.http_failures = 0 if base_containers is not None else self.http_failures + 1
+                if self.http_failures == HTTP_FETCH_MAX_FAILURES:
+                    print(f"[WARNING] HTTP fetch failed {HTTP_FETCH_MAX_FAILURES} times in a row, using browser only")
+
+            # 2. 브라우저로 로드
+            if base_containers is None:
+                self.loaded_with_browser = True
+                base_containers = self.load_page_with_browser(url, page_number, expected_products)
+                if base_containers is None:
+                    return []
 
             print(f"[INFO] Page {page_number}: {len(base_containers)} products found")
 
+            # 같은 페이지 제품은 같은 수집 시각 사용 (초 단위)
+            crawl_strdatetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
             products = []
+            extract_failures = 0
+            extract = self.extractors
             for idx, item in enumerate(base_containers, 1):
                 try:
-                    product_url_raw = self.safe_extract(item, 'product_url')
-                    product_url = f"https://www.amazon.com{product_url_raw}" if product_url_raw and product_url_raw.startswith('/') else product_url_raw
+                    product_url_raw = extract['product_url'](item)
+                    product_url = AMAZON_BASE_URL + product_url_raw if product_url_raw and product_url_raw[0] == '/' else product_url_raw
 
                     # number_of_units_purchased_past_month 추출 및 변환 (3K+ → 3000, 3M+ → 3000000)
-                    number_of_units_purchased_past_month_raw = self.safe_extract(item, 'number_of_units_purchased_past_month')
+                    number_of_units_purchased_past_month_raw = extract['number_of_units_purchased_past_month'](item)
                     number_of_units_purchased_past_month = None
                     if number_of_units_purchased_past_month_raw:
                         # 숫자 바로 뒤에 K 또는 M이 있는지 확인 (예: 3K+, 100M+)
-                        match = re.search(r'(\d+)\s*([KkMm])?', number_of_units_purchased_past_month_raw)
+                        match = UNITS_PATTERN.search(number_of_units_purchased_past_month_raw)
                         if match:
                             num = int(match.group(1))
                             suffix = match.group(2).upper() if match.group(2) else None
@@ -402,37 +722,40 @@ class AmazonMainCrawler(BaseCrawler):
 
                     # available_quantity_for_purchase: 숫자만 추출
                     available_quantity_for_purchase = None
-                    available_quantity_for_purchase_raw = self.safe_extract(item, 'available_quantity_for_purchase')
+                    available_quantity_for_purchase_raw = extract['available_quantity_for_purchase'](item)
                     if available_quantity_for_purchase_raw:
-                        match = re.search(r'(\d+)', available_quantity_for_purchase_raw)
+                        match = DIGITS_PATTERN.search(available_quantity_for_purchase_raw)
                         if match:
                             available_quantity_for_purchase = match.group(1)
 
-                    product_data = {
-                        'account_name': self.account_name,
-                        'page_type': self.page_type,
-                        'retailer_sku_name': self.safe_extract(item, 'retailer_sku_name'),
-                        'number_of_units_purchased_past_month': number_of_units_purchased_past_month,
-                        'final_sku_price': self.safe_extract(item, 'final_sku_price'),
-                        'original_sku_price': self.safe_extract(item, 'original_sku_price'),
-                        'shipping_info': self.safe_extract_join(item, 'shipping_info', separator=", "),
-                        'available_quantity_for_purchase': available_quantity_for_purchase,
-                        'discount_type': self.safe_extract(item, 'discount_type'),
-                        'main_rank': 0,  # save_products()에서 재할당
-                        'page_number': page_number,
-                        'product_url': product_url,
-                        'calendar_week': self.calendar_week,
-                        'crawl_strdatetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'batch_id': self.batch_id
-                    }
-
-                    products.append(product_data)
+                    products.append(ProductRow(
+                        account_name=self.account_name,
+                        page_type=self.page_type,
+                        retailer_sku_name=extract['retailer_sku_name'](item),
+                        number_of_units_purchased_past_month=number_of_units_purchased_past_month,
+                        final_sku_price=extract['final_sku_price'](item),
+                        original_sku_price=extract['original_sku_price'](item),
+                        shipping_info=self.safe_extract_join(item, 'shipping_info', separator=", "),
+                        available_quantity_for_purchase=available_quantity_for_purchase,
+                        discount_type=extract['discount_type'](item),
+                        main_rank=0,  # save_products()에서 재할당
+                        page_number=page_number,
+                        product_url=product_url,
+                        calendar_week=self.calendar_week,
+                        crawl_strdatetime=crawl_strdatetime,
+                        batch_id=self.batch_id
+                    ))
 
                 except Exception as e:
-                    print(f"[ERROR] Product {idx} extract failed: {e}")
-                    traceback.print_exc()
+                    # 첫 실패만 상세 출력, 나머지는 개수만 집계
+                    extract_failures += 1
+                    if extract_failures == 1:
+                        print(f"[ERROR] Product {idx} extract failed: {e}")
+                        traceback.print_exc()
                     continue
 
+            if extract_failures > 1:
+                print(f"[ERROR] Page {page_number}: {extract_failures} products failed to extract (first traceback above)")
             print(f"[INFO] Page {page_number}: {len(products)} products")
             return products
 
@@ -441,8 +764,86 @@ class AmazonMainCrawler(BaseCrawler):
             traceback.print_exc()
             return []
 
+    def has_product_list_unique_index(self):
+        """ON CONFLICT용 amazon_hhp_product_list 유니크 인덱스 존재 여부 확인 (생성은 운영 마이그레이션)"""
+        try:
+            cursor = self.db_conn.cursor()
+            cursor.execute("""
+                SELECT 1
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = %s AND i.indisunique AND i.indisvalid
+            """, (PRODUCT_LIST_UNIQUE_INDEX,))
+            found = cursor.fetchone() is not None
+            cursor.close()
+            return found
+
+        except Exception as e:
+            print(f"[WARNING] Failed to check unique index {PRODUCT_LIST_UNIQUE_INDEX}: {e}")
+            self.db_conn.rollback()
+            return False
+
+    def load_saved_products(self):
+        """같은 batch_id로 이미 저장된 Main 제품 조회 → 중복 ASIN 등록 + 마지막 main_rank부터 이어서 부여 (재실행 시 rank 공백 방지)"""
+        try:
+            cursor = self.db_conn.cursor()
+            cursor.execute("""
+                SELECT product_url, main_rank::integer
+                FROM amazon_hhp_product_list
+                WHERE account_name = %s AND batch_id = %s AND main_rank IS NOT NULL
+            """, (self.account_name, self.batch_id))
+            rows = cursor.fetchall()
+            cursor.close()
+
+        except Exception as e:
+            print(f"[WARNING] Failed to load saved products: {e}")
+            self.db_conn.rollback()
+            return 0
+
+        for product_url, main_rank in rows:
+            asin = self.extract_asin(product_url)
+            if asin:
+                self.saved_asins.add(asin)
+            self.current_rank = max(self.current_rank, main_rank)
+
+        if rows:
+            print(f"[INFO] Resuming batch {self.batch_id}: {len(rows)} products already saved, last main_rank={self.current_rank}")
+        return len(rows)
+
+    def renumber_main_ranks(self):
+        """저장되지 않은 행(ON CONFLICT/저장 실패)으로 생긴 main_rank 공백 제거 → 1부터 연속 번호로 재부여
+
+        Returns:
+            int: 저장된 Main 제품 수 (= 다음 rank 시작 기준)
+        """
+        try:
+            cursor = self.db_conn.cursor()
+            cursor.execute("""
+                UPDATE amazon_hhp_product_list p
+                SET main_rank = r.new_rank
+                FROM (
+                    SELECT ctid, ROW_NUMBER() OVER (ORDER BY main_rank::integer) AS new_rank
+                    FROM amazon_hhp_product_list
+                    WHERE account_name = %s AND batch_id = %s AND main_rank IS NOT NULL
+                ) r
+                WHERE p.ctid = r.ctid AND p.main_rank::integer <> r.new_rank
+            """, (self.account_name, self.batch_id))
+            cursor.execute("""
+                SELECT COUNT(*) FROM amazon_hhp_product_list
+                WHERE account_name = %s AND batch_id = %s AND main_rank IS NOT NULL
+            """, (self.account_name, self.batch_id))
+            saved_count = cursor.fetchone()[0]
+            self.db_conn.commit()
+            cursor.close()
+            return saved_count
+
+        except Exception as e:
+            print(f"[WARNING] Failed to renumber main_rank: {e}")
+            self.db_conn.rollback()
+            return self.current_rank
+
     def save_products(self, products):
-        """DB 저장: 중복 제거 → BATCH_SIZE 배치 → RETRY_SIZE 배치 → 1개씩 (3-tier retry)"""
+        """DB 저장: 중복 제거 → PRODUCT_INSERT_BATCH_SIZE 배치 (ON CONFLICT DO NOTHING) → 실패 시 1개씩"""
         if not products:
             return 0
 
@@ -451,30 +852,36 @@ class AmazonMainCrawler(BaseCrawler):
 
         # 키워드 필터링, 중복 제거 및 rank 재할당
         unique_products = []
+        skipped_kw = 0
+        skipped_dup = 0
         for product in products:
 
             # 제외 키워드 필터링 (먼저 수행)
-            retailer_sku_name = product.get('retailer_sku_name') or ''
-            if self.excluded_keywords and any(keyword.lower() in retailer_sku_name.lower() for keyword in self.excluded_keywords):
-                print(f"[SKIP] 제외 키워드 포함: {retailer_sku_name[:40]}...")
-                self.stats['keyword_filtered'] += 1
+            retailer_sku_name = product.retailer_sku_name or ''
+            if self.excluded_pattern and self.excluded_pattern.search(retailer_sku_name):
+                skipped_kw += 1
                 continue
 
-            # 중복 URL 제외
-            product_url = product.get('product_url')
-            normalized_url = self.normalize_amazon_url(product_url)
-            if normalized_url and normalized_url in self.saved_urls:
-                print(f"[SKIP] 중복 URL: {retailer_sku_name[:40] if retailer_sku_name else 'N/A'}...")
-                self.stats['duplicates'] += 1
+            # 중복 제품 제외 (ASIN 기준)
+            asin = self.extract_asin(product.product_url)
+            if asin and asin in self.saved_asins:
+                skipped_dup += 1
                 continue
 
-            if normalized_url:
-                self.saved_urls.add(normalized_url)
+            if asin:
+                self.saved_asins.add(asin)
             unique_products.append(product)
 
+        self.stats['keyword_filtered'] += skipped_kw
+        self.stats['duplicates'] += skipped_dup
+        if skipped_kw or skipped_dup:
+            print(f"[INFO] Filtered {skipped_kw} by keyword, {skipped_dup} by dedup, kept {len(unique_products)}")
+
         # rank 재할당 (중복 제거 후 순차적으로)
-        for i, product in enumerate(unique_products):
-            product['main_rank'] = self.current_rank + i + 1
+        unique_products = [
+            product._replace(main_rank=self.current_rank + i + 1)
+            for i, product in enumerate(unique_products)
+        ]
 
         # current_rank 업데이트
         if unique_products:
@@ -492,74 +899,49 @@ class AmazonMainCrawler(BaseCrawler):
                     shipping_info, available_quantity_for_purchase, discount_type,
                     main_rank, main_page_number, product_url,
                     calendar_week, crawl_strdatetime, batch_id
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
-            """
+                ) VALUES %s
+                {on_conflict}
+                RETURNING 1
+            """.format(on_conflict=self.on_conflict_clause)
+            row_template = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
 
-            BATCH_SIZE = 20
-            RETRY_SIZE = 5
             total_saved = 0
 
-            def product_to_tuple(product):
-                return (
-                    product['account_name'],
-                    product['page_type'],
-                    product['retailer_sku_name'],
-                    product['number_of_units_purchased_past_month'],
-                    product['final_sku_price'],
-                    product['original_sku_price'],
-                    product['shipping_info'],
-                    product['available_quantity_for_purchase'],
-                    product['discount_type'],
-                    product['main_rank'],
-                    product['page_number'],
-                    product['product_url'],
-                    product['calendar_week'],
-                    product['crawl_strdatetime'],
-                    product['batch_id']
-                )
-
             def save_batch(batch_products):
-                values_list = [product_to_tuple(p) for p in batch_products]
-                cursor.executemany(insert_query, values_list)
+                # 배치 전체를 multi-row VALUES INSERT 1개로 전송, RETURNING 행 수 = 실제 INSERT 수 (충돌 행 제외)
+                # ProductRow는 tuple이므로 변환 없이 그대로 전달
+                inserted = execute_values(cursor, insert_query, batch_products, template=row_template,
+                                          page_size=len(batch_products), fetch=True)
                 self.db_conn.commit()
-                return len(batch_products)
+                return len(inserted)
 
-            for batch_start in range(0, len(unique_products), BATCH_SIZE):
-                batch_end = min(batch_start + BATCH_SIZE, len(unique_products))
-                batch_products = unique_products[batch_start:batch_end]
+            for batch_start in range(0, len(unique_products), PRODUCT_INSERT_BATCH_SIZE):
+                batch_products = unique_products[batch_start:batch_start + PRODUCT_INSERT_BATCH_SIZE]
 
                 try:
                     total_saved += save_batch(batch_products)
 
                 except Exception:
+                    # 중복은 ON CONFLICT로 처리되므로 데이터 오류 행만 골라내기 위해 1개씩 재시도
                     self.db_conn.rollback()
 
-                    for sub_start in range(0, len(batch_products), RETRY_SIZE):
-                        sub_end = min(sub_start + RETRY_SIZE, len(batch_products))
-                        sub_batch = batch_products[sub_start:sub_end]
-
+                    for single_product in batch_products:
                         try:
-                            total_saved += save_batch(sub_batch)
-
-                        except Exception:
+                            total_saved += save_batch([single_product])
+                        except Exception as single_error:
+                            print(f"[ERROR] DB save failed: {(single_product.retailer_sku_name or 'N/A')[:30]}: {single_error}")
+                            values = cursor.mogrify(row_template, single_product)
+                            print(f"[DEBUG] Values:\n{values.decode('utf-8')}")
+                            traceback.print_exc()
                             self.db_conn.rollback()
 
-                            for single_product in sub_batch:
-                                try:
-                                    cursor.execute(insert_query, product_to_tuple(single_product))
-                                    self.db_conn.commit()
-                                    total_saved += 1
-                                except Exception as single_error:
-                                    print(f"[ERROR] DB save failed: {(single_product.get('retailer_sku_name') or 'N/A')[:30]}: {single_error}")
-                                    query = cursor.mogrify(insert_query, product_to_tuple(single_product))
-                                    print(f"[DEBUG] Query:\n{query.decode('utf-8')}")
-                                    traceback.print_exc()
-                                    self.db_conn.rollback()
-
             cursor.close()
             self.stats['inserted'] += total_saved
+
+            # 저장되지 않은 행이 있으면 rank 공백 제거 후 다음 rank 기준 갱신
+            if total_saved < len(unique_products):
+                self.current_rank = self.renumber_main_ranks()
+
             return total_saved
 
         except Exception as e:
@@ -569,19 +951,34 @@ class AmazonMainCrawler(BaseCrawler):
 
     def run(self):
         """실행: initialize() → 페이지별 crawl_page() → save_products() → 리소스 정리"""
+        executor = None
         try:
             if not self.initialize():
                 print("[ERROR] Initialization failed")
                 return False
 
-            total_products = 0
             target_products = self.test_count if self.test_mode else self.max_products
             self.current_rank = 0
+
+            # 같은 batch_id 재실행 시 이미 저장된 제품은 중복 제외하고 rank/수집 수를 이어서 진행
+            total_products = self.load_saved_products()
             page_num = 1
             last_page = 0
 
+            # HTTP 페이지 요청은 최대 PAGE_FETCH_WORKERS페이지 앞서 병렬로 진행 (파싱/저장/브라우저 처리는 순서대로)
+            executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS)
+            page_futures = {}
+
             while total_products < target_products and page_num <= self.max_pages:
-                products = self.crawl_page(page_num)
+                page_html = None
+                if self.http_fetch_enabled():
+                    for ahead in range(page_num, min(page_num + PAGE_FETCH_WORKERS, self.max_pages + 1)):
+                        if ahead not in page_futures:
+                            page_futures[ahead] = executor.submit(self.fetch_page_html, self.build_page_url(ahead))
+                if page_num in page_futures:
+                    page_html = page_futures.pop(page_num).result()
+
+                products = self.crawl_page(page_num, page_html)
                 last_page = page_num
 
                 if not products:
@@ -597,7 +994,9 @@ class AmazonMainCrawler(BaseCrawler):
                     if total_products >= target_products:
                         break
 
-                time.sleep(random.uniform(28, 32))
+                # 브라우저로 로드한 페이지만 대기 (HTTP 요청 간격은 wait_for_request_slot에서 조절)
+                if self.loaded_with_browser:
+                    time.sleep(random.uniform(28, 32))
                 page_num += 1
 
             print(f"[DONE] Page: {last_page}, Saved: {total_products}, batch_id: {self.batch_id}")
@@ -609,16 +1008,29 @@ class AmazonMainCrawler(BaseCrawler):
             return False
 
         finally:
+            # 남은 미리 요청 취소 (목표 수량 도달/예외 모두, 백그라운드 요청 계속 발생 방지)
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
             # 통계 출력
             print(f"\n{'='*50}")
             print(f"[통계] 수집: {self.stats['collected']}, 중복제거: {self.stats['duplicates']}, 키워드필터: {self.stats['keyword_filtered']}, INSERT: {self.stats['inserted']}")
             print(f"{'='*50}")
 
-            if self.driver:
-                self.driver.quit()
-            if self.db_conn:
-                self.db_conn.close()
-            if self.standalone:
+            # 종료 대기(input) 전에 브라우저/DB를 먼저 정리 (정리 중 오류가 나도 나머지 진행)
+            try:
+                if self.driver:
+                    self.driver.quit()
+            except Exception as e:
+                print(f"[WARNING] Driver quit failed: {e}")
+            try:
+                if self.db_conn:
+                    self.db_conn.close()
+            except Exception as e:
+                print(f"[WARNING] DB close failed: {e}")
+
+            # 터미널에서 직접 실행한 경우에만 대기 (스케줄러/파이프 실행 시 멈추지 않음)
+            if self.standalone and sys.stdin.isatty():
                 input("Press Enter to exit...")
 
 
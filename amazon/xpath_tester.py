@@ -24,7 +24,7 @@ from lxml import html
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from common.base_crawler import chromedriver_path
 
 # ============================================================================
 # 설정
@@ -100,7 +100,7 @@ class XPathTester:
         }
         options.add_experimental_option('prefs', prefs)
 
-        service = Service(ChromeDriverManager().install())
+        service = Service(chromedriver_path())
         self.driver = webdriver.Chrome(service=service, options=options)
 
         # CDP 명령으로 webdriver 속성 및 기타 자동화 흔적 숨기기
@@ -177,17 +177,17 @@ class XPathTester:
 
     def load_cookies(self):
         """크롤러와 동일한 쿠키 로드"""
-        import pickle
-        cookie_file = os.path.join(os.path.dirname(__file__), '..', 'cookies', 'amazon_cookies.pkl')
-        if os.path.exists(cookie_file):
+        from common.base_crawler import read_cookie_file
+        cookie_file = os.path.join(os.path.dirname(__file__), '..', 'cookies', 'amazon_cookies.json')
+        legacy_file = os.path.splitext(cookie_file)[0] + '.pkl'
+        if os.path.exists(cookie_file) or os.path.exists(legacy_file):
             try:
                 # 먼저 Amazon 도메인 접속
                 self.driver.get("https://www.amazon.com")
                 import time
                 time.sleep(2)
 
-                with open(cookie_file, 'rb') as f:
-                    cookies = pickle.load(f)
+                cookies = read_cookie_file(cookie_file)
                 for cookie in cookies:
                     try:
                         self.driver.add_cookie(cookie)
@@ -24,7 +24,7 @@ from lxml import html
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from common.base_crawler import chromedriver_path
 
 # ============================================================================
 # 설정
@@ -79,7 +79,7 @@ class XPathTester:
         options.add_argument('--disable-popup-blocking')
         options.add_argument('--disable-notifications')
 
-        service = Service(ChromeDriverManager().install())
+        service = Service(chromedriver_path())
         self.driver = webdriver.Chrome(service=service, options=options)
 
         # 페이지 로드 타임아웃 설정
@@ -9,6 +9,8 @@ import glob
 import os
 import sys
 import pickle
+import json
+import tempfile
 import traceback
 from datetime import datetime, timedelta
 import pytz
@@ -16,10 +18,22 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-from lxml import html
+from lxml import html, etree
 
 from config import DB_CONFIG
 
+# 서버 측 커서 조회 시 1회 왕복으로 가져올 행 수
+DB_ITERSIZE = 2000
+
+# ChromeDriverManager().install() 결과 캐시 (매 실행마다 드라이버 버전 확인 네트워크 요청 방지, 1일 유효)
+CHROMEDRIVER_PATH_CACHE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cookies', '.chromedriver_path'
+)
+CHROMEDRIVER_CACHE_TTL = 24 * 60 * 60
+
+# 공통 HTML 파서 (주석/PI 제거 + id 인덱스 생략으로 트리 생성 비용 절감)
+HTML_PARSER = html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True, collect_ids=False)
+
 
 class TeeLogger:
     """
@@ -65,6 +79,83 @@ class TeeLoggerStderr:
         self.tee_logger.log_file.flush()
 
 
+def chromedriver_path():
+    """
+    ChromeDriver 실행 파일 경로 반환 (캐시 파일이 1일 이내이고 경로가 유효하면 재사용)
+
+    Returns:
+        str: ChromeDriver 실행 파일 경로
+    """
+    try:
+        if time.time() - os.path.getmtime(CHROMEDRIVER_PATH_CACHE) < CHROMEDRIVER_CACHE_TTL:
+            with open(CHROMEDRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                cached_path = f.read().strip()
+            if os.access(cached_path, os.X_OK):
+                return cached_path
+    except OSError:
+        pass
+
+    driver_path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_PATH_CACHE), exist_ok=True)
+        with open(CHROMEDRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            f.write(driver_path)
+    except OSError as e:
+        print(f"[WARNING] Failed to cache ChromeDriver path: {e}")
+    return driver_path
+
+
+def read_cookie_file(cookie_file):
+    """
+    JSON 쿠키 파일 읽기 (없으면 같은 이름의 기존 .pkl 파일을 읽어 JSON으로 변환 저장)
+
+    Args:
+        cookie_file (str): JSON 쿠키 파일 경로
+
+    Returns:
+        list: 쿠키 목록 (파일이 없으면 None)
+    """
+    if os.path.exists(cookie_file):
+        with open(cookie_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    legacy_file = os.path.splitext(cookie_file)[0] + '.pkl'
+    if not os.path.exists(legacy_file):
+        return None
+
+    with open(legacy_file, 'rb') as f:
+        cookies = pickle.load(f)
+    write_cookie_file(cookie_file, cookies)
+    print(f"[INFO] Cookies migrated: {legacy_file} -> {cookie_file}")
+    return cookies
+
+
+def write_cookie_file(cookie_file, cookies):
+    """
+    쿠키 목록을 JSON 파일로 저장 (Chrome add_cookie는 정수 expiry만 허용하므로 변환)
+    같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체 → 동시에 읽는 크롤러가 쓰다 만 파일을 보지 않음
+
+    Args:
+        cookie_file (str): JSON 쿠키 파일 경로
+        cookies (list): driver.get_cookies() 결과
+    """
+    for cookie in cookies:
+        if 'expiry' in cookie:
+            cookie['expiry'] = int(cookie['expiry'])
+
+    cookie_dir = os.path.dirname(cookie_file) or '.'
+    os.makedirs(cookie_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cookie_dir, prefix='.cookies_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f)
+        os.replace(tmp_path, cookie_file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 class BaseCrawler:
     """
     HHP 크롤러 베이스 클래스
@@ -76,6 +167,7 @@ class BaseCrawler:
         self.driver = None
         self.db_conn = None
         self.xpaths = {}
+        self.compiled_xpaths = {}
         self.tee_logger = None
         self.tee_logger_stderr = None
         self.original_stdout = None
@@ -159,6 +251,32 @@ class BaseCrawler:
             traceback.print_exc()
             return False
 
+    def iter_query(self, query, params=None, cursor_name='stream_cursor', cursor_factory=None):
+        """
+        서버 측(named) 커서로 조회 결과를 DB_ITERSIZE 단위로 가져오며 행 단위 반환
+
+        쓰임새:
+        - batch 전체 목록 조회 시 fetchall() 결과 + 변환 결과가 동시에 메모리에 올라가는 것 방지
+        - 첫 행부터 바로 처리 가능
+
+        Args:
+            query (str): SELECT 쿼리
+            params (tuple/list): 쿼리 파라미터
+            cursor_name (str): 서버 측 커서 이름 (동시에 여러 개 사용 시 구분)
+            cursor_factory: psycopg2 커서 팩토리 (예: RealDictCursor)
+
+        Yields:
+            조회 결과 행
+        """
+        cursor = self.db_conn.cursor(name=cursor_name, cursor_factory=cursor_factory)
+        cursor.itersize = DB_ITERSIZE
+        try:
+            cursor.execute(query, params)
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
+
     def load_xpaths(self, account_name, page_type):
         """
         hhp_xpath_selectors 테이블에서 XPath/CSS 셀렉터 조회
@@ -198,6 +316,55 @@ class BaseCrawler:
             traceback.print_exc()
             return False
 
+    def compile_xpaths(self):
+        """
+        로드된 XPath 문자열을 lxml XPath 객체로 미리 컴파일
+
+        쓰임새:
+        - load_xpaths() 이후 1회 호출
+        - 제품마다 같은 XPath 문자열을 다시 파싱하지 않도록 컴파일 결과 재사용
+        - safe_extract / safe_extract_join이 컴파일된 XPath를 우선 사용
+        - 문법 오류가 있는 XPath는 건너뛰고 기존 문자열 방식으로 처리
+        - smart_strings=False: 문자열 결과에 부모 요소 참조를 붙이지 않음 (결과는 값으로만 사용)
+
+        Returns:
+            int: 컴파일된 XPath 개수
+        """
+        self.compiled_xpaths = {}
+        for field_name, selector in self.xpaths.items():
+            xpath = selector.get('xpath')
+            if not xpath:
+                continue
+            try:
+                self.compiled_xpaths[field_name] = etree.XPath(xpath, smart_strings=False)
+            except etree.XPathSyntaxError as e:
+                print(f"[WARNING] Failed to compile XPath for {field_name}: {e}")
+
+        return len(self.compiled_xpaths)
+
+    def get_xpath(self, field_name):
+        """필드명에 해당하는 컴파일된 XPath 반환 (없으면 XPath 문자열, 둘 다 없으면 None)"""
+        compiled = self.compiled_xpaths.get(field_name)
+        if compiled is not None:
+            return compiled
+        return self.xpaths.get(field_name, {}).get('xpath')
+
+    def select_nodes(self, element, field_name):
+        """
+        필드명의 XPath로 노드 목록 조회 (컴파일된 XPath 우선)
+
+        Args:
+            element: lxml HTML element
+            field_name (str): XPath 필드명 (xpaths 딕셔너리 키)
+
+        Returns:
+            list: XPath 결과 (XPath가 없으면 빈 리스트)
+        """
+        xpath = self.get_xpath(field_name)
+        if not xpath:
+            return []
+        return xpath(element) if isinstance(xpath, etree.XPath) else element.xpath(xpath)
+
     def load_page_urls(self, account_name, page_type):
         """
         hhp_target_page_url 테이블에서 크롤링 대상 URL 템플릿 조회
@@ -236,7 +403,7 @@ class BaseCrawler:
             traceback.print_exc()
             return None
 
-    def setup_driver(self):
+    def setup_driver(self, blocked_urls=None, extra_prefs=None):
         """
         Chrome WebDriver 설정 및 초기화
 
@@ -246,6 +413,10 @@ class BaseCrawler:
         - User-Agent 설정으로 일반 브라우저처럼 동작
         - 일관된 결과를 위한 세션 및 쿠키 관리
 
+        Args:
+            blocked_urls (list): 차단할 리소스 URL 패턴 (CDP Network.setBlockedURLs)
+            extra_prefs (dict): Chrome 환경설정 (예: 이미지 로드/알림 차단)
+
         Returns:
             None
         """
@@ -273,7 +444,11 @@ class BaseCrawler:
         # 쿠키 및 세션 유지를 위한 프로필 디렉토리 설정 (선택적)
         # chrome_options.add_argument('--user-data-dir=./chrome_profile')
 
-        service = Service(ChromeDriverManager().install())
+        # 크롤러별 Chrome 환경설정
+        if extra_prefs:
+            chrome_options.add_experimental_option('prefs', extra_prefs)
+
+        service = Service(chromedriver_path())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
 
         # 페이지 로드 타임아웃 설정 (120초)
@@ -288,9 +463,13 @@ class BaseCrawler:
             '''
         })
 
+        # 불필요한 리소스 차단
+        if blocked_urls:
+            self.block_resource_urls(blocked_urls)
+
         print("[SUCCESS] WebDriver setup complete")
 
-    def setup_driver_stealth(self, account_name='Amazon'):
+    def setup_driver_stealth(self, account_name='Amazon', extra_args=None, blocked_urls=None, extra_prefs=None):
         """
         강화된 봇 감지 회피 Chrome WebDriver 설정
 
@@ -301,6 +480,9 @@ class BaseCrawler:
 
         Args:
             account_name (str): 쇼핑몰명 (Amazon, Bestbuy, Walmart)
+            extra_args (list): 추가 Chrome 실행 인자 (예: 디스크 캐시 크기)
+            blocked_urls (list): 차단할 리소스 URL 패턴 (CDP Network.setBlockedURLs)
+            extra_prefs (dict): 추가 Chrome 환경설정 (예: 이미지/CSS 로드 차단)
 
         Returns:
             None
@@ -338,14 +520,20 @@ class BaseCrawler:
 
         # 언어 설정
         chrome_options.add_argument('--lang=en-US')
+
+        # 크롤러별 추가 실행 인자
+        for arg in extra_args or []:
+            chrome_options.add_argument(arg)
+
         prefs = {
             'intl.accept_languages': 'en-US,en',
             'credentials_enable_service': False,
             'profile.password_manager_enabled': False
         }
+        prefs.update(extra_prefs or {})
         chrome_options.add_experimental_option('prefs', prefs)
 
-        service = Service(ChromeDriverManager().install())
+        service = Service(chromedriver_path())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
 
         # 페이지 로드 타임아웃 설정 (120초)
@@ -421,12 +609,39 @@ class BaseCrawler:
             "acceptLanguage": "en-US,en;q=0.9"
         })
 
+        # 불필요한 리소스 차단 (ZIP 코드 설정 페이지부터 적용)
+        if blocked_urls:
+            self.block_resource_urls(blocked_urls)
+
         print("[SUCCESS] WebDriver setup complete (stealth mode)")
 
         # Amazon인 경우 뉴욕 ZIP 코드 자동 설정
         if account_name == 'Amazon':
             self.set_amazon_zip_code('10001')
 
+    def block_resource_urls(self, url_patterns):
+        """
+        CDP로 이미지/폰트/광고 등 불필요한 리소스 요청 차단
+
+        쓰임새:
+        - 텍스트(DOM)만 추출하는 크롤러에서 페이지 로드 바이트 수 절감
+        - driver.get() 마다 반복되는 서브리소스 요청 제거
+
+        Args:
+            url_patterns (list): 차단할 URL 패턴 (와일드카드 * 지원)
+
+        Returns:
+            bool: 적용 성공 시 True, 실패 시 False
+        """
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(url_patterns)})
+            print(f"[INFO] Blocked {len(url_patterns)} resource URL patterns")
+            return True
+        except Exception as e:
+            print(f"[WARNING] Failed to block resource URLs: {e}")
+            return False
+
     def set_amazon_zip_code(self, zip_code='10001', max_refresh=10):
         """
         Amazon 배송 지역 ZIP 코드 설정 (뉴욕: 10001)
@@ -506,6 +721,24 @@ class BaseCrawler:
             print(f"[INFO] Continuing without ZIP code setting...")
             return False
 
+    def parse_html(self, page_html):
+        """
+        HTML 문자열/바이트를 lxml 트리로 파싱
+
+        쓰임새:
+        - html.fromstring() 대신 사용 (공통 HTML_PARSER 적용)
+        - 문자열은 UTF-8 바이트로 변환하여 파서에 직접 전달
+
+        Args:
+            page_html (str or bytes): 페이지 HTML
+
+        Returns:
+            lxml.html.HtmlElement: 파싱된 트리
+        """
+        if isinstance(page_html, str):
+            page_html = page_html.encode('utf-8')
+        return html.fromstring(page_html, parser=HTML_PARSER)
+
     def extract_text_safe(self, element, xpath):
         """
         XPath를 사용하여 안전하게 텍스트 추출
@@ -517,13 +750,13 @@ class BaseCrawler:
 
         Args:
             element: lxml HTML element
-            xpath (str): XPath 표현식
+            xpath (str or etree.XPath): XPath 표현식 또는 컴파일된 XPath
 
         Returns:
             str or None: 추출된 텍스트, 실패 시 None
         """
         try:
-            result = element.xpath(xpath)
+            result = xpath(element) if isinstance(xpath, etree.XPath) else element.xpath(xpath)
             if result:
                 # 속성 추출인 경우 (예: @href)
                 if isinstance(result[0], str):
@@ -546,7 +779,7 @@ class BaseCrawler:
 
         Args:
             element: lxml HTML element
-            xpath (str): XPath 표현식
+            xpath (str or etree.XPath): XPath 표현식 또는 컴파일된 XPath
             default: 추출 실패 시 반환할 기본값
 
         Returns:
@@ -558,11 +791,72 @@ class BaseCrawler:
     def safe_extract(self, element, field_name):
         """필드 추출 시 예외 발생하면 None 반환 후 다음 필드로 진행"""
         try:
-            return self.extract_with_fallback(element, self.xpaths.get(field_name, {}).get('xpath'))
+            return self.extract_with_fallback(element, self.get_xpath(field_name))
         except Exception as e:
             print(f"[WARNING] Failed to extract {field_name}: {e}")
             return None
 
+    def make_extractors(self, field_names):
+        """
+        필드별 첫 번째 값 추출 함수 생성 (safe_extract와 같은 결과)
+
+        쓰임새:
+        - initialize()에서 compile_xpaths() 이후 1회 호출
+        - 제품 루프에서 필드마다 get_xpath() 조회/isinstance 분기/래퍼 호출 반복 방지
+        - XPath가 없는 필드는 항상 None, 컴파일되지 않은 XPath는 safe_extract 사용
+
+        Args:
+            field_names (tuple): 추출할 XPath 필드명
+
+        Returns:
+            dict: 필드명 → extract(element) 함수 (추출 실패 시 None 반환)
+        """
+        extractors = {}
+        for field_name in field_names:
+            xpath = self.get_xpath(field_name)
+            if not xpath:
+                extractors[field_name] = lambda element: None
+            elif isinstance(xpath, etree.XPath):
+                extractors[field_name] = self._first_value_extractor(xpath)
+            else:
+                extractors[field_name] = lambda element, field_name=field_name: self.safe_extract(element, field_name)
+        return extractors
+
+    @staticmethod
+    def _first_value_extractor(compiled_xpath):
+        """컴파일된 XPath의 첫 번째 결과를 문자열로 반환하는 함수 (extract_text_safe와 같은 규칙)"""
+        def extract(element):
+            try:
+                result = compiled_xpath(element)
+                if not result:
+                    return None
+                first = result[0]
+                return first.strip() if isinstance(first, str) else first.text_content().strip()
+            except Exception:
+                return None
+        return extract
+
+    def select_best_match(self, element, field_names):
+        """
+        우선순위 순서의 XPath 필드 중 첫 번째로 추출된 값 반환
+
+        쓰임새:
+        - 기본 XPath 실패 시 fallback XPath를 차례로 시도하는 경우
+        - 예: ('final_sku_price', 'final_sku_price_fallback', ...)
+
+        Args:
+            element: lxml HTML element
+            field_names (tuple): 우선순위 순서의 XPath 필드명
+
+        Returns:
+            str or None: 첫 번째로 추출된 텍스트, 모두 실패 시 None
+        """
+        for field_name in field_names:
+            value = self.safe_extract(element, field_name)
+            if value:
+                return value
+        return None
+
     def safe_extract_join(self, element, field_name, separator=" / "):
         """
         여러 요소를 추출하여 구분자로 결합
@@ -581,11 +875,7 @@ class BaseCrawler:
             str or None: 결합된 텍스트, 요소 없으면 None
         """
         try:
-            xpath = self.xpaths.get(field_name, {}).get('xpath')
-            if not xpath:
-                return None
-
-            elements = element.xpath(xpath)
+            elements = self.select_nodes(element, field_name)
             if not elements:
                 return None
 
@@ -723,15 +1013,10 @@ class BaseCrawler:
         """
         try:
             # account_name 기반으로 쿠키 파일 경로 생성
-            cookie_file = f'cookies/{account_name.lower()}_cookies.pkl'
-
-            # cookies 디렉토리 생성
-            os.makedirs('cookies', exist_ok=True)
+            cookie_file = f'cookies/{account_name.lower()}_cookies.json'
 
             # 쿠키 저장
-            cookies = self.driver.get_cookies()
-            with open(cookie_file, 'wb') as f:
-                pickle.dump(cookies, f)
+            write_cookie_file(cookie_file, self.driver.get_cookies())
 
             print(f"[INFO] Cookies saved to {cookie_file}")
 
@@ -754,10 +1039,12 @@ class BaseCrawler:
             bool: 쿠키 로드 성공 시 True, 실패 시 False
         """
         try:
-            # account_name 기반으로 쿠키 파일 경로 생성
-            cookie_file = f'cookies/{account_name.lower()}_cookies.pkl'
+            # account_name 기반으로 쿠키 파일 경로 생성 (기존 .pkl은 읽을 때 JSON으로 변환)
+            cookie_file = f'cookies/{account_name.lower()}_cookies.json'
 
-            if not os.path.exists(cookie_file):
+            # 쿠키 로드
+            cookies = read_cookie_file(cookie_file)
+            if cookies is None:
                 print(f"[INFO] No saved cookies found at {cookie_file}")
                 if account_name == 'Amazon':
                     print(f"[WARNING] Amazon login cookies not found")
@@ -765,10 +1052,6 @@ class BaseCrawler:
                     print(f"[INFO] To create cookies, run: python amazon_login.py")
                 return False
 
-            # 쿠키 로드
-            with open(cookie_file, 'rb') as f:
-                cookies = pickle.load(f)
-
             # 도메인에 먼저 접속 (쿠키를 추가하기 전에 필요)
             if account_name == 'Amazon':
                 self.driver.get('https://www.amazon.com')
@@ -810,6 +1093,47 @@ class BaseCrawler:
             print(f"[WARNING] Failed to load cookies: {e}")
             return False
 
+    def has_unique_index(self, table_name, columns):
+        """
+        테이블에 columns 조합의 유니크 인덱스가 있는지 확인 (인덱스 생성은 운영 마이그레이션에서 수행)
+
+        쓰임새:
+        - INSERT ... ON CONFLICT (columns) 사용 전 대상 인덱스 존재 확인
+        - 크롤러 실행 중 운영 테이블에 DDL(CREATE INDEX)을 실행하지 않기 위해 조회만 수행
+        - 부분 인덱스/표현식 인덱스/생성 중(invalid) 인덱스는 ON CONFLICT 대상이 아니므로 제외
+
+        Args:
+            table_name (str): 테이블명
+            columns (tuple): 인덱스 컬럼명 (순서 무관)
+
+        Returns:
+            bool: 유니크 인덱스가 있으면 True, 없거나 조회 실패 시 False
+        """
+        try:
+            cursor = self.db_conn.cursor()
+            cursor.execute("""
+                SELECT 1
+                FROM pg_index i
+                JOIN pg_class t ON t.oid = i.indrelid
+                WHERE t.relname = %s
+                  AND i.indisunique AND i.indisvalid
+                  AND i.indpred IS NULL AND i.indexprs IS NULL
+                  AND (
+                      SELECT array_agg(a.attname::text ORDER BY a.attname::text)
+                      FROM pg_attribute a
+                      WHERE a.attrelid = t.oid AND a.attnum = ANY(i.indkey)
+                  ) = %s
+                LIMIT 1
+            """, (table_name, sorted(columns)))
+            found = cursor.fetchone() is not None
+            cursor.close()
+            return found
+
+        except Exception as e:
+            print(f"[WARNING] Failed to check unique index on {table_name} {tuple(columns)}: {e}")
+            self.db_conn.rollback()
+            return False
+
     def check_product_exists(self, account_name, batch_id, product_url):
         """
         product_list 테이블에서 제품 존재 여부 확인
@@ -3,6 +3,7 @@
 - 작업 디렉토리 설정
 - Windows 콘솔 한글 출력 설정
 - 경로 설정
+- logging 설정
 
 모든 크롤러에서 import하여 사용:
     from common.setup import setup_environment
@@ -11,6 +12,66 @@
 
 import sys
 import os
+import logging
+from collections import OrderedDict
+import logging.handlers
+
+# 기존 print 태그 형식과 동일하게 출력 (예: [WARNING] ...)
+LOG_FORMAT = '[%(levelname)s] %(message)s'
+
+
+class StdoutHandler(logging.StreamHandler):
+    """
+    출력 시점의 sys.stdout으로 기록하는 핸들러
+    TeeLogger로 stdout이 교체된 뒤에도 로그가 콘솔과 로그 파일 양쪽에 기록됨
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class RepeatedTracebackFormatter(logging.Formatter):
+    """
+    같은 위치에서 같은 예외가 반복되면 두 번째부터 traceback 생략
+    쓰로틀링/DB 장애 등으로 제품마다 같은 예외가 날 때 traceback 포맷/출력 비용 제거
+    (메시지 줄은 그대로 출력하고 반복 횟수만 덧붙임)
+
+    - 반복 횟수는 최근 max_entries개 예외만 보관 (오래된 항목부터 제거)
+    - 원본 LogRecord는 수정하지 않고 복사본으로 포맷 (다른 핸들러 출력에 영향 없음)
+    """
+
+    def __init__(self, fmt=None, max_entries=256):
+        super().__init__(fmt)
+        self.max_entries = max_entries
+        self.counts = OrderedDict()
+
+    def format(self, record):
+        if not record.exc_info or not record.exc_info[1]:
+            return super().format(record)
+
+        exc = record.exc_info[1]
+        key = (record.pathname, record.lineno, type(exc), str(exc))
+        count = self.counts.pop(key, 0) + 1
+        self.counts[key] = count
+        if len(self.counts) > self.max_entries:
+            self.counts.popitem(last=False)
+
+        if count == 1:
+            return super().format(record)
+
+        repeated = logging.makeLogRecord(record.__dict__)
+        repeated.exc_info = None
+        repeated.exc_text = None
+        repeated.msg = f"{record.msg} (same traceback x{count}, omitted)"
+        return super().format(repeated)
 
 
 def setup_environment(script_file):
@@ -53,4 +114,49 @@ def setup_environment(script_file):
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
-    return project_root
\ No newline at end of file
+    return project_root
+
+
+def setup_logging(logger, level=logging.INFO, buffer_capacity=0):
+    """
+    모듈 logger 출력 설정 (같은 logger에 여러 번 호출해도 1회만 적용)
+
+    Args:
+        logger (logging.Logger): 설정할 모듈 logger (logging.getLogger(__name__))
+        level (int): 로그 레벨 (기본: logging.INFO)
+        buffer_capacity (int): 0보다 크면 MemoryHandler로 로그를 모아서 출력
+                               (capacity 도달, ERROR 이상 로그, flush_logging() 호출 시 출력)
+
+    기능:
+        1. 해당 logger에만 stdout 핸들러 등록 (root logger 미변경 → 크롤러별 버퍼링 설정이 서로 영향 없음)
+        2. print와 같은 [LEVEL] 태그 형식으로 출력
+        3. 같은 예외의 반복 traceback 생략 (RepeatedTracebackFormatter)
+        4. 로그 파일 저장은 BaseCrawler.start_logging()의 TeeLogger가 담당
+
+    주의:
+        버퍼링 시 BaseCrawler 메서드의 print 출력보다 늦게 나올 수 있으므로,
+        print를 쓰는 메서드 호출 전에 flush_logging(logger)로 버퍼를 비울 것
+
+    사용 예시:
+        logger = logging.getLogger(__name__)
+        setup_logging(logger)
+        logger.warning("Extraction failed: %s", field, exc_info=True)
+    """
+    for handler in logger.handlers:
+        if isinstance(handler, StdoutHandler) or isinstance(getattr(handler, 'target', None), StdoutHandler):
+            return logger
+
+    handler = StdoutHandler()
+    handler.setFormatter(RepeatedTracebackFormatter(LOG_FORMAT))
+    if buffer_capacity > 0:
+        handler = logging.handlers.MemoryHandler(buffer_capacity, flushLevel=logging.ERROR, target=handler)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def flush_logging(logger):
+    """logger 버퍼에 모인 로그를 즉시 출력 (배치 저장 직후, print 기반 메서드 호출 전, 크롤러 종료 시 호출)"""
+    for handler in logger.handlers:
+        handler.flush()
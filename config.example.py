@@ -11,3 +11,10 @@ DB_CONFIG = {
     'user': 'your_username',
     'password': 'your_password'
 }
+
+# Amazon Login (amazon/amazon_hhp_login.py)
+# 계정이 여러 개면 dict 목록으로 설정 (첫 계정 쿠키를 크롤러가 사용)
+AMAZON_LOGIN = {
+    'email': 'your-email@example.com',
+    'password': 'your_password'
+}